@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark of the xml and json order paths
+
+    Measures the client side cost of one preview request in both formats:
+    serializing the payload the way :class:`pyetrade.order.ETradeOrder.perform_request`
+    does and parsing a typical response, including the reshaping of json
+    responses by :func:`pyetrade.utils.xml_shaped`. Network time is left out.
+
+    Usage: PYTHONPATH=. python benchmarks/order_json.py [--number N]
+
+"""
+import argparse
+import json
+import timeit
+
+import xmltodict
+
+from pyetrade.order import ETradeOrder
+from pyetrade.payload import emit_order_xml
+from pyetrade.utils import xml_shaped
+
+ORDER = dict(
+    accountIdKey="dBZOKt9xDrtRSAOl4MSiiA",
+    symbol="MMM",
+    orderAction="BUY",
+    clientOrderId="rebal0001",
+    priceType="LIMIT",
+    limitPrice=101.25,
+    quantity=100,
+    allOrNone=False,
+    orderTerm="GOOD_FOR_DAY",
+    marketSession="REGULAR",
+)
+
+RESPONSE = {
+    "PreviewOrderResponse": {
+        "orderType": "EQ",
+        "totalOrderValue": 10125.0,
+        "previewTime": 1645635587041,
+        "dstFlag": True,
+        "accountId": "123456789",
+        "optionLevelCd": 4,
+        "marginLevelCd": "MARGIN_TRADING_ALLOWED",
+        "PreviewIds": [{"previewId": 1234567890}],
+        "Order": [
+            {
+                "orderTerm": "GOOD_FOR_DAY",
+                "priceType": "LIMIT",
+                "limitPrice": 101.25,
+                "stopPrice": 0,
+                "marketSession": "REGULAR",
+                "allOrNone": False,
+                "messages": {
+                    "Message": [
+                        {
+                            "description": "200|Your order was successfully entered.",
+                            "code": 1026,
+                            "type": "WARNING",
+                        }
+                    ]
+                },
+                "egQual": "EG_QUAL_NOT_A_QUALIFIED_ORDER",
+                "estimatedCommission": 0,
+                "estimatedTotalAmount": 10125.0,
+                "netPrice": 0,
+                "netBid": 0,
+                "netAsk": 0,
+                "gcd": 0,
+                "ratio": "",
+                "Instrument": [
+                    {
+                        "symbolDescription": "3M CO COM",
+                        "orderAction": "BUY",
+                        "quantityType": "QUANTITY",
+                        "quantity": 100,
+                        "cancelQuantity": 0,
+                        "reserveOrder": True,
+                        "reserveQuantity": 0,
+                        "Product": {"symbol": "MMM", "securityType": "EQ"},
+                    }
+                ],
+            }
+        ],
+    }
+}
+
+
+def xml_response() -> str:
+    """The XML ETrade sends for :data:`RESPONSE`"""
+
+    return emit_order_xml(xml_shaped(RESPONSE))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = ETradeOrder.build_order_payload("PreviewOrderRequest", **ORDER)
+    xml_text = xml_response()
+    json_text = json.dumps(RESPONSE)
+
+    def xml_path():
+        emit_order_xml(payload)
+        return xmltodict.parse(xml_text)
+
+    def json_path():
+        json.dumps(payload)
+        return xml_shaped(json.loads(json_text))
+
+    assert json.loads(json.dumps(xml_path())) == json_path()
+
+    print(f"{'path':<8}{'per request':>14}")
+    timings = {}
+    for name, path in (("xml", xml_path), ("json", json_path)):
+        timings[name] = timeit.timeit(path, number=args.number) / args.number
+        print(f"{name:<8}{timings[name] * 1e6:>12.1f}us")
+    print(f"json is {timings['xml'] / timings['json']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
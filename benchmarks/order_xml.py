@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark of order payload serialization
+
+    Compares :func:`pyetrade.payload.emit_order_xml` with
+    :func:`jxmlease.emit_xml` on the payloads of preview, place and cancel
+    requests and checks both produce the same bytes.
+
+    Usage: PYTHONPATH=. python benchmarks/order_xml.py [--number N]
+
+"""
+import argparse
+import timeit
+
+from jxmlease import emit_xml
+
+from pyetrade.order import ETradeOrder
+from pyetrade.payload import emit_order_xml
+
+EQUITY = dict(
+    accountIdKey="dBZOKt9xDrtRSAOl4MSiiA",
+    symbol="MMM",
+    orderAction="BUY",
+    clientOrderId="rebal0001",
+    priceType="LIMIT",
+    limitPrice=101.25,
+    quantity=100,
+    allOrNone=False,
+    orderTerm="GOOD_FOR_DAY",
+    marketSession="REGULAR",
+)
+
+OPTION = dict(
+    EQUITY,
+    symbol="PLTR",
+    securityType="OPTN",
+    callPut="PUT",
+    expiryDate="2022-02-18",
+    strikePrice=23,
+    orderAction="BUY_OPEN",
+    limitPrice=1.97,
+    quantity=1,
+)
+
+PAYLOADS = {
+    "preview equity": ETradeOrder.build_order_payload("PreviewOrderRequest", **EQUITY),
+    "place equity": ETradeOrder.build_order_payload(
+        "PlaceOrderRequest", previewId=1234567890, **EQUITY
+    ),
+    "place option": ETradeOrder.build_order_payload(
+        "PlaceOrderRequest", previewId=1234567890, **OPTION
+    ),
+    "cancel": {"CancelOrderRequest": {"orderId": 42}},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'payload':<16}{'emit_xml':>12}{'emit_order_xml':>16}{'speedup':>10}")
+    for name, payload in PAYLOADS.items():
+        assert emit_order_xml(payload) == emit_xml(payload), name
+
+        baseline = timeit.timeit(lambda: emit_xml(payload), number=args.number)
+        fast = timeit.timeit(lambda: emit_order_xml(payload), number=args.number)
+        print(
+            f"{name:<16}{baseline / args.number * 1e6:>10.1f}us"
+            f"{fast / args.number * 1e6:>14.1f}us{baseline / fast:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
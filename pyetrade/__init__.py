@@ -11,3 +11,22 @@ from . import order  # noqa: F401
 from .order import ETradeOrder  # noqa: F401
 from . import alerts  # noqa: F401
 from .alerts import ETradeAlerts  # noqa: F401
+from . import ratelimit  # noqa: F401
+from .ratelimit import RateLimiter  # noqa: F401
+from . import cache  # noqa: F401
+from .cache import PreviewCache, QuoteCache  # noqa: F401
+from . import store  # noqa: F401
+from .store import TransactionStore  # noqa: F401
+from . import positions  # noqa: F401
+from .positions import PositionTable  # noqa: F401
+from . import tracker  # noqa: F401
+from .tracker import OrderTracker  # noqa: F401
+from . import timing  # noqa: F401
+from .timing import OrderTimings  # noqa: F401
+from . import session  # noqa: F401
+from .session import create_retry, create_session  # noqa: F401
+from . import aio  # noqa: F401
+from .aio import AsyncOAuth1Session  # noqa: F401
+from .aio import AsyncETradeAccounts, AsyncETradeMarket  # noqa: F401
+from .aio import AsyncETradeAlerts, AsyncETradeOrder  # noqa: F401
+from .aio import AsyncOrderTracker  # noqa: F401
@@ -1,11 +1,138 @@
+import copy
+import hashlib
+import json
 import logging
+import os
+import threading
+import time
+from collections.abc import MutableMapping
+from concurrent.futures import as_completed
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from datetime import datetime
+from datetime import timedelta
 
 import xmltodict
+from requests.exceptions import HTTPError
 from requests_oauthlib import OAuth1Session
 
+from .utils import as_list
+
 LOGGER = logging.getLogger(__name__)
 
+# Maximum number of transactions ETrade returns per page
+TRANSACTIONS_PAGE_SIZE = 50
+
+# Transactions this old are settled and their details no longer change
+SETTLED_DAYS = 7
+
+
+def date_windows(
+    start_date: datetime.date, end_date: datetime.date, windows: int
+) -> list:
+    """:description: Splits a date range into contiguous, non overlapping windows
+
+    :param start_date: First day of the range
+    :type start_date: datetime.date, required
+    :param end_date: Last day of the range
+    :type end_date: datetime.date, required
+    :param windows: Number of windows, at most one per day
+    :type windows: int, required
+    :return: ``[(start, end), ...]`` in ascending order, both days included
+    :rtype: list
+    """
+
+    if isinstance(start_date, datetime):
+        start_date = start_date.date()
+    if isinstance(end_date, datetime):
+        end_date = end_date.date()
+
+    days = (end_date - start_date).days + 1
+    if days < 1:
+        raise ValueError("end_date must not be before start_date")
+
+    windows = max(1, min(windows, days))
+    ranges = []
+    start = start_date
+    for i in range(windows):
+        length = days // windows + (1 if i < days % windows else 0)
+        end = start + timedelta(days=length - 1)
+        ranges.append((start, end))
+        start = end + timedelta(days=1)
+
+    return ranges
+
+
+def transactions_page(transactions: dict) -> tuple:
+    """:description: Splits a :class:`ETradeAccounts.list_transactions` response
+
+    :param transactions: Parsed response, ``{}`` when ETrade returned nothing
+    :type transactions: dict, required
+    :return: ``(transactions, marker)``, marker is None on the last page
+    :rtype: tuple
+    """
+
+    response = transactions.get("TransactionListResponse") or {}
+    marker = response.get("marker")
+    more = str(response.get("moreTransactions", "true")).lower() == "true"
+
+    return as_list(response.get("Transaction")), marker if more and marker else None
+
+
+def portfolio_total_pages(portfolio: dict) -> int:
+    """:description: Number of pages of a :class:`ETradeAccounts.get_account_portfolio` response"""
+
+    response = portfolio.get("PortfolioResponse") or {}
+    return max(
+        [
+            int(p.get("totalPages") or 1)
+            for p in as_list(response.get("AccountPortfolio"))
+        ]
+        or [1]
+    )
+
+
+def merge_portfolio_pages(pages: list) -> dict:
+    """:description: Merges the pages of a portfolio into the first one
+
+    :param pages: Parsed :class:`ETradeAccounts.get_account_portfolio` responses in
+                  page order
+    :type pages: list, required
+    :return: The first page with the positions of every page
+    :rtype: dict
+    """
+
+    merged = pages[0]
+    if len(pages) == 1:
+        return merged
+
+    portfolios = as_list(
+        (merged.get("PortfolioResponse") or {}).get("AccountPortfolio")
+    )
+    for portfolio in portfolios:
+        portfolio["Position"] = as_list(portfolio.get("Position"))
+        portfolio.pop("nextPageNo", None)
+        portfolio.pop("next", None)
+
+    for page in pages[1:]:
+        response = page.get("PortfolioResponse") or {}
+        for portfolio, other in zip(
+            portfolios, as_list(response.get("AccountPortfolio"))
+        ):
+            portfolio["Position"].extend(as_list(other.get("Position")))
+
+    return merged
+
+
+def _is_settled(details: dict) -> bool:
+    response = details.get("TransactionDetailsResponse") or {}
+    transaction_date = response.get("transactionDate")
+    if transaction_date is None:
+        return False
+    age = timedelta(milliseconds=time.time() * 1000 - int(transaction_date))
+    return age > timedelta(days=SETTLED_DAYS)
+
 
 class ETradeAccounts(object):
     """:description: Accounts object to access account information
@@ -21,6 +148,21 @@ class ETradeAccounts(object):
     :type resource_owner_secret: str, required
     :param dev: Defines Sandbox (True) or Live (False) ETrade, defaults to True
     :type dev: bool, optional
+    :param session: Shared session from :func:`pyetrade.session.create_session`,
+                    defaults to None (a new session is created)
+    :type session: OAuth1Session, optional
+    :param accounts_ttl: Seconds :class:`list_accounts` responses are cached for,
+                         defaults to None (no caching)
+    :type accounts_ttl: float, optional
+    :param accounts_cache_path: JSON file the cached account list is persisted to,
+                                kept apart per environment, consumer key and
+                                user (resource owner key), defaults to None
+                                (memory only)
+    :type accounts_cache_path: str, optional
+    :param transaction_details_cache: Mapping keeping the settled responses of
+                                      :class:`iter_transaction_details`, e.g. a
+                                      :mod:`shelve`, defaults to None (a dict)
+    :type transaction_details_cache: MutableMapping, optional
     :EtradeRef: https://apisb.etrade.com/docs/api/account/api-account-v1.html
     """
 
@@ -31,19 +173,112 @@ class ETradeAccounts(object):
         resource_owner_key: str,
         resource_owner_secret: str,
         dev: bool = True,
+        session: OAuth1Session = None,
+        accounts_ttl: float = None,
+        accounts_cache_path: str = None,
+        transaction_details_cache: MutableMapping = None,
     ):
         self.client_key = client_key
         self.client_secret = client_secret
         self.resource_owner_key = resource_owner_key
         self.resource_owner_secret = resource_owner_secret
         self.base_url = f'https://{"apisb" if dev else "api"}.etrade.com/v1/accounts'
-        self.session = OAuth1Session(
-            self.client_key,
-            self.client_secret,
-            self.resource_owner_key,
-            self.resource_owner_secret,
-            signature_type="AUTH_HEADER",
-        )
+        if session is None:
+            session = OAuth1Session(
+                self.client_key,
+                self.client_secret,
+                self.resource_owner_key,
+                self.resource_owner_secret,
+                signature_type="AUTH_HEADER",
+            )
+        self.session = session
+        self.position_index = {}
+        self.position_ids_lock = threading.Lock()
+        self.accounts_ttl = accounts_ttl
+        self.accounts_cache_path = accounts_cache_path
+        self.accounts_cache = None
+        self.accounts_cache_lock = threading.Lock()
+        if transaction_details_cache is None:
+            transaction_details_cache = {}
+        self.transaction_details_cache = transaction_details_cache
+
+    def _load_accounts_cache(self) -> dict:
+        # Called with accounts_cache_lock held
+        if self.accounts_cache is None:
+            self.accounts_cache = {}
+            if self.accounts_cache_path and os.path.exists(self.accounts_cache_path):
+                try:
+                    with open(self.accounts_cache_path) as cache_file:
+                        self.accounts_cache = json.load(cache_file)
+                except (OSError, ValueError) as err:
+                    LOGGER.warning(
+                        "Ignoring account cache %s: %s", self.accounts_cache_path, err
+                    )
+        return self.accounts_cache
+
+    def _accounts_cache_key(self, resp_format: str) -> str:
+        # Sandbox and live account lists, and those of every user signed in
+        # through the app of a consumer key, may share one cache file. The
+        # user's access token is hashed, it must not be persisted.
+        owner = hashlib.sha256(self.resource_owner_key.encode()).hexdigest()
+        return f"{self.base_url} {self.client_key} {owner} {resp_format.lower()}"
+
+    def _save_accounts_cache(self) -> None:
+        # Called with accounts_cache_lock held
+        if not self.accounts_cache_path:
+            return
+
+        # Account keys are private, keep the file readable by its owner only
+        tmp_path = self.accounts_cache_path + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as cache_file:
+            json.dump(self.accounts_cache, cache_file)
+        os.replace(tmp_path, self.accounts_cache_path)
+
+    def refresh_accounts(self, resp_format: str = "xml") -> dict:
+        """:description: Drops the cached account lists and lists accounts again
+
+        :param resp_format: Desired Response format, defaults to xml
+        :type  resp_format: str, optional
+        :return: List of accounts
+        :rtype: xml or json based on ``resp_format``
+        """
+
+        with self.accounts_cache_lock:
+            cache = self._load_accounts_cache()
+            for cached_format in ("xml", "json"):
+                cache.pop(self._accounts_cache_key(cached_format), None)
+            self._save_accounts_cache()
+
+        return self.list_accounts(resp_format=resp_format)
+
+    def get_account_id_key(self, account_id: str) -> str:
+        """:description: Looks up the accountIdKey of an account number
+
+        With ``accounts_ttl`` set the account list comes from the cache. An
+        unknown account number refreshes the cached list once.
+
+        :param account_id: Account number, e.g. ``accountId`` of :class:`list_accounts`
+        :type  account_id: str, required
+        :return: accountIdKey of the account
+        :rtype: str
+        :raises KeyError: No account has number ``account_id``
+        """
+
+        def find(accounts_list):
+            response = accounts_list.get("AccountListResponse") or {}
+            for account in as_list((response.get("Accounts") or {}).get("Account")):
+                if str(account.get("accountId")) == str(account_id):
+                    return account["accountIdKey"]
+            return None
+
+        account_id_key = find(self.list_accounts(resp_format="json"))
+        if account_id_key is None and self.accounts_ttl is not None:
+            account_id_key = find(self.refresh_accounts(resp_format="json"))
+        if account_id_key is None:
+            raise KeyError(f'Account "{account_id}" could not be found.')
+
+        return account_id_key
 
     def list_accounts(self, resp_format: str = "xml") -> dict:
         """:description: Lists accounts in Etrade
@@ -52,9 +287,19 @@ class ETradeAccounts(object):
         :type  resp_format: str, optional
         :return: List of accounts
         :rtype: xml or json based on ``resp_format``
+        :Note: Responses are cached for ``accounts_ttl`` seconds if set, see
+               :class:`refresh_accounts`
         :EtradeRef: https://apisb.etrade.com/docs/api/account/api-account-v1.html
         """
 
+        if self.accounts_ttl is not None:
+            with self.accounts_cache_lock:
+                cached = self._load_accounts_cache().get(
+                    self._accounts_cache_key(resp_format)
+                )
+                if cached and time.time() - cached["fetched"] < self.accounts_ttl:
+                    return copy.deepcopy(cached["response"])
+
         api_url = "%s/list%s" % (
             self.base_url,
             ".json" if resp_format == "json" else "",
@@ -67,7 +312,19 @@ class ETradeAccounts(object):
 
         LOGGER.debug(req.text)
 
-        return xmltodict.parse(req.text) if resp_format.lower() == "xml" else req.json()
+        response = (
+            xmltodict.parse(req.text) if resp_format.lower() == "xml" else req.json()
+        )
+
+        if self.accounts_ttl is not None:
+            with self.accounts_cache_lock:
+                self._load_accounts_cache()[self._accounts_cache_key(resp_format)] = {
+                    "fetched": time.time(),
+                    "response": copy.deepcopy(response),
+                }
+                self._save_accounts_cache()
+
+        return response
 
     def get_account_balance(
         self,
@@ -111,6 +368,96 @@ class ETradeAccounts(object):
 
         return xmltodict.parse(req.text) if resp_format.lower() == "xml" else req.json()
 
+    def get_snapshot(
+        self,
+        account_id_keys: list[str] = None,
+        max_workers: int = 8,
+        resp_format: str = "json",
+    ) -> dict:
+        """:description: Retrieves balance and full portfolio of many accounts at once
+
+        Balance and portfolio requests of every account run concurrently on
+        ``max_workers`` threads. Use a session from
+        :func:`pyetrade.session.create_session` with a ``rate_limiter`` to stay
+        within the ETrade accounts limits.
+
+        :param account_id_keys: AccountIDKeys to snapshot, defaults to None (every
+                                account of :class:`list_accounts` that is not closed)
+        :type  account_id_keys: list[str], optional
+        :param max_workers: Maximum number of requests in flight, defaults to 8
+        :type  max_workers: int, optional
+        :param resp_format: Desired Response format, defaults to json
+        :type  resp_format: str, optional
+        :return: ``{"accounts": {accountIdKey: account snapshot}, "elapsed": seconds}``
+        :rtype: dict
+        :account snapshot values:
+            * account - ``Account`` element of :class:`list_accounts` (None when
+              ``account_id_keys`` is given)
+            * balance - :class:`get_account_balance` response or None
+            * portfolio - :class:`get_account_portfolio` response of all pages or None
+            * errors - ``{"balance" or "portfolio": Exception}`` of failed requests
+            * timing - ``{"balance", "portfolio", "total"}`` seconds
+        """
+
+        started = time.perf_counter()
+        listed = {}
+
+        if account_id_keys is None:
+            accounts_list = self.list_accounts(resp_format=resp_format)
+            response = accounts_list.get("AccountListResponse") or {}
+            for account in as_list((response.get("Accounts") or {}).get("Account")):
+                if account.get("accountStatus") != "CLOSED":
+                    listed[account["accountIdKey"]] = account
+            account_id_keys = list(listed)
+
+        fetchers = {
+            "balance": lambda key: self.get_account_balance(
+                key, resp_format=resp_format
+            ),
+            "portfolio": lambda key: self.get_account_portfolio(
+                key, all_pages=True, resp_format=resp_format
+            ),
+        }
+
+        def timed(name, key):
+            start = time.perf_counter()
+            try:
+                return fetchers[name](key), None, start, time.perf_counter()
+            except Exception as err:
+                LOGGER.warning("Snapshot %s of %s failed: %s", name, key, err)
+                return None, err, start, time.perf_counter()
+
+        snapshot = {}
+        if account_id_keys:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, 2 * len(account_id_keys))
+            ) as pool:
+                futures = {
+                    (key, name): pool.submit(timed, name, key)
+                    for key in account_id_keys
+                    for name in fetchers
+                }
+
+                for key in account_id_keys:
+                    account = {
+                        "account": listed.get(key),
+                        "errors": {},
+                        "timing": {},
+                    }
+                    starts, ends = [], []
+                    for name in fetchers:
+                        result, error, start, end = futures[(key, name)].result()
+                        account[name] = result
+                        if error is not None:
+                            account["errors"][name] = error
+                        account["timing"][name] = end - start
+                        starts.append(start)
+                        ends.append(end)
+                    account["timing"]["total"] = max(ends) - min(starts)
+                    snapshot[key] = account
+
+        return {"accounts": snapshot, "elapsed": time.perf_counter() - started}
+
     def get_account_portfolio(
         self,
         account_id_key: str,
@@ -123,6 +470,8 @@ class ETradeAccounts(object):
         lots_required: bool = False,
         view: str = "QUICK",
         resp_format: str = "xml",
+        all_pages: bool = False,
+        max_workers: int = 4,
     ) -> dict:
         """:description: Retrieves account portfolio for an account
 
@@ -156,11 +505,35 @@ class ETradeAccounts(object):
             * COMPLETE
         :param resp_format: Desired Response format, defaults to xml
         :type  resp_format: str, optional
-        :return: Account portfolio of account with key ``account_id_key``
+        :param all_pages: Fetches every page, ``page_number`` is ignored, defaults to False
+        :type  all_pages: bool, optional
+        :param max_workers: Maximum number of pages fetched at once with ``all_pages``,
+                            defaults to 4
+        :type  max_workers: int, optional
+        :return: Account portfolio of account with key ``account_id_key``, with
+                 ``all_pages`` the first page holding the positions of all pages
         :rtype: xml or json based on ``resp_format``
         :EtradeRef: https://apisb.etrade.com/docs/api/account/api-portfolio-v1.html
         """
 
+        if all_pages:
+            return merge_portfolio_pages(
+                list(
+                    self._portfolio_pages(
+                        account_id_key,
+                        max_workers,
+                        count=count,
+                        sort_by=sort_by,
+                        sort_order=sort_order,
+                        market_session=market_session,
+                        totals_required=totals_required,
+                        lots_required=lots_required,
+                        view=view,
+                        resp_format=resp_format,
+                    )
+                )
+            )
+
         api_url = "%s/%s/portfolio%s" % (
             self.base_url,
             account_id_key,
@@ -187,55 +560,237 @@ class ETradeAccounts(object):
 
         return xmltodict.parse(req.text) if resp_format.lower() == "xml" else req.json()
 
-    def get_portfolio_position_lot(
-        self, symbol: str, account_id_key: str, resp_format: str = "xml"
-    ) -> dict:
-        """:description: Retrieves account portfolio position lot based on provided symbol
+    def _portfolio_pages(self, account_id_key: str, max_workers: int, **kwargs):
+        first = self.get_account_portfolio(account_id_key, page_number=1, **kwargs)
+        yield first
+
+        total_pages = portfolio_total_pages(first)
+        if total_pages <= 1:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, total_pages - 1)) as pool:
+            futures = [
+                pool.submit(
+                    self.get_account_portfolio,
+                    account_id_key,
+                    page_number=page_number,
+                    **kwargs,
+                )
+                for page_number in range(2, total_pages + 1)
+            ]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def iter_portfolio_positions(
+        self,
+        account_id_key: str,
+        count: int = 50,
+        sort_by: str = None,
+        sort_order: str = "DESC",
+        market_session: str = "REGULAR",
+        lots_required: bool = False,
+        view: str = "QUICK",
+        max_workers: int = 4,
+        resp_format: str = "xml",
+    ):
+        """:description: Iterates over the positions of every portfolio page
+
+        Page 1 gives the number of pages, the other pages are then fetched
+        concurrently on ``max_workers`` threads. Positions are yielded page by
+        page as they arrive, keeping the ``sort_by`` order.
 
-        :param symbol: Desired equity symbol to search for position lots in desired account portfolio
-        :type  symbol: str, required
         :param account_id_key: AccountIDkey retrieved from :class:`list_accounts`
         :type  account_id_key: str, required
+        :param count: The number of positions per page, defaults to 50
+        :type  count: int, optional
+        :param sort_by: Sorting done based on the column specified in the query parameter.
+        :type  sort_by: str, optional
+        :param sort_order: Sort orders (ASC or DESC), defaults to DESC
+        :type  sort_order: str, optional
+        :param market_session: The market session, defaults to REGULAR
+        :type  market_session: str, optional
+        :param lots_required: It gives position lots for positions, defaults to False
+        :type  lots_required: bool, optional
+        :param view: The view query, see :class:`get_account_portfolio`, defaults to QUICK.
+        :type  view: str, optional
+        :param max_workers: Maximum number of pages fetched at once, defaults to 4
+        :type  max_workers: int, optional
         :param resp_format: Desired Response format, defaults to xml
         :type  resp_format: str, optional
-        :return: PositionLot of ``symbol`` in account portfolio of account with key ``account_id_key``
-        :rtype: xml or json based on ``resp_format``
+        :return: Generator of ``Position`` elements
+        :rtype: generator
         :EtradeRef: https://apisb.etrade.com/docs/api/account/api-portfolio-v1.html
         """
 
-        account_portfolio = self.get_account_portfolio(
-            account_id_key, lots_required=True, resp_format="json"
-        )["PortfolioResponse"]["AccountPortfolio"][0]["Position"]
+        for page in self._portfolio_pages(
+            account_id_key,
+            max_workers,
+            count=count,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            market_session=market_session,
+            lots_required=lots_required,
+            view=view,
+            resp_format=resp_format,
+        ):
+            response = page.get("PortfolioResponse") or {}
+            for portfolio in as_list(response.get("AccountPortfolio")):
+                yield from as_list(portfolio.get("Position"))
+
+    def position_ids(self, account_id_key: str, refresh: bool = False) -> dict:
+        """:description: Returns the positionIds of each symbol held in an account
+
+        The index is built from one :class:`get_account_portfolio` call over all
+        pages and kept until :class:`clear_position_ids` or ``refresh``.
+
+        :param account_id_key: AccountIDkey retrieved from :class:`list_accounts`
+        :type  account_id_key: str, required
+        :param refresh: Rebuilds the index, defaults to False
+        :type  refresh: bool, optional
+        :return: ``{SYMBOL: [positionId, ...]}`` with upper case symbols
+        :rtype: dict
+        """
+
+        with self.position_ids_lock:
+            if refresh or account_id_key not in self.position_index:
+                portfolio = self.get_account_portfolio(
+                    account_id_key, all_pages=True, resp_format="json"
+                )
+                index = {}
+                response = portfolio.get("PortfolioResponse") or {}
+                for account_portfolio in as_list(response.get("AccountPortfolio")):
+                    for position in as_list(account_portfolio.get("Position")):
+                        index.setdefault(
+                            position["Product"]["symbol"].upper(), []
+                        ).append(position["positionId"])
+                self.position_index[account_id_key] = index
 
-        lot_position_id = [
-            position["positionId"]
-            for position in account_portfolio
-            if symbol.upper() == position["Product"]["symbol"].upper()
-        ]
+            return self.position_index[account_id_key]
 
-        # If the symbol exists then there should only be one ID filtered from the portfolio response
-        if len(lot_position_id) != 1:
-            raise KeyError(
-                f'Symbol "{symbol}" could not be found in the current portfolio. '
-                f"Please check your portfolio and symbol before trying again."
-            )
+    def clear_position_ids(self, account_id_key: str = None) -> None:
+        """:description: Drops the cached positionId index of one or all accounts
+
+        Call it after trades that open or close positions.
+        """
+
+        with self.position_ids_lock:
+            if account_id_key is None:
+                self.position_index.clear()
+            else:
+                self.position_index.pop(account_id_key, None)
+
+    def _resolve_position_ids(self, symbols: list[str], account_id_key: str) -> dict:
+        refreshed = account_id_key not in self.position_index
+        index = self.position_ids(account_id_key)
+
+        # A symbol missing from a cached index may have been bought since
+        if not refreshed and any(symbol.upper() not in index for symbol in symbols):
+            index = self.position_ids(account_id_key, refresh=True)
 
-        LOGGER.debug(lot_position_id[0])
+        resolved = {}
+        for symbol in symbols:
+            ids = index.get(symbol.upper(), [])
+
+            # If the symbol exists then there should only be one ID filtered from the portfolio response
+            if len(ids) != 1:
+                raise KeyError(
+                    f'Symbol "{symbol}" could not be found in the current portfolio. '
+                    f"Please check your portfolio and symbol before trying again."
+                )
+            resolved[symbol] = ids[0]
+
+        return resolved
+
+    def _get_position_lot(
+        self, account_id_key: str, position_id: str, resp_format: str
+    ) -> dict:
+        LOGGER.debug(position_id)
 
         api_url = "%s/%s/portfolio/%s%s" % (
             self.base_url,
             account_id_key,
-            lot_position_id[0],
+            position_id,
             ".json" if resp_format == "json" else "",
         )
 
         req = self.session.get(api_url)
-        req.raise_for_status()
+        try:
+            req.raise_for_status()
+        except HTTPError:
+            # The position may have been closed, look it up again next time
+            self.clear_position_ids(account_id_key)
+            raise
 
         LOGGER.debug(req.text)
 
         return xmltodict.parse(req.text) if resp_format.lower() == "xml" else req.json()
 
+    def get_portfolio_position_lot(
+        self, symbol: str, account_id_key: str, resp_format: str = "xml"
+    ) -> dict:
+        """:description: Retrieves account portfolio position lot based on provided symbol
+
+        :param symbol: Desired equity symbol to search for position lots in desired account portfolio
+        :type  symbol: str, required
+        :param account_id_key: AccountIDkey retrieved from :class:`list_accounts`
+        :type  account_id_key: str, required
+        :param resp_format: Desired Response format, defaults to xml
+        :type  resp_format: str, optional
+        :return: PositionLot of ``symbol`` in account portfolio of account with key ``account_id_key``
+        :rtype: xml or json based on ``resp_format``
+        :Note: The positionId of ``symbol`` comes from :class:`position_ids`
+        :EtradeRef: https://apisb.etrade.com/docs/api/account/api-portfolio-v1.html
+        """
+
+        position_id = self._resolve_position_ids([symbol], account_id_key)[symbol]
+
+        return self._get_position_lot(account_id_key, position_id, resp_format)
+
+    def get_portfolio_position_lots(
+        self,
+        symbols: list[str],
+        account_id_key: str,
+        max_workers: int = 4,
+        resp_format: str = "xml",
+    ) -> dict:
+        """:description: Retrieves the position lots of many symbols at once
+
+        The positionIds come from :class:`position_ids`, so the portfolio is
+        downloaded at most once. The lot requests run on ``max_workers`` threads.
+
+        :param symbols: Equity symbols held in the account portfolio
+        :type  symbols: list[str], required
+        :param account_id_key: AccountIDkey retrieved from :class:`list_accounts`
+        :type  account_id_key: str, required
+        :param max_workers: Maximum number of lot requests in flight, defaults to 4
+        :type  max_workers: int, optional
+        :param resp_format: Desired Response format, defaults to xml
+        :type  resp_format: str, optional
+        :return: ``{symbol: PositionLot response}`` in the order of ``symbols``
+        :rtype: dict
+        :raises KeyError: A symbol has no single position in the portfolio
+        :EtradeRef: https://apisb.etrade.com/docs/api/account/api-portfolio-v1.html
+        """
+
+        position_ids = self._resolve_position_ids(symbols, account_id_key)
+        if not position_ids:
+            return {}
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(position_ids))
+        ) as pool:
+            futures = {
+                symbol: pool.submit(
+                    self._get_position_lot, account_id_key, position_id, resp_format
+                )
+                for symbol, position_id in position_ids.items()
+            }
+            return {symbol: future.result() for symbol, future in futures.items()}
+
     def list_transactions(
         self,
         account_id_key: str,
@@ -300,6 +855,100 @@ class ETradeAccounts(object):
         else:
             return req.json()
 
+    def _page_transactions(
+        self,
+        account_id_key: str,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        sort_order: str,
+        resp_format: str,
+    ):
+        marker = None
+
+        while True:
+            transactions, next_marker = transactions_page(
+                self.list_transactions(
+                    account_id_key,
+                    start_date=start_date,
+                    end_date=end_date,
+                    sort_order=sort_order,
+                    marker=marker,
+                    count=TRANSACTIONS_PAGE_SIZE,
+                    resp_format=resp_format,
+                )
+            )
+            yield from transactions
+
+            if next_marker is None or next_marker == marker:
+                return
+            marker = next_marker
+
+    def iter_transactions(
+        self,
+        account_id_key: str,
+        start_date: datetime.date = None,
+        end_date: datetime.date = None,
+        sort_order: str = "DESC",
+        windows: int = 1,
+        max_workers: int = 4,
+        resp_format: str = "xml",
+    ):
+        """:description: Iterates over the transactions of an account across all pages
+
+        With ``windows`` above 1 the date range is split into that many windows
+        whose pages are fetched concurrently on ``max_workers`` threads. Each
+        window is held in memory until the iteration reaches it, transactions
+        are still yielded in ``sort_order``.
+
+        :param account_id_key: AccountIDKey retrieved from :class:`list_accounts`
+        :type  account_id_key: str, required
+        :param start_date: The earliest date to include in the date range, defaults to None
+        :type  start_date: datetime.date obj, optional
+        :param end_date: The latest date to include in the date range, defaults to None
+        :type  end_date: datetime.date obj, optional
+        :param sort_order: The sort order request (ASC or DESC), default is DESC
+        :type  sort_order: str, optional
+        :param windows: Number of date windows fetched in parallel, requires
+                        ``start_date`` and ``end_date``, defaults to 1
+        :type  windows: int, optional
+        :param max_workers: Maximum number of windows fetched at once, defaults to 4
+        :type  max_workers: int, optional
+        :param resp_format: Desired Response format, defaults to xml
+        :type  resp_format: str, optional
+        :return: Generator of ``Transaction`` elements
+        :rtype: generator
+        :EtradeRef: https://apisb.etrade.com/docs/api/account/api-transaction-v1.html
+        """
+
+        if windows <= 1:
+            yield from self._page_transactions(
+                account_id_key, start_date, end_date, sort_order, resp_format
+            )
+            return
+
+        if start_date is None or end_date is None:
+            raise ValueError("windows requires start_date and end_date")
+
+        ranges = date_windows(start_date, end_date, windows)
+        if sort_order.upper() == "DESC":
+            ranges.reverse()
+
+        def fetch(window):
+            return list(
+                self._page_transactions(
+                    account_id_key, window[0], window[1], sort_order, resp_format
+                )
+            )
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(ranges))) as pool:
+            futures = [pool.submit(fetch, window) for window in ranges]
+            try:
+                for future in futures:
+                    yield from future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
     def list_transaction_details(
         self,
         account_id_key: str,
@@ -338,3 +987,83 @@ class ETradeAccounts(object):
         LOGGER.debug(req.text)
 
         return xmltodict.parse(req.text) if resp_format.lower() == "xml" else req.json()
+
+    def iter_transaction_details(
+        self,
+        account_id_key: str,
+        transactions,
+        max_workers: int = 4,
+        resp_format: str = "xml",
+    ):
+        """:description: Retrieves the details of many transactions concurrently
+
+        At most ``max_workers`` requests are in flight. Details are yielded as
+        their requests complete, so not in the order of ``transactions``.
+        A failed request yields its exception in place of the details and
+        the others go on. Settled transactions, those older than
+        ``SETTLED_DAYS``, never change: their details are kept in
+        ``transaction_details_cache`` and later lookups make no request.
+
+        :param account_id_key: AccountIDKey retrieved from :class:`list_accounts`
+        :type  account_id_key: str, required
+        :param transactions: transactionIds or ``(transaction_id, store_id)`` pairs
+        :type  transactions: iterable, required
+        :param max_workers: Maximum number of requests in flight, defaults to 4
+        :type  max_workers: int, optional
+        :param resp_format: Desired Response format, defaults to xml
+        :type  resp_format: str, optional
+        :return: Generator of ``(transaction_id, details or exception)``
+        :rtype: generator
+        :EtradeRef: https://apisb.etrade.com/docs/api/account/api-transaction-v1.html
+        """
+
+        cache = self.transaction_details_cache
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = {}
+
+            def completed(futures):
+                for future in futures:
+                    transaction_id, key = pending.pop(future)
+                    try:
+                        details = future.result()
+                    except Exception as err:
+                        LOGGER.warning(
+                            "Transaction %s details failed: %s", transaction_id, err
+                        )
+                        yield transaction_id, err
+                        continue
+                    if _is_settled(details):
+                        cache[key] = details
+                    yield transaction_id, details
+
+            try:
+                for transaction in transactions:
+                    transaction_id, store_id = (
+                        transaction
+                        if isinstance(transaction, (tuple, list))
+                        else (transaction, None)
+                    )
+                    key = f"{account_id_key}/{transaction_id}/{resp_format.lower()}"
+
+                    if key in cache:
+                        yield transaction_id, cache[key]
+                        continue
+
+                    future = pool.submit(
+                        self.list_transaction_details,
+                        account_id_key,
+                        transaction_id,
+                        store_id=store_id,
+                        resp_format=resp_format,
+                    )
+                    pending[future] = (transaction_id, key)
+
+                    if len(pending) >= max_workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        yield from completed(done)
+
+                yield from completed(as_completed(list(pending)))
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,1597 @@
+"""Aio - asyncio counterparts of the ETrade API objects
+
+    Requires the optional ``aiohttp`` dependency (``pip install pyetrade[async]``).
+
+    Every request is signed with OAuth 1.0a exactly like
+    :class:`requests_oauthlib.OAuth1Session` does and sent through a shared
+    :class:`aiohttp.TCPConnector`, so hundreds of quote or portfolio calls can
+    be in flight without a thread per request. Methods take the same arguments
+    and return the same parsed structures as their synchronous counterparts.
+
+"""
+import asyncio
+import json as jsonlib
+import logging
+import time
+from datetime import datetime
+
+import xmltodict
+from oauthlib import oauth1
+from requests.exceptions import HTTPError
+from requests.models import PreparedRequest
+from requests.structures import CaseInsensitiveDict
+from urllib3.util import Retry
+
+from .accounts import date_windows
+from .accounts import merge_portfolio_pages
+from .accounts import portfolio_total_pages
+from .accounts import transactions_page
+from .accounts import TRANSACTIONS_PAGE_SIZE
+from .cache import PreviewCache
+from .order import ETradeOrder
+from .order import get_request_result
+from .order import OpenOrderIndex
+from .order import option_symbol
+from .payload import emit_order_xml
+from .ratelimit import module_for_url
+from .ratelimit import RateLimiter
+from .session import get_retry_delay
+from .session import REFUSED_STATUSES
+from .timing import mark
+from .timing import OrderTimings
+from .timing import timed
+from .tracker import OrderTracker
+from .utils import as_list
+from .utils import xml_shaped
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+LOGGER = logging.getLogger(__name__)
+
+# Number of connections kept in the shared pool
+DEFAULT_POOL_MAXSIZE = 100
+
+
+class AsyncResponse(object):
+    """:description: Response of :class:`AsyncOAuth1Session` with the parts of
+    :class:`requests.Response` used by pyetrade
+
+    :param status_code: HTTP status code
+    :type status_code: int, required
+    :param reason: HTTP reason phrase
+    :type reason: str, required
+    :param url: Requested URL
+    :type url: str, required
+    :param headers: Response headers, looked up case-insensitively like
+                    :class:`requests.Response` headers
+    :type headers: dict, required
+    :param text: Decoded response body
+    :type text: str, required
+    """
+
+    def __init__(
+        self, status_code: int, reason: str, url: str, headers: dict, text: str
+    ):
+        self.status_code = status_code
+        self.reason = reason
+        self.url = url
+        self.headers = CaseInsensitiveDict(headers)
+        self.text = text
+
+    def json(self):
+        return jsonlib.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        """:description: Raises :class:`requests.HTTPError` for 4xx and 5xx responses"""
+
+        if 400 <= self.status_code < 500:
+            kind = "Client Error"
+        elif 500 <= self.status_code < 600:
+            kind = "Server Error"
+        else:
+            return
+
+        raise HTTPError(
+            f"{self.status_code} {kind}: {self.reason} for url: {self.url}",
+            response=self,
+        )
+
+
+class AsyncOAuth1Session(object):
+    """:description: OAuth1 signed asyncio HTTP session with a shared connection pool
+
+    A single instance can be handed to every ``Async*`` API object.
+
+    :param client_key: Client key provided by Etrade
+    :type client_key: str, required
+    :param client_secret: Client secret provided by Etrade
+    :type client_secret: str, required
+    :param resource_owner_key: Resource key from :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_key: str, required
+    :param resource_owner_secret: Resource secret from
+           :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_secret: str, required
+    :param pool_maxsize: Maximum number of open connections, defaults to 100
+    :type pool_maxsize: int, optional
+    :param keep_alive: Keep connections open between requests, defaults to True
+    :type keep_alive: bool, optional
+    :param rate_limiter: Limiter shared with other sessions, every request
+                         waits for it before being sent, defaults to None
+    :type rate_limiter: :class:`pyetrade.ratelimit.RateLimiter`, optional
+    :param retry: Retry policy for transient failures, e.g. from
+                  :func:`pyetrade.session.create_retry`. Like the sync session,
+                  only GETs in its ``allowed_methods`` and requests sent with
+                  ``retry_safe`` are retried on any failure. Other requests are
+                  only retried when refused with
+                  :data:`pyetrade.session.REFUSED_STATUSES`, defaults to None
+                  (no retries)
+    :type retry: urllib3.util.Retry, optional
+    """
+
+    def __init__(
+        self,
+        client_key: str,
+        client_secret: str,
+        resource_owner_key: str,
+        resource_owner_secret: str,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = True,
+        rate_limiter: RateLimiter = None,
+        retry: Retry = None,
+    ):
+        if aiohttp is None:  # pragma: no cover
+            raise ImportError(
+                "pyetrade.aio requires aiohttp, install it with `pip install pyetrade[async]`"
+            )
+
+        self.client = oauth1.Client(
+            client_key,
+            client_secret,
+            resource_owner_key,
+            resource_owner_secret,
+            signature_type=oauth1.SIGNATURE_TYPE_AUTH_HEADER,
+        )
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        # aiohttp sessions must be created from inside the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_maxsize, force_close=not self.keep_alive
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def sign(
+        self, method: str, url: str, params: dict = None, headers: dict = None
+    ) -> tuple:
+        """:description: Signs a request the same way :class:`requests_oauthlib.OAuth1Session` does
+
+        The body is never part of the signature since pyetrade only sends
+        xml or json bodies.
+
+        :param method: HTTP method
+        :type method: str, required
+        :param url: API URL
+        :type url: str, required
+        :param params: Query parameters, ``None`` values are dropped
+        :type params: dict, optional
+        :param headers: Request headers
+        :type headers: dict, optional
+        :return: Signed URL and headers
+        :rtype: tuple
+        """
+
+        # Encode the query string exactly like requests so signatures match
+        prepared = PreparedRequest()
+        prepared.prepare_url(url, params)
+
+        signed_url, signed_headers, _ = self.client.sign(
+            prepared.url, method, None, dict(headers or {})
+        )
+        return signed_url, signed_headers
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: dict = None,
+        data: str = None,
+        json: dict = None,
+        headers: dict = None,
+        timeout: float = None,
+        retry_safe: bool = False,
+    ) -> AsyncResponse:
+        """:description: Sends a signed request
+
+        :param method: HTTP method
+        :type method: str, required
+        :param url: API URL
+        :type url: str, required
+        :param params: Query parameters, defaults to None
+        :type params: dict, optional
+        :param data: Raw request body, defaults to None
+        :type data: str, optional
+        :param json: Request body to send as json, defaults to None
+        :type json: dict, optional
+        :param headers: Request headers, defaults to None
+        :type headers: dict, optional
+        :param timeout: Total timeout in seconds, defaults to None
+        :type timeout: float, optional
+        :param retry_safe: Request can be sent again without side effects, so
+                           any method is retried on transient failures,
+                           defaults to False
+        :type retry_safe: bool, optional
+        :return: Response with the body already read
+        :rtype: AsyncResponse
+        """
+
+        headers = dict(headers or {})
+
+        if json is not None:
+            data = jsonlib.dumps(json)
+            headers["Content-Type"] = "application/json"
+            mark("serialize")
+
+        safe = retry_safe or self._is_retryable_method(method)
+        attempt = 0
+
+        while True:
+            if attempt:
+                # Failed attempt and backoff
+                mark("network")
+
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(
+                    module_for_url(url), self.client.client_key
+                )
+                mark("throttle")
+
+            # Sign every attempt after waiting so the OAuth nonce and timestamp are fresh
+            signed_url, signed_headers = self.sign(method, url, params, headers)
+            mark("sign")
+
+            LOGGER.debug("%s %s", method, signed_url)
+
+            try:
+                async with self._get_session().request(
+                    method,
+                    URL(signed_url, encoded=True),
+                    data=data,
+                    headers=signed_headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                ) as resp:
+                    text = await resp.text()
+                    response = AsyncResponse(
+                        resp.status, resp.reason, signed_url, resp.headers, text
+                    )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                # A lost response of an unsafe request may hide a processed one
+                if not (safe and self._can_retry(attempt)):
+                    raise
+                delay = get_retry_delay(self.retry, attempt)
+                LOGGER.warning("%s failed with %r, retrying in %.2fs", url, err, delay)
+            else:
+                if not (
+                    self._can_retry(attempt)
+                    and response.status_code in self._retry_statuses(safe)
+                ):
+                    return response
+                delay = get_retry_delay(self.retry, attempt, response)
+                LOGGER.warning(
+                    "%s returned %s, retrying in %.2fs",
+                    url,
+                    response.status_code,
+                    delay,
+                )
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _can_retry(self, attempt: int) -> bool:
+        return self.retry is not None and attempt < (self.retry.total or 0)
+
+    def _is_retryable_method(self, method: str) -> bool:
+        # Only GETs are idempotent among the requests pyetrade sends
+        if self.retry is None or method.upper() != "GET":
+            return False
+        allowed = self.retry.allowed_methods
+        return allowed is None or "GET" in allowed
+
+    def _retry_statuses(self, safe: bool) -> set:
+        statuses = set(self.retry.status_forcelist or ())
+        return statuses if safe else statuses & set(REFUSED_STATUSES)
+
+    async def get(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def close(self) -> None:
+        """:description: Closes the pooled connections"""
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class _AsyncETradeBase(object):
+    def __init__(
+        self,
+        client_key: str,
+        client_secret: str,
+        resource_owner_key: str,
+        resource_owner_secret: str,
+        session: AsyncOAuth1Session = None,
+    ):
+        self.client_key = client_key
+        self.client_secret = client_secret
+        self.resource_owner_key = resource_owner_key
+        self.resource_owner_secret = resource_owner_secret
+        if session is None:
+            session = AsyncOAuth1Session(
+                self.client_key,
+                self.client_secret,
+                self.resource_owner_key,
+                self.resource_owner_secret,
+            )
+        self.session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self) -> None:
+        """:description: Closes the underlying session"""
+
+        await self.session.close()
+
+
+def _parse(req, resp_format: str) -> dict:
+    return xmltodict.parse(req.text) if resp_format.lower() == "xml" else req.json()
+
+
+class AsyncETradeMarket(_AsyncETradeBase):
+    """:description: Async version of :class:`pyetrade.market.ETradeMarket`
+
+    :param client_key: Client key provided by Etrade
+    :type client_key: str, required
+    :param client_secret: Client secret provided by Etrade
+    :type client_secret: str, required
+    :param resource_owner_key: Resource key from :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_key: str, required
+    :param resource_owner_secret: Resource secret from
+           :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_secret: str, required
+    :param dev: Defines Sandbox (True) or Live (False) ETrade, defaults to True
+    :type dev: bool, optional
+    :param session: Shared :class:`AsyncOAuth1Session`, defaults to None
+                    (a new session is created)
+    :type session: AsyncOAuth1Session, optional
+    :EtradeRef: https://apisb.etrade.com/docs/api/market/api-quote-v1.html
+    """
+
+    def __init__(
+        self,
+        client_key: str,
+        client_secret: str,
+        resource_owner_key: str,
+        resource_owner_secret: str,
+        dev: bool = True,
+        session: AsyncOAuth1Session = None,
+    ):
+        super().__init__(
+            client_key,
+            client_secret,
+            resource_owner_key,
+            resource_owner_secret,
+            session,
+        )
+        self.dev_environment = dev
+        self.base_url = f'https://{"apisb" if dev else "api"}.etrade.com/v1/market/'
+
+    async def look_up_product(self, search_str: str, resp_format: str = "xml") -> dict:
+        """:description: Async version of :class:`pyetrade.market.ETradeMarket.look_up_product`"""
+
+        api_url = "%slookup/%s" % (
+            self.base_url,
+            search_str if resp_format.lower() == "xml" else f"{search_str}.json",
+        )
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def get_quote(
+        self,
+        symbols: list[str],
+        detail_flag: str = None,
+        require_earnings_date: str = None,
+        skip_mini_options_check: str = None,
+        resp_format: str = "xml",
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.market.ETradeMarket.get_quote`"""
+
+        if detail_flag is not None:
+            detail_flag = detail_flag.lower()
+
+        assert detail_flag in (
+            "fundamental",
+            "intraday",
+            "options",
+            "week_52",
+            "all",
+            "mf_detail",
+            None,
+        )
+
+        assert require_earnings_date in (True, False, None)
+        assert skip_mini_options_check in (True, False, None)
+        assert isinstance(symbols, (list, tuple))
+
+        if len(symbols) >= 26:
+            LOGGER.warning(
+                "get_quote asked for %d requests; only first 25 returned" % len(symbols)
+            )
+
+        args = list()
+
+        if detail_flag is not None:
+            args.append("detailflag=%s" % detail_flag.upper())
+        if require_earnings_date:
+            args.append("requireEarningsDate=true")
+        if skip_mini_options_check is not None:
+            args.append("skipMiniOptionsCheck=%s" % str(skip_mini_options_check))
+
+        api_url = "%s%s%s" % (self.base_url, "quote/", ",".join(symbols[:25]))
+
+        if resp_format.lower() == "json":
+            api_url += ".json"
+        if len(args):
+            api_url += "?" + "&".join(args)
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url)
+        req.raise_for_status()
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def get_option_chains(
+        self,
+        underlier: str,
+        expiry_date: datetime.date,
+        skip_adjusted: str = None,
+        chain_type: str = None,
+        strike_price_near: int = None,
+        no_of_strikes: int = None,
+        option_category: str = None,
+        price_type: str = None,
+        resp_format: str = "xml",
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.market.ETradeMarket.get_option_chains`"""
+
+        if chain_type is not None:
+            chain_type = chain_type.lower()
+        assert chain_type in ("put", "call", "callput", None)
+
+        if option_category is not None:
+            option_category = option_category.lower()
+        assert option_category in ("standard", "all", "mini", None)
+
+        if price_type is not None:
+            price_type = price_type.lower()
+        assert price_type in ("atmn", "all", None)
+
+        assert skip_adjusted in (True, False, None)
+        assert isinstance(resp_format, str)
+
+        args = ["symbol=%s" % underlier]
+
+        if expiry_date is not None:
+            args.append(
+                "expiryDay=%02d&expiryMonth=%02d&expiryYear=%04d"
+                % (expiry_date.day, expiry_date.month, expiry_date.year)
+            )
+        if strike_price_near is not None:
+            args.append("strikePriceNear=%0.2f" % strike_price_near)
+        if chain_type is not None:
+            args.append("chainType=%s" % chain_type.upper())
+        if option_category is not None:
+            args.append("optionCategory=%s" % option_category.upper())
+        if price_type is not None:
+            args.append("priceType=%s" % price_type.upper())
+        if skip_adjusted is not None:
+            args.append("skipAdjusted=%s" % str(skip_adjusted))
+        if no_of_strikes is not None:
+            args.append("noOfStrikes=%d" % no_of_strikes)
+
+        api_url = "%s%s%s" % (
+            self.base_url,
+            "optionchains?" if resp_format.lower() == "xml" else "optionchains.json?",
+            "&".join(args),
+        )
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def get_option_expire_date(
+        self, symbol: str, resp_format: str = "xml"
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.market.ETradeMarket.get_option_expire_date`"""
+
+        assert resp_format in ["xml", "json"]
+
+        api_url = "%s%s" % (
+            self.base_url,
+            "optionexpiredate"
+            if resp_format.lower() == "xml"
+            else "optionexpiredate.json",
+        )
+
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(
+            api_url, params={"symbol": symbol, "expiryType": "ALL"}
+        )
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+
+class AsyncETradeAccounts(_AsyncETradeBase):
+    """:description: Async version of :class:`pyetrade.accounts.ETradeAccounts`
+
+    :param client_key: Client key provided by Etrade
+    :type client_key: str, required
+    :param client_secret: Client secret provided by Etrade
+    :type client_secret: str, required
+    :param resource_owner_key: Resource key from :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_key: str, required
+    :param resource_owner_secret: Resource secret from
+         :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_secret: str, required
+    :param dev: Defines Sandbox (True) or Live (False) ETrade, defaults to True
+    :type dev: bool, optional
+    :param session: Shared :class:`AsyncOAuth1Session`, defaults to None
+                    (a new session is created)
+    :type session: AsyncOAuth1Session, optional
+    :EtradeRef: https://apisb.etrade.com/docs/api/account/api-account-v1.html
+    """
+
+    def __init__(
+        self,
+        client_key: str,
+        client_secret: str,
+        resource_owner_key: str,
+        resource_owner_secret: str,
+        dev: bool = True,
+        session: AsyncOAuth1Session = None,
+    ):
+        super().__init__(
+            client_key,
+            client_secret,
+            resource_owner_key,
+            resource_owner_secret,
+            session,
+        )
+        self.base_url = f'https://{"apisb" if dev else "api"}.etrade.com/v1/accounts'
+
+    async def list_accounts(self, resp_format: str = "xml") -> dict:
+        """:description: Async version of :class:`pyetrade.accounts.ETradeAccounts.list_accounts`"""
+
+        api_url = "%s/list%s" % (
+            self.base_url,
+            ".json" if resp_format == "json" else "",
+        )
+
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def get_account_balance(
+        self,
+        account_id_key: str,
+        account_type: str = None,
+        real_time: bool = True,
+        resp_format: str = "xml",
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.accounts.ETradeAccounts.get_account_balance`"""
+
+        api_url = "%s/%s/balance%s" % (
+            self.base_url,
+            account_id_key,
+            ".json" if resp_format == "json" else "",
+        )
+
+        payload = {"realTimeNAV": real_time, "instType": "BROKERAGE"}
+
+        if account_type:
+            payload["accountType"] = account_type
+
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url, params=payload)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def get_account_portfolio(
+        self,
+        account_id_key: str,
+        count: int = 50,
+        sort_by: str = None,
+        sort_order: str = "DESC",
+        page_number: int = None,
+        market_session: str = "REGULAR",
+        totals_required: bool = False,
+        lots_required: bool = False,
+        view: str = "QUICK",
+        resp_format: str = "xml",
+        all_pages: bool = False,
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.accounts.ETradeAccounts.get_account_portfolio`
+
+        With ``all_pages`` the pages after the first are fetched as concurrent tasks.
+        """
+
+        if all_pages:
+            return merge_portfolio_pages(
+                [
+                    page
+                    async for page in self._portfolio_pages(
+                        account_id_key,
+                        count=count,
+                        sort_by=sort_by,
+                        sort_order=sort_order,
+                        market_session=market_session,
+                        totals_required=totals_required,
+                        lots_required=lots_required,
+                        view=view,
+                        resp_format=resp_format,
+                    )
+                ]
+            )
+
+        api_url = "%s/%s/portfolio%s" % (
+            self.base_url,
+            account_id_key,
+            ".json" if resp_format == "json" else "",
+        )
+
+        payload = {
+            "count": count,
+            "sortBy": sort_by,
+            "sortOrder": sort_order,
+            "pageNumber": page_number,
+            "marketSession": market_session,
+            "totalsRequired": totals_required,
+            "lotsRequired": lots_required,
+            "view": view,
+        }
+
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url, params=payload)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def _portfolio_pages(self, account_id_key: str, **kwargs):
+        first = await self.get_account_portfolio(
+            account_id_key, page_number=1, **kwargs
+        )
+        yield first
+
+        tasks = [
+            asyncio.ensure_future(
+                self.get_account_portfolio(
+                    account_id_key, page_number=page_number, **kwargs
+                )
+            )
+            for page_number in range(2, portfolio_total_pages(first) + 1)
+        ]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def iter_portfolio_positions(
+        self,
+        account_id_key: str,
+        count: int = 50,
+        sort_by: str = None,
+        sort_order: str = "DESC",
+        market_session: str = "REGULAR",
+        lots_required: bool = False,
+        view: str = "QUICK",
+        resp_format: str = "xml",
+    ):
+        """:description: Async version of :class:`pyetrade.accounts.ETradeAccounts.iter_portfolio_positions`"""
+
+        async for page in self._portfolio_pages(
+            account_id_key,
+            count=count,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            market_session=market_session,
+            lots_required=lots_required,
+            view=view,
+            resp_format=resp_format,
+        ):
+            response = page.get("PortfolioResponse") or {}
+            for portfolio in as_list(response.get("AccountPortfolio")):
+                for position in as_list(portfolio.get("Position")):
+                    yield position
+
+    async def get_portfolio_position_lot(
+        self, symbol: str, account_id_key: str, resp_format: str = "xml"
+    ) -> dict:
+        """:description: Async version of
+        :class:`pyetrade.accounts.ETradeAccounts.get_portfolio_position_lot`
+        """
+
+        portfolio = await self.get_account_portfolio(
+            account_id_key, lots_required=True, resp_format="json"
+        )
+        account_portfolio = portfolio["PortfolioResponse"]["AccountPortfolio"][0][
+            "Position"
+        ]
+
+        lot_position_id = [
+            position["positionId"]
+            for position in account_portfolio
+            if symbol.upper() == position["Product"]["symbol"].upper()
+        ]
+
+        # If the symbol exists then there should only be one ID filtered from the portfolio response
+        if len(lot_position_id) != 1:
+            raise KeyError(
+                f'Symbol "{symbol}" could not be found in the current portfolio. '
+                f"Please check your portfolio and symbol before trying again."
+            )
+
+        LOGGER.debug(lot_position_id[0])
+
+        api_url = "%s/%s/portfolio/%s%s" % (
+            self.base_url,
+            account_id_key,
+            lot_position_id[0],
+            ".json" if resp_format == "json" else "",
+        )
+
+        req = await self.session.get(api_url)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def list_transactions(
+        self,
+        account_id_key: str,
+        start_date: datetime.date = None,
+        end_date: datetime.date = None,
+        sort_order: str = "DESC",
+        marker: str = None,
+        count: int = 50,
+        resp_format: str = "xml",
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.accounts.ETradeAccounts.list_transactions`"""
+
+        api_url = "%s/%s/transactions%s" % (
+            self.base_url,
+            account_id_key,
+            ".json" if resp_format == "json" else "",
+        )
+
+        payload = {
+            "startDate": start_date.strftime("%m%d%Y") if start_date else None,
+            "endDate": end_date.strftime("%m%d%Y") if end_date else None,
+            "sortOrder": sort_order,
+            "marker": marker,
+            "count": count,
+        }
+
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url, params=payload)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        # Depending on when transactions are completed and start/end date
+        # restrictions, it's possible for the response to return nothing: ""
+        if req.text == "":
+            return {}
+
+        return _parse(req, resp_format)
+
+    async def _page_transactions(
+        self,
+        account_id_key: str,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        sort_order: str,
+        resp_format: str,
+    ):
+        marker = None
+
+        while True:
+            transactions, next_marker = transactions_page(
+                await self.list_transactions(
+                    account_id_key,
+                    start_date=start_date,
+                    end_date=end_date,
+                    sort_order=sort_order,
+                    marker=marker,
+                    count=TRANSACTIONS_PAGE_SIZE,
+                    resp_format=resp_format,
+                )
+            )
+            for transaction in transactions:
+                yield transaction
+
+            if next_marker is None or next_marker == marker:
+                return
+            marker = next_marker
+
+    async def iter_transactions(
+        self,
+        account_id_key: str,
+        start_date: datetime.date = None,
+        end_date: datetime.date = None,
+        sort_order: str = "DESC",
+        windows: int = 1,
+        resp_format: str = "xml",
+    ):
+        """:description: Async version of :class:`pyetrade.accounts.ETradeAccounts.iter_transactions`
+
+        Windows are fetched as concurrent tasks, the session's ``rate_limiter``
+        bounds the request rate.
+        """
+
+        if windows <= 1:
+            async for transaction in self._page_transactions(
+                account_id_key, start_date, end_date, sort_order, resp_format
+            ):
+                yield transaction
+            return
+
+        if start_date is None or end_date is None:
+            raise ValueError("windows requires start_date and end_date")
+
+        ranges = date_windows(start_date, end_date, windows)
+        if sort_order.upper() == "DESC":
+            ranges.reverse()
+
+        async def fetch(window):
+            return [
+                transaction
+                async for transaction in self._page_transactions(
+                    account_id_key, window[0], window[1], sort_order, resp_format
+                )
+            ]
+
+        tasks = [asyncio.ensure_future(fetch(window)) for window in ranges]
+        try:
+            for task in tasks:
+                for transaction in await task:
+                    yield transaction
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def list_transaction_details(
+        self,
+        account_id_key: str,
+        transaction_id: int,
+        store_id: any = None,
+        resp_format: str = "xml",
+    ) -> dict:
+        """:description: Async version of
+        :class:`pyetrade.accounts.ETradeAccounts.list_transaction_details`
+        """
+
+        api_url = "%s/%s/transactions/%s%s" % (
+            self.base_url,
+            account_id_key,
+            transaction_id,
+            ".json" if resp_format == "json" else "",
+        )
+
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url, params={"storeId": store_id})
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+
+class AsyncETradeOrder(_AsyncETradeBase):
+    """:description: Async version of :class:`pyetrade.order.ETradeOrder`
+
+    :param client_key: Client key provided by Etrade
+    :type client_key: str, required
+    :param client_secret: Client secret provided by Etrade
+    :type client_secret: str, required
+    :param resource_owner_key: Resource key from :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_key: str, required
+    :param resource_owner_secret: Resource secret from
+           :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_secret: str, required
+    :param dev: Defines Sandbox (True) or Live (False) ETrade, defaults to True
+    :type dev: bool, optional
+    :param timeout: Timeout value for requests, defaults to 30
+    :type timeout: int, optional
+    :param session: Shared :class:`AsyncOAuth1Session`, defaults to None
+                    (a new session is created)
+    :type session: AsyncOAuth1Session, optional
+    :param preview_cache: Cache of previews reused by place order requests
+                          without ``previewId``, defaults to None (no caching)
+    :type preview_cache: :class:`pyetrade.cache.PreviewCache`, optional
+    :param timings: Records the phases of every preview, place, change and
+                    cancel, defaults to None (no timing)
+    :type timings: :class:`pyetrade.timing.OrderTimings`, optional
+    :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
+    """
+
+    check_order = staticmethod(ETradeOrder.check_order)
+    build_order_payload = staticmethod(ETradeOrder.build_order_payload)
+    _preview_key = staticmethod(ETradeOrder._preview_key)
+    _cache_preview = ETradeOrder._cache_preview
+    _cached_preview = ETradeOrder._cached_preview
+    _forget_preview = ETradeOrder._forget_preview
+
+    def __init__(
+        self,
+        client_key: str,
+        client_secret: str,
+        resource_owner_key: str,
+        resource_owner_secret: str,
+        dev: bool = True,
+        timeout: int = 30,
+        session: AsyncOAuth1Session = None,
+        preview_cache: PreviewCache = None,
+        timings: OrderTimings = None,
+    ):
+        super().__init__(
+            client_key,
+            client_secret,
+            resource_owner_key,
+            resource_owner_secret,
+            session,
+        )
+        self.dev_environment = dev
+        self.base_url = f'https://{"apisb" if dev else "api"}.etrade.com/v1/accounts'
+        self.timeout = timeout
+        self.preview_cache = preview_cache
+        self.timings = timings
+
+    async def list_orders(
+        self,
+        account_id_key: str,
+        marker: str = None,
+        count: int = 25,
+        status: str = None,
+        from_date: datetime = None,
+        to_date: datetime = None,
+        symbols: list[str] = None,
+        security_type: str = None,
+        transaction_type: str = None,
+        market_session: str = "REGULAR",
+        resp_format: str = "json",
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.list_orders`"""
+
+        if symbols and len(symbols) >= 26:
+            LOGGER.warning(
+                "list_orders asked for %d requests; only first 25 returned"
+                % len(symbols)
+            )
+
+        api_url = f"{self.base_url}/{account_id_key}/orders{'.json' if resp_format == 'json' else ''}"
+        LOGGER.debug(api_url)
+
+        if count >= 101:
+            LOGGER.debug(
+                f"Count {count} is greater than the max allowable value (100), using 100."
+            )
+            count = 100
+
+        payload = {
+            "marker": marker,
+            "count": count,
+            "status": status,
+            "fromDate": from_date.date().strftime("%m%d%Y") if from_date else None,
+            "toDate": to_date.date().strftime("%m%d%Y") if to_date else None,
+            "symbol": ",".join([sym for sym in symbols[:25]]) if symbols else None,
+            "securityType": security_type,
+            "transactionType": transaction_type,
+            "marketSession": market_session,
+        }
+
+        req = await self.session.get(api_url, params=payload, timeout=self.timeout)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return get_request_result(req, resp_format)
+
+    async def iter_orders(
+        self,
+        account_id_key: str,
+        status: str = None,
+        from_date: datetime = None,
+        to_date: datetime = None,
+        symbols: list[str] = None,
+        security_type: str = None,
+        transaction_type: str = None,
+        market_session: str = "REGULAR",
+        resp_format: str = "json",
+    ):
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.iter_orders`"""
+
+        marker = None
+
+        while True:
+            orders = await self.list_orders(
+                account_id_key,
+                marker=marker,
+                count=100,
+                status=status,
+                from_date=from_date,
+                to_date=to_date,
+                symbols=symbols,
+                security_type=security_type,
+                transaction_type=transaction_type,
+                market_session=market_session,
+                resp_format=resp_format,
+            )  # this call may return empty
+
+            orders_response = orders.get("OrdersResponse") or {}
+            for order in as_list(orders_response.get("Order")):
+                yield order
+
+            next_marker = orders_response.get("marker")
+            if not next_marker or next_marker == marker:
+                return
+            marker = next_marker
+
+    async def list_order_details(
+        self, account_id_key: str, order_id: int, resp_format: str = "json"
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.list_order_details`"""
+
+        api_url = f"{self.base_url}/{account_id_key}/orders/{order_id}{'.json' if resp_format == 'json' else ''}"
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def find_option_orders(
+        self,
+        account_id_key: str,
+        symbol: str,
+        call_put: str,
+        expiry_date: str,
+        strike_price: float,
+    ) -> list:
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.find_option_orders`"""
+
+        opt_sym = option_symbol(symbol, call_put, expiry_date, strike_price)
+        index = OpenOrderIndex()
+        index.update(
+            [order async for order in self.iter_orders(account_id_key, status="OPEN")]
+        )
+
+        return index.find(osi=opt_sym)
+
+    async def perform_request(
+        self,
+        method,
+        api_url: str,
+        payload: dict,
+        resp_format: str = "xml",
+        retry_safe: bool = False,
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.perform_request`
+
+        Retries follow the ``retry`` policy of the session.
+
+        :param method: ``put`` or ``post`` coroutine function of the session
+        :type method: coroutine function, required
+        """
+
+        LOGGER.debug(api_url)
+        LOGGER.debug("payload: %s", payload)
+
+        if resp_format == "json":
+            req = await method(
+                api_url, json=payload, timeout=self.timeout, retry_safe=retry_safe
+            )
+        else:
+            headers = {"Content-Type": "application/xml"}
+            payload = emit_order_xml(payload)
+            LOGGER.debug("xml payload: %s", payload)
+            mark("serialize")
+            req = await method(
+                api_url,
+                data=payload,
+                headers=headers,
+                timeout=self.timeout,
+                retry_safe=retry_safe,
+            )
+        mark("network")
+
+        result = get_request_result(req, resp_format)
+        mark("parse")
+        return result
+
+    @timed("preview")
+    async def preview_equity_order(self, **kwargs) -> dict:
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.preview_equity_order`"""
+
+        LOGGER.debug(kwargs)
+        resp_format = kwargs.pop("resp_format", "xml")
+
+        # Test required values
+        self.check_order(**kwargs)
+        mark("check")
+
+        api_url = f'{self.base_url}/{kwargs["accountIdKey"]}/orders/preview'
+        if resp_format == "json":
+            api_url += ".json"
+
+        # payload creation
+        payload = self.build_order_payload("PreviewOrderRequest", **kwargs)
+        mark("build")
+
+        preview = await self.perform_request(
+            self.session.post, api_url, payload, resp_format, retry_safe=True
+        )
+        if resp_format == "json":
+            preview = xml_shaped(preview)
+        return self._cache_preview(preview, **kwargs)
+
+    @timed("change_preview")
+    async def change_preview_equity_order(
+        self, account_id_key: str, order_id: str, **kwargs
+    ) -> dict:
+        """:description: Async version of
+        :class:`pyetrade.order.ETradeOrder.change_preview_equity_order`
+        """
+
+        LOGGER.debug(kwargs)
+        resp_format = kwargs.pop("resp_format", "xml")
+
+        # Test required values
+        self.check_order(**kwargs)
+        mark("check")
+
+        api_url = f"{self.base_url}/{account_id_key}/orders/{order_id}/change/preview"
+        if resp_format == "json":
+            api_url += ".json"
+
+        # payload creation
+        payload = self.build_order_payload("PreviewOrderRequest", **kwargs)
+        mark("build")
+
+        preview = await self.perform_request(
+            self.session.put, api_url, payload, resp_format, retry_safe=True
+        )
+        if resp_format == "json":
+            preview = xml_shaped(preview)
+        return self._cache_preview(preview, **{**kwargs, "orderId": order_id})
+
+    async def place_option_order(self, **kwargs) -> dict:
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.place_option_order`"""
+
+        kwargs["securityType"] = "OPTN"
+
+        return await self.place_equity_order(**kwargs)
+
+    @timed("place")
+    async def place_equity_order(self, **kwargs) -> dict:
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.place_equity_order`"""
+
+        LOGGER.debug(kwargs)
+        resp_format = kwargs.pop("resp_format", "xml")
+
+        # Test required values
+        self.check_order(**kwargs)
+        mark("check")
+
+        preview = None if "previewId" in kwargs else self._cached_preview(**kwargs)
+
+        if "previewId" not in kwargs and preview is None:
+            LOGGER.debug(
+                "No previewId given, previewing before placing order "
+                "because Etrade requires all orders to have a previewId"
+            )
+
+            preview = await self.preview_equity_order(resp_format=resp_format, **kwargs)
+
+        if preview is not None:
+            kwargs["previewId"] = preview["PreviewOrderResponse"]["PreviewIds"][
+                "previewId"
+            ]
+
+            LOGGER.debug(
+                "Got a successful preview with previewId: %s", kwargs["previewId"]
+            )
+            mark("preview")
+
+        api_url = f'{self.base_url}/{kwargs["accountIdKey"]}/orders/place'
+        if resp_format == "json":
+            api_url += ".json"
+
+        # payload creation
+        payload = self.build_order_payload("PlaceOrderRequest", **kwargs)
+        mark("build")
+
+        result = await self.perform_request(
+            self.session.post, api_url, payload, resp_format
+        )
+        if resp_format == "json":
+            result = xml_shaped(result)
+        return self._forget_preview(result, **kwargs)
+
+    async def place_changed_option_order(self, **kwargs) -> dict:
+        """:description: Async version of
+        :class:`pyetrade.order.ETradeOrder.place_changed_option_order`
+        """
+
+        kwargs["securityType"] = "OPTN"
+
+        return await self.place_changed_equity_order(**kwargs)
+
+    @timed("place_changed")
+    async def place_changed_equity_order(self, **kwargs) -> dict:
+        """:description: Async version of
+        :class:`pyetrade.order.ETradeOrder.place_changed_equity_order`
+        """
+
+        LOGGER.debug(kwargs)
+        resp_format = kwargs.pop("resp_format", "xml")
+
+        # Test required values
+        self.check_order(**kwargs)
+        mark("check")
+
+        preview = None if "previewId" in kwargs else self._cached_preview(**kwargs)
+
+        if "previewId" not in kwargs and preview is None:
+            LOGGER.debug(
+                "No previewId given, previewing before placing order "
+                "because of an Etrade bug as of 1/1/2019"
+            )
+            preview = await self.preview_equity_order(resp_format=resp_format, **kwargs)
+
+        if preview is not None:
+            if "Error" in preview:
+                LOGGER.error(preview)
+                raise Exception("Please check your order!")
+
+            kwargs["previewId"] = preview["PreviewOrderResponse"]["PreviewIds"][
+                "previewId"
+            ]
+            LOGGER.debug(
+                "Got a successful preview with previewId: %s", kwargs["previewId"]
+            )
+            mark("preview")
+
+        api_url = f'{self.base_url}/{kwargs["accountIdKey"]}/orders/{kwargs["orderId"]}/change/place'
+        if resp_format == "json":
+            api_url += ".json"
+
+        # payload creation
+        payload = self.build_order_payload("PlaceOrderRequest", **kwargs)
+        mark("build")
+
+        result = await self.perform_request(
+            self.session.put, api_url, payload, resp_format
+        )
+        if resp_format == "json":
+            result = xml_shaped(result)
+        return self._forget_preview(result, **kwargs)
+
+    @timed("cancel")
+    async def cancel_order(
+        self, account_id_key: str, order_num: int, resp_format: str = "xml"
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.cancel_order`"""
+
+        api_url = f"{self.base_url}/{account_id_key}/orders/cancel"
+        if resp_format == "json":
+            api_url += ".json"
+        payload = {"CancelOrderRequest": {"orderId": order_num}}
+        mark("build")
+
+        result = await self.perform_request(
+            self.session.put, api_url, payload, resp_format, retry_safe=True
+        )
+        if resp_format == "json":
+            result = xml_shaped(result)
+        return result
+
+    async def cancel_orders(
+        self,
+        account_id_key: str,
+        order_ids: list = None,
+        symbols: list = None,
+        osi_symbols: list = None,
+        max_workers: int = 8,
+        resp_format: str = "xml",
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.order.ETradeOrder.cancel_orders`"""
+
+        started = time.perf_counter()
+
+        if order_ids is None:
+            index = OpenOrderIndex()
+            index.update(
+                [
+                    order
+                    async for order in self.iter_orders(account_id_key, status="OPEN")
+                ]
+            )
+            order_ids = index.select(symbols=symbols, osi_symbols=osi_symbols)
+        order_ids = list(dict.fromkeys(order_ids))
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def cancel(order_id):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await self.cancel_order(
+                        account_id_key, order_id, resp_format=resp_format
+                    )
+                    return response, None, time.perf_counter() - start
+                except Exception as err:
+                    LOGGER.warning("Cancel of order %s failed: %s", order_id, err)
+                    return None, err, time.perf_counter() - start
+
+        results = {}
+        for order_id, (response, error, elapsed) in zip(
+            order_ids, await asyncio.gather(*[cancel(o) for o in order_ids])
+        ):
+            results[order_id] = {
+                "response": response,
+                "error": error,
+                "elapsed": elapsed,
+            }
+
+        failed = sum(result["error"] is not None for result in results.values())
+
+        return {
+            "orders": results,
+            "cancelled": len(results) - failed,
+            "failed": failed,
+            "elapsed": time.perf_counter() - started,
+        }
+
+
+class AsyncOrderTracker(OrderTracker):
+    """:description: Async version of :class:`pyetrade.tracker.OrderTracker`
+
+    Subscribers are called on the event loop. Iterate over :class:`events`,
+    or :class:`start` a task and :class:`stop` it.
+
+    :param orders_api: Order API the orders are listed with
+    :type orders_api: AsyncETradeOrder, required
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.task = None
+
+    async def poll(self) -> list:
+        """:description: Async version of :class:`pyetrade.tracker.OrderTracker.poll`"""
+
+        published = []
+        for account_id_key in self.account_id_keys:
+            orders = [
+                order
+                async for order in self.orders_api.iter_orders(
+                    account_id_key, status=self.status, resp_format="json"
+                )
+            ]
+            events, missing = self._diff(account_id_key, orders)
+
+            for order_id in missing:
+                try:
+                    details = await self.orders_api.list_order_details(
+                        account_id_key, order_id, resp_format="json"
+                    )
+                except Exception as err:
+                    LOGGER.warning("Order %s lookup failed: %s", order_id, err)
+                    continue
+                events.extend(self._close(account_id_key, order_id, details))
+
+            self._publish(events)
+            published.extend(events)
+
+        return published
+
+    async def events(self):
+        """:description: Sweeps every ``interval`` seconds and yields each event"""
+
+        while True:
+            for event in await self.poll():
+                yield event
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        """:description: Polls every ``interval`` seconds in a task until :class:`stop`"""
+
+        async def run():
+            while True:
+                try:
+                    await self.poll()
+                except Exception as err:
+                    LOGGER.warning("Order tracker sweep failed: %s", err)
+                await asyncio.sleep(self.interval)
+
+        self.task = asyncio.ensure_future(run())
+        return self.task
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+
+class AsyncETradeAlerts(_AsyncETradeBase):
+    """:description: Async version of :class:`pyetrade.alerts.ETradeAlerts`
+
+    :param client_key: Client key provided by Etrade
+    :type client_key: str, required
+    :param client_secret: Client secret provided by Etrade
+    :type client_secret: str, required
+    :param resource_owner_key: Resource key from :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_key: str, required
+    :param resource_owner_secret: Resource secret from
+           :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_secret: str, required
+    :param dev: Defines Sandbox (True) or Live (False) ETrade, defaults to True
+    :type dev: bool, optional
+    :param session: Shared :class:`AsyncOAuth1Session`, defaults to None
+                    (a new session is created)
+    :type session: AsyncOAuth1Session, optional
+    :EtradeRef: https://apisb.etrade.com/docs/api/user/api-alert-v1.html
+    """
+
+    def __init__(
+        self,
+        client_key: str,
+        client_secret: str,
+        resource_owner_key: str,
+        resource_owner_secret: str,
+        dev: bool = True,
+        session: AsyncOAuth1Session = None,
+    ):
+        super().__init__(
+            client_key,
+            client_secret,
+            resource_owner_key,
+            resource_owner_secret,
+            session,
+        )
+        self.base_url = f'https://{"apisb" if dev else "api"}.etrade.com/v1/user/alerts'
+
+    async def list_alerts(
+        self, count: int = 25, sort_order: str = "DESC", resp_format: str = "xml"
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.alerts.ETradeAlerts.list_alerts`"""
+
+        api_url = "%s%s" % (
+            self.base_url,
+            ".json" if resp_format == "json" else "",
+        )
+        LOGGER.debug(api_url)
+
+        if count >= 301:
+            LOGGER.debug(
+                f"Count {count} is greater than the max allowable value (300), using 300"
+            )
+            count = 300
+
+        req = await self.session.get(
+            api_url, params={"count": count, "direction": sort_order}
+        )
+
+        req.raise_for_status()
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def list_alert_details(
+        self, alert_id: int, html_tags: bool = False, resp_format: str = "xml"
+    ) -> dict:
+        """:description: Async version of :class:`pyetrade.alerts.ETradeAlerts.list_alert_details`"""
+
+        api_url = "%s%s/%s" % (
+            self.base_url,
+            ".json" if resp_format == "json" else "",
+            alert_id,
+        )
+
+        LOGGER.debug(api_url)
+
+        req = await self.session.get(api_url, params={"htmlTags": html_tags})
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
+
+    async def delete_alert(self, alert_id: int, resp_format: str = "xml") -> dict:
+        """:description: Async version of :class:`pyetrade.alerts.ETradeAlerts.delete_alert`"""
+
+        api_url = "%s%s/%s" % (
+            self.base_url,
+            ".json" if resp_format == "json" else "",
+            alert_id,
+        )
+
+        LOGGER.debug(api_url)
+
+        req = await self.session.delete(api_url)
+        req.raise_for_status()
+
+        LOGGER.debug(req.text)
+
+        return _parse(req, resp_format)
@@ -21,6 +21,9 @@ class ETradeAlerts(object):
     :type resource_owner_secret: str, required
     :param dev: Defines Sandbox (True) or Live (False) ETrade, defaults to True
     :type dev: bool, optional
+    :param session: Shared session from :func:`pyetrade.session.create_session`,
+                    defaults to None (a new session is created)
+    :type session: OAuth1Session, optional
     :EtradeRef: https://apisb.etrade.com/docs/api/user/api-alert-v1.html
     """
 
@@ -31,19 +34,22 @@ class ETradeAlerts(object):
         resource_owner_key: str,
         resource_owner_secret: str,
         dev: bool = True,
+        session: OAuth1Session = None,
     ):
         self.client_key = client_key
         self.client_secret = client_secret
         self.resource_owner_key = resource_owner_key
         self.resource_owner_secret = resource_owner_secret
         self.base_url = f'https://{"apisb" if dev else "api"}.etrade.com/v1/user/alerts'
-        self.session = OAuth1Session(
-            self.client_key,
-            self.client_secret,
-            self.resource_owner_key,
-            self.resource_owner_secret,
-            signature_type="AUTH_HEADER",
-        )
+        if session is None:
+            session = OAuth1Session(
+                self.client_key,
+                self.client_secret,
+                self.resource_owner_key,
+                self.resource_owner_secret,
+                signature_type="AUTH_HEADER",
+            )
+        self.session = session
 
     def list_alerts(
         self, count: int = 25, sort_order: str = "DESC", resp_format: str = "xml"
@@ -101,6 +101,9 @@ class ETradeAccessManager(object):
     :type resource_owner_key: str, required
     :param resource_owner_secret: Resource secret from :class:`ETradeOAuth`
     :type resource_owner_secret: str, required
+    :param session: Shared session from :func:`pyetrade.session.create_session`,
+                    defaults to None (a new session is created)
+    :type session: OAuth1Session, optional
     :EtradeRef: https://apisb.etrade.com/docs/api/authorization/renew_access_token.html
     """
 
@@ -110,6 +113,7 @@ class ETradeAccessManager(object):
         client_secret: str,
         resource_owner_key: str,
         resource_owner_secret: str,
+        session: OAuth1Session = None,
     ):
         self.client_key = client_key
         self.client_secret = client_secret
@@ -119,13 +123,15 @@ class ETradeAccessManager(object):
         self.revoke_access_token_url = (
             r"https://api.etrade.com/oauth/revoke_access_token"
         )
-        self.session = OAuth1Session(
-            self.client_key,
-            self.client_secret,
-            self.resource_owner_key,
-            self.resource_owner_secret,
-            signature_type="AUTH_HEADER",
-        )
+        if session is None:
+            session = OAuth1Session(
+                self.client_key,
+                self.client_secret,
+                self.resource_owner_key,
+                self.resource_owner_secret,
+                signature_type="AUTH_HEADER",
+            )
+        self.session = session
 
     def renew_access_token(self) -> bool:
         """:description: Renews access tokens obtained from :class:`ETradeOAuth`
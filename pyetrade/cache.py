@@ -0,0 +1,279 @@
+"""Cache - In memory caching of ETrade API responses
+
+    :class:`QuoteCache` keeps the latest quote of each symbol so components of
+    one process asking for the same symbols within its TTL share one request.
+    Pass it to :class:`pyetrade.market.ETradeMarket` as ``quote_cache``.
+    :class:`PreviewCache` keeps order previews so placing an order that was
+    just previewed does not preview it again.
+
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+LOGGER = logging.getLogger(__name__)
+
+# Seconds a quote stays fresh per detail flag. Intraday prices move every
+# tick, fundamentals and 52 week ranges change at most daily.
+DEFAULT_TTLS = {
+    "all": 1.0,
+    "intraday": 1.0,
+    "options": 1.0,
+    "fundamental": 60.0,
+    "week_52": 60.0,
+    "mf_detail": 60.0,
+}
+
+
+class QuoteCache(object):
+    """:description: Thread safe LRU cache of quotes keyed by symbol and detail flag
+
+    An entry older than its TTL but younger than ``TTL + stale_ttl`` is still
+    returned (stale-while-revalidate) while :class:`refresh` fetches a new
+    one in the background. Older entries are misses.
+
+    :param ttls: ``{detail_flag: seconds}`` overriding :data:`DEFAULT_TTLS`,
+                 defaults to None
+    :type ttls: dict, optional
+    :param default_ttl: TTL of detail flags missing from ``ttls``, defaults to 1.0
+    :type default_ttl: float, optional
+    :param stale_ttl: Seconds an expired quote may still be served, defaults to 0
+    :type stale_ttl: float, optional
+    :param maxsize: Maximum number of quotes kept, defaults to 10000
+    :type maxsize: int, optional
+    :param clock: Monotonic clock, defaults to :func:`time.monotonic`
+    :type clock: callable, optional
+    """
+
+    def __init__(
+        self,
+        ttls: dict = None,
+        default_ttl: float = 1.0,
+        stale_ttl: float = 0.0,
+        maxsize: int = 10000,
+        clock=time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.refreshing = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.lock = threading.Lock()
+
+    def ttl(self, detail_flag: str = None) -> float:
+        """:description: TTL of quotes requested with ``detail_flag``"""
+
+        return self.ttls.get(detail_flag or "all", self.default_ttl)
+
+    def lookup(self, symbol: str, detail_flag: str = None, resp_format: str = "xml"):
+        """:description: Looks up a cached quote
+
+        :param symbol: Symbol as passed to :class:`pyetrade.market.ETradeMarket.get_quote`
+        :type symbol: str, required
+        :param detail_flag: Lower case detail flag, defaults to None
+        :type detail_flag: str, optional
+        :param resp_format: Response format the quote was parsed from, defaults to xml
+        :type resp_format: str, optional
+        :return: ``(quote, stale)`` or None on a miss
+        :rtype: tuple or None
+        """
+
+        key = (symbol, detail_flag, resp_format)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                quote, stored = entry
+                age = self.clock() - stored
+                ttl = self.ttl(detail_flag)
+                if age < ttl + self.stale_ttl:
+                    self.entries.move_to_end(key)
+                    if age < ttl:
+                        self.hits += 1
+                        return quote, False
+                    self.stale_hits += 1
+                    return quote, True
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, symbol: str, detail_flag: str, resp_format: str, quote: dict) -> None:
+        """:description: Stores ``quote``, evicting the least recently used quotes"""
+
+        key = (symbol, detail_flag, resp_format)
+
+        with self.lock:
+            self.entries[key] = (quote, self.clock())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def refresh(self, keys: list, fetch) -> threading.Thread:
+        """:description: Calls ``fetch(keys)`` on a background thread
+
+        Keys already being refreshed are skipped so a burst of stale hits
+        makes one request.
+
+        :param keys: ``(symbol, detail_flag, resp_format)`` keys to refresh
+        :type keys: list, required
+        :param fetch: Callable fetching the given keys and storing them with :class:`put`
+        :type fetch: callable, required
+        :return: The started thread, or None if every key is already refreshing
+        :rtype: threading.Thread or None
+        """
+
+        with self.lock:
+            keys = [key for key in keys if key not in self.refreshing]
+            self.refreshing.update(keys)
+            if keys:
+                self.refreshes += 1
+
+        if not keys:
+            return None
+
+        def run():
+            try:
+                fetch(keys)
+            except Exception as err:
+                LOGGER.warning("Quote refresh of %s failed: %s", keys, err)
+            finally:
+                with self.lock:
+                    self.refreshing.difference_update(keys)
+
+        thread = threading.Thread(
+            target=run, name="pyetrade-quote-refresh", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        """:description: Cache counters
+
+        :return: ``{"size", "hits", "stale_hits", "misses", "evictions", "refreshes"}``
+        :rtype: dict
+        """
+
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "refreshes": self.refreshes,
+            }
+
+
+class PreviewCache(object):
+    """:description: Thread safe cache of order previews keyed by order payload
+
+    :class:`pyetrade.order.ETradeOrder` stores every preview here and a place
+    order without ``previewId`` reuses the previewId of the identical order
+    previewed within ``ttl`` instead of previewing again. Pass it to
+    :class:`pyetrade.order.ETradeOrder` as ``preview_cache``.
+
+    :param ttl: Seconds a preview is reused, keep it below the few minutes
+                ETrade accepts a previewId for, defaults to 120
+    :type ttl: float, optional
+    :param maxsize: Maximum number of previews kept, defaults to 1000
+    :type maxsize: int, optional
+    :param clock: Monotonic clock, defaults to :func:`time.monotonic`
+    :type clock: callable, optional
+    """
+
+    def __init__(self, ttl: float = 120.0, maxsize: int = 1000, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(payload: dict) -> str:
+        """:description: Canonical hash of an order payload
+
+        :param payload: Payload as built by
+                        :class:`pyetrade.order.ETradeOrder.build_order_payload`
+        :type payload: dict, required
+        :return: sha256 hex digest, equal for equal payloads whatever the key order
+        :rtype: str
+        """
+
+        canonical = json.dumps(
+            payload, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def lookup(self, key: str):
+        """:description: Preview response stored under ``key`` within the TTL or None"""
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                preview, stored = entry
+                if self.clock() - stored < self.ttl:
+                    self.hits += 1
+                    return preview
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, preview: dict) -> None:
+        """:description: Stores ``preview``, evicting the oldest previews"""
+
+        with self.lock:
+            self.entries[key] = (preview, self.clock())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        """:description: Forgets a preview, e.g. once its order is placed"""
+
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        """:description: Cache counters
+
+        :return: ``{"size", "hits", "misses", "evictions"}``
+        :rtype: dict
+        """
+
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -5,13 +5,230 @@
 
 """
 import logging
+import threading
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import xmltodict
 from requests_oauthlib import OAuth1Session
 
+from .cache import QuoteCache
+from .utils import as_list
+
 LOGGER = logging.getLogger(__name__)
 
+# Maximum number of symbols ETrade accepts in one quote request
+QUOTE_LIMIT = 25
+
+
+def _symbol_key(symbol: str) -> tuple:
+    """Key of a requested symbol, options in ``underlier:year:month:day:optionType:strikePrice`` format"""
+
+    parts = symbol.upper().split(":")
+    if len(parts) == 1:
+        return ("EQ", parts[0])
+    try:
+        underlier, year, month, day, call_put, strike = parts
+        return (
+            "OPTN",
+            underlier,
+            int(year) % 100,
+            int(month),
+            int(day),
+            call_put,
+            float(strike),
+        )
+    except ValueError:
+        return None
+
+
+def _quote_key(quote: dict) -> tuple:
+    """Key of a QuoteData element, comparable with :func:`_symbol_key`"""
+
+    product = quote.get("Product") or {}
+    symbol = (product.get("symbol") or "").upper()
+    if product.get("securityType") != "OPTN":
+        return ("EQ", symbol)
+    try:
+        return (
+            "OPTN",
+            symbol,
+            int(product["expiryYear"]) % 100,
+            int(product["expiryMonth"]),
+            int(product["expiryDay"]),
+            product["callPut"].upper(),
+            float(product["strikePrice"]),
+        )
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def match_quotes(symbols: list[str], resp: dict) -> tuple:
+    """:description: Maps the QuoteData of a parsed quote response to the requested symbols
+
+    Quotes come back in request order unless some symbols were rejected. Then
+    equity quotes are matched on their symbol and option quotes on underlier,
+    expiry, call/put and strike. Quotes that match no symbol, or one symbol
+    with another quote, are left out as missing.
+
+    :param symbols: Symbols the quote request was made for
+    :type symbols: list[str], required
+    :param resp: Parsed :class:`ETradeMarket.get_quote` response
+    :type resp: dict, required
+    :return: ``({symbol: quote}, messages)``
+    :rtype: tuple
+    """
+
+    response = resp.get("QuoteResponse") or {}
+    quote_data = as_list(response.get("QuoteData"))
+    messages = as_list((response.get("Messages") or {}).get("Message"))
+
+    # Option quotes don't echo the requested symbol
+    if len(quote_data) == len(symbols):
+        return dict(zip(symbols, quote_data)), messages
+
+    by_key = {}
+    for quote in quote_data:
+        key = _quote_key(quote)
+        if key is not None:
+            by_key.setdefault(key, []).append(quote)
+
+    quotes = {}
+    for symbol in symbols:
+        matched = by_key.get(_symbol_key(symbol), [])
+        if len(matched) == 1:
+            quotes[symbol] = matched[0]
+    return quotes, messages
+
+
+def quote_response(
+    symbols: list[str], quotes: dict, messages: list, resp_format: str
+) -> dict:
+    """:description: Builds a quote response for ``symbols`` out of ``quotes``
+
+    The result has the shape of a parsed response, ``xmltodict`` collapses single
+    elements into dicts.
+    """
+
+    quote_data = [quotes[symbol] for symbol in symbols if symbol in quotes]
+    if resp_format == "xml" and len(quote_data) == 1:
+        quote_data = quote_data[0]
+    response = {"QuoteData": quote_data}
+    if messages:
+        if resp_format == "xml" and len(messages) == 1:
+            messages = messages[0]
+        response["Messages"] = {"Message": messages}
+
+    return {"QuoteResponse": response}
+
+
+class _QuoteBatch(object):
+    def __init__(self):
+        self.symbols = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.quotes = {}
+        self.messages = []
+        self.error = None
+
+
+class QuoteBatcher(object):
+    """:description: Merges concurrent quote calls into shared requests
+
+    The first call of a batch waits up to ``window`` seconds, or until the batch
+    holds ``max_symbols`` symbols, then makes one request for every symbol
+    collected. Each call gets a response with just its own symbols. Calls with
+    a different detail flag or response format are batched separately.
+
+    :param request: ``request(symbols, detail_flag, resp_format)`` returning a
+                    parsed quote response
+    :type request: callable, required
+    :param window: Seconds to collect calls for, defaults to 0.01
+    :type window: float, optional
+    :param max_symbols: Symbols per request, defaults to 25
+    :type max_symbols: int, optional
+    """
+
+    def __init__(self, request, window: float = 0.01, max_symbols: int = QUOTE_LIMIT):
+        self.request = request
+        self.window = window
+        self.max_symbols = max_symbols
+        self.pending = {}
+        self.calls = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def _close(self, key: tuple, batch: _QuoteBatch) -> None:
+        if self.pending.get(key) is batch:
+            del self.pending[key]
+            self.requests += 1
+        batch.full.set()
+
+    def get(self, symbols: list[str], detail_flag: str, resp_format: str) -> dict:
+        """:description: Quotes ``symbols`` as part of a shared request
+
+        :param symbols: At most ``max_symbols`` symbols
+        :type symbols: list[str], required
+        :param detail_flag: Lower case detail flag
+        :type detail_flag: str, required
+        :param resp_format: ``xml`` or ``json``
+        :type resp_format: str, required
+        :return: Quote response of ``symbols``
+        :rtype: dict
+        """
+
+        key = (detail_flag, resp_format)
+        symbols = list(symbols)
+        leader = False
+
+        with self.lock:
+            self.calls += 1
+            batch = self.pending.get(key)
+            if batch is not None:
+                new = [s for s in dict.fromkeys(symbols) if s not in batch.symbols]
+                if len(batch.symbols) + len(new) > self.max_symbols:
+                    self._close(key, batch)
+                    batch = None
+            if batch is None:
+                batch = _QuoteBatch()
+                self.pending[key] = batch
+                new = list(dict.fromkeys(symbols))
+                leader = True
+            batch.symbols.extend(new)
+            if len(batch.symbols) >= self.max_symbols:
+                self._close(key, batch)
+
+        if leader:
+            batch.full.wait(self.window)
+            with self.lock:
+                self._close(key, batch)
+            try:
+                resp = self.request(batch.symbols, detail_flag, resp_format)
+                batch.quotes, batch.messages = match_quotes(batch.symbols, resp)
+            except Exception as err:
+                batch.error = err
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+
+        # Messages can't be told apart, they go to calls missing a quote
+        messages = []
+        if any(symbol not in batch.quotes for symbol in symbols):
+            messages = batch.messages
+
+        return quote_response(symbols, batch.quotes, messages, resp_format)
+
+    def stats(self) -> dict:
+        """:description: Number of ``get`` calls and of the requests made for them"""
+
+        with self.lock:
+            return {"calls": self.calls, "requests": self.requests}
+
 
 class ETradeMarket(object):
     """:description: Performs Market functions
@@ -27,6 +244,15 @@ class ETradeMarket(object):
     :type resource_owner_secret: str, required
     :param dev: Defines Sandboxi (True) or Live (False) ETrade, defaults to True
     :type dev: bool, optional
+    :param session: Shared session from :func:`pyetrade.session.create_session`,
+                    defaults to None (a new session is created)
+    :type session: OAuth1Session, optional
+    :param quote_cache: Cache shared by :class:`get_quote` calls, defaults to None
+    :type quote_cache: pyetrade.cache.QuoteCache, optional
+    :param batch_window: Seconds :class:`get_quote` waits to merge concurrent calls
+                         into one request, see :class:`QuoteBatcher`, defaults
+                         to None (no batching)
+    :type batch_window: float, optional
     :EtradeRef: https://apisb.etrade.com/docs/api/market/api-quote-v1.html
 
     """
@@ -38,6 +264,9 @@ class ETradeMarket(object):
         resource_owner_key: str,
         resource_owner_secret: str,
         dev: bool = True,
+        session: OAuth1Session = None,
+        quote_cache: QuoteCache = None,
+        batch_window: float = None,
     ):
         self.client_key = client_key
         self.client_secret = client_secret
@@ -45,13 +274,19 @@ class ETradeMarket(object):
         self.resource_owner_secret = resource_owner_secret
         self.dev_environment = dev
         self.base_url = f'https://{"apisb" if dev else "api"}.etrade.com/v1/market/'
-        self.session = OAuth1Session(
-            self.client_key,
-            self.client_secret,
-            self.resource_owner_key,
-            self.resource_owner_secret,
-            signature_type="AUTH_HEADER",
-        )
+        if session is None:
+            session = OAuth1Session(
+                self.client_key,
+                self.client_secret,
+                self.resource_owner_key,
+                self.resource_owner_secret,
+                signature_type="AUTH_HEADER",
+            )
+        self.session = session
+        self.quote_cache = quote_cache
+        self.quote_batcher = None
+        if batch_window is not None:
+            self.quote_batcher = QuoteBatcher(self._batch_request, batch_window)
 
     def __str__(self):
         ret = [
@@ -112,6 +347,7 @@ class ETradeMarket(object):
         :rtype: xml or json based on ``resp_format``
         :symbols values:
             * Limited to 25. If exceeded, first 25 will be processed with warnings
+              (use :class:`get_quotes` for longer lists)
             * Equities format - ``symbol`` name sufficient, e.g. GOOGL.
             * Options format - ``underlier:year:month:day:optionType:strikePrice``
         :detailflag values:
@@ -126,6 +362,10 @@ class ETradeMarket(object):
             * True - Call is NOT made to check whether the symbol has mini options
             * False - Call is made to check whether the symbol has mini options
             * None - Call is made to check whether the symbol has mini options (default)
+        :Note: With a ``quote_cache`` only symbols missing from the cache are
+               requested. With a ``batch_window`` calls for fewer than 25 symbols
+               share requests with concurrent calls. Calls with
+               ``require_earnings_date`` or ``skip_mini_options_check`` bypass both.
         :EtradeRef: https://apisb.etrade.com/docs/api/market/api-quote-v1.html
         """
 
@@ -151,6 +391,33 @@ class ETradeMarket(object):
                 "get_quote asked for %d requests; only first 25 returned" % len(symbols)
             )
 
+        if (
+            (self.quote_cache is not None or self.quote_batcher is not None)
+            and not require_earnings_date
+            and skip_mini_options_check is None
+        ):
+            if self.quote_cache is not None:
+                return self._get_cached_quote(
+                    symbols[:25], detail_flag, resp_format.lower()
+                )
+            return self._fetch_quote(symbols[:25], detail_flag, resp_format.lower())
+
+        return self._request_quote(
+            symbols[:25],
+            detail_flag,
+            require_earnings_date,
+            skip_mini_options_check,
+            resp_format,
+        )
+
+    def _request_quote(
+        self,
+        symbols: list[str],
+        detail_flag: str,
+        require_earnings_date: str,
+        skip_mini_options_check: str,
+        resp_format: str,
+    ) -> dict:
         args = list()
 
         if detail_flag is not None:
@@ -160,7 +427,7 @@ class ETradeMarket(object):
         if skip_mini_options_check is not None:
             args.append("skipMiniOptionsCheck=%s" % str(skip_mini_options_check))
 
-        api_url = "%s%s%s" % (self.base_url, "quote/", ",".join(symbols[:25]))
+        api_url = "%s%s%s" % (self.base_url, "quote/", ",".join(symbols))
 
         if resp_format.lower() == "json":
             api_url += ".json"
@@ -174,6 +441,154 @@ class ETradeMarket(object):
 
         return xmltodict.parse(req.text) if resp_format.lower() == "xml" else req.json()
 
+    def _batch_request(
+        self, symbols: list[str], detail_flag: str, resp_format: str
+    ) -> dict:
+        return self._request_quote(symbols, detail_flag, None, None, resp_format)
+
+    def _fetch_quote(
+        self, symbols: list[str], detail_flag: str, resp_format: str
+    ) -> dict:
+        if self.quote_batcher is not None and len(symbols) < QUOTE_LIMIT:
+            return self.quote_batcher.get(symbols, detail_flag, resp_format)
+        return self._request_quote(symbols, detail_flag, None, None, resp_format)
+
+    def _cache_quotes(
+        self, symbols: list[str], detail_flag: str, resp_format: str, resp: dict
+    ) -> tuple:
+        """Stores the quotes of ``resp`` and returns them with its messages"""
+
+        quotes, messages = match_quotes(symbols, resp)
+
+        for symbol, quote in quotes.items():
+            # A quote served for the whole TTL must be the symbol's own, not
+            # one matched by position
+            if _quote_key(quote) == _symbol_key(symbol):
+                self.quote_cache.put(symbol, detail_flag, resp_format, quote)
+            else:
+                LOGGER.debug("Not caching quote %s: product does not match", symbol)
+
+        return quotes, messages
+
+    def _get_cached_quote(
+        self, symbols: list[str], detail_flag: str, resp_format: str
+    ) -> dict:
+        quotes = {}
+        stale = []
+        missing = []
+
+        for symbol in symbols:
+            cached = self.quote_cache.lookup(symbol, detail_flag, resp_format)
+            if cached is None:
+                missing.append(symbol)
+            else:
+                quotes[symbol] = cached[0]
+                if cached[1]:
+                    stale.append((symbol, detail_flag, resp_format))
+
+        if stale:
+
+            def refresh(keys):
+                refreshed = [key[0] for key in keys]
+                resp = self._fetch_quote(refreshed, detail_flag, resp_format)
+                self._cache_quotes(refreshed, detail_flag, resp_format, resp)
+
+            self.quote_cache.refresh(stale, refresh)
+
+        messages = []
+        if missing:
+            resp = self._fetch_quote(missing, detail_flag, resp_format)
+            fetched, messages = self._cache_quotes(
+                missing, detail_flag, resp_format, resp
+            )
+            quotes.update(fetched)
+
+        return quote_response(symbols, quotes, messages, resp_format)
+
+    def get_quotes(
+        self,
+        symbols: list[str],
+        detail_flag: str = None,
+        require_earnings_date: str = None,
+        skip_mini_options_check: str = None,
+        max_workers: int = 4,
+        resp_format: str = "xml",
+    ) -> dict:
+        """:description: Get quote data on any number of symbols
+
+        Symbols are split into requests of 25 (the :class:`get_quote` limit) which
+        run concurrently on ``max_workers`` threads. Use a session from
+        :func:`pyetrade.session.create_session` with a ``rate_limiter`` to keep the
+        fan-out within the ETrade market limits.
+
+        :param symbols: Symbols in list args format, see :class:`get_quote`
+        :type symbols: list[str], required
+        :param detail_flag: Market fields returned from a quote request, defaults to None
+        :type detail_flag: str, optional
+        :param require_earnings_date: Provides Earnings date if True, defaults to None
+        :type require_earnings_date: str, optional
+        :param skip_mini_options_check: Skips mini options check if True, defaults to None
+        :type skip_mini_options_check: str, optional
+        :param max_workers: Maximum number of requests in flight, defaults to 4
+        :type max_workers: int, optional
+        :param resp_format: Desired Response format, defaults to xml
+        :type  resp_format: str, optional
+        :return: ``{"QuoteResponse": {"QuoteData": [...], "Messages": {"Message": [...]}},
+                 "Errors": [...]}`` with quotes and messages in the order of ``symbols``
+        :rtype: dict
+        :Errors values:
+            * One ``{"symbols": [...], "error": Exception}`` per failed request.
+              Quotes of the other requests are still returned.
+        """
+
+        assert isinstance(symbols, (list, tuple))
+
+        chunks = [
+            list(symbols[i : i + QUOTE_LIMIT])  # noqa: E203
+            for i in range(0, len(symbols), QUOTE_LIMIT)
+        ]
+        results = [None] * len(chunks)
+        errors = []
+
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+                futures = {
+                    pool.submit(
+                        self.get_quote,
+                        chunk,
+                        detail_flag=detail_flag,
+                        require_earnings_date=require_earnings_date,
+                        skip_mini_options_check=skip_mini_options_check,
+                        resp_format=resp_format,
+                    ): i
+                    for i, chunk in enumerate(chunks)
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        results[i] = future.result()
+                    except Exception as err:
+                        LOGGER.warning(
+                            "Quote request for %s failed: %s", chunks[i], err
+                        )
+                        errors.append((i, {"symbols": chunks[i], "error": err}))
+
+        quote_data = []
+        messages = []
+        for result in results:
+            response = (result or {}).get("QuoteResponse") or {}
+            quote_data.extend(as_list(response.get("QuoteData")))
+            messages.extend(as_list((response.get("Messages") or {}).get("Message")))
+
+        quote_response = {"QuoteData": quote_data}
+        if messages:
+            quote_response["Messages"] = {"Message": messages}
+
+        return {
+            "QuoteResponse": quote_response,
+            "Errors": [error for _, error in sorted(errors, key=lambda e: e[0])],
+        }
+
     def get_option_chains(
         self,
         underlier: str,
@@ -1,11 +1,26 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from datetime import timedelta
 from typing import Union
 
 import dateutil.parser
 import xmltodict
-from jxmlease import emit_xml
+from requests import exceptions as requests_exceptions
 from requests_oauthlib import OAuth1Session
+from urllib3.util import Retry
+
+from .cache import PreviewCache
+from .payload import emit_order_xml
+from .session import get_retry_delay
+from .session import REFUSED_STATUSES
+from .timing import mark
+from .timing import OrderTimings
+from .timing import timed
+from .timing import TimedAuth
+from .utils import as_list
+from .utils import xml_shaped
 
 LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +49,7 @@ def to_decimal_str(price: float, round_down: bool) -> str:
 
 class RequestException(Exception):
     """:description: Exception raised when request to Etrade API returns an error"""
+
     pass
 
 
@@ -95,6 +111,220 @@ class OrderException(Exception):
         return "Missing required parameters"
 
 
+# Statuses of orders that may still fill
+OPEN_STATUSES = ("OPEN", "PARTIAL", "CANCEL_REQUESTED")
+
+# Order types of multi-leg orders, given as ``orderType`` with ``legs``
+SPREAD_ORDER_TYPES = (
+    "SPREADS",
+    "BUY_WRITES",
+    "BUTTERFLY",
+    "IRON_BUTTERFLY",
+    "CONDOR",
+    "IRON_CONDOR",
+)
+
+
+def _order_instrument(params: dict, security_type: str) -> dict:
+    """Instrument element of an order or of one leg of a spread, pops ``expiryDate``"""
+
+    product = {"securityType": security_type, "symbol": params["symbol"]}
+
+    if security_type == "OPTN":
+        expiryDate = dateutil.parser.parse(
+            params.pop("expiryDate")
+        )  # dateutil can handle most date formats
+        product.update(
+            {
+                "expiryDay": expiryDate.day,
+                "expiryMonth": expiryDate.month,
+                "expiryYear": expiryDate.year,
+                "callPut": params["callPut"],
+                "strikePrice": params["strikePrice"],
+            }
+        )
+
+    return {
+        "Product": product,
+        "orderAction": params["orderAction"],
+        "quantityType": "QUANTITY",
+        "quantity": params["quantity"],
+    }
+
+
+class OpenOrderIndex(object):
+    """:description: Open orders of an account indexed by OSI symbol, underlier and expiry
+
+    Lookups are dict accesses. :class:`refresh` rebuilds the index from every
+    page of OPEN orders, or only applies the orders of the days since the last
+    refresh. Orders placed before that and filled or cancelled since stay
+    indexed until a full refresh or until passed to :class:`update`.
+
+    :param orders_api: Order API the orders are listed with, defaults to None
+    :type orders_api: ETradeOrder, optional
+    :param account_id_key: AccountIDKey of the indexed account, defaults to None
+    :type account_id_key: str, optional
+    """
+
+    def __init__(self, orders_api=None, account_id_key: str = None):
+        self.orders_api = orders_api
+        self.account_id_key = account_id_key
+        self.refreshed = None
+        self.orders = {}
+        self.by_osi = {}
+        self.by_underlier = {}
+        self.by_expiry = {}
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    @staticmethod
+    def _keys(order: dict):
+        for detail in as_list(order.get("OrderDetail")):
+            for instrument in as_list(detail.get("Instrument")):
+                product = instrument.get("Product") or {}
+                osi = (product.get("productId") or {}).get("symbol")
+                expiry = None
+                if product.get("securityType") == "OPTN":
+                    if product.get("expiryYear"):
+                        expiry = "%04d-%02d-%02d" % (
+                            int(product["expiryYear"]),
+                            int(product["expiryMonth"]),
+                            int(product["expiryDay"]),
+                        )
+                    elif osi and len(osi) == 21:
+                        expiry = "20%s-%s-%s" % (osi[6:8], osi[8:10], osi[10:12])
+                else:
+                    osi = None
+                yield osi, (product.get("symbol") or "").upper() or None, expiry
+
+    def discard(self, order_id) -> None:
+        """:description: Removes an order from the index if it is there"""
+
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return
+
+        for osi, underlier, expiry in self._keys(order):
+            for index, key in (
+                (self.by_osi, osi),
+                (self.by_underlier, underlier),
+                (self.by_expiry, expiry),
+            ):
+                if key in index:
+                    index[key].pop(order_id, None)
+                    if not index[key]:
+                        del index[key]
+
+    def update(self, orders) -> None:
+        """:description: Adds open orders and drops the ones no longer open
+
+        :param orders: ``Order`` elements, e.g. of :class:`ETradeOrder.iter_orders`
+        :type orders: iterable, required
+        """
+
+        for order in orders:
+            order_id = order.get("orderId", id(order))
+            status = (as_list(order.get("OrderDetail")) or [{}])[0].get("status")
+            self.discard(order_id)
+
+            if status is not None and status not in OPEN_STATUSES:
+                continue
+
+            self.orders[order_id] = order
+            for osi, underlier, expiry in self._keys(order):
+                for index, key in (
+                    (self.by_osi, osi),
+                    (self.by_underlier, underlier),
+                    (self.by_expiry, expiry),
+                ):
+                    if key is not None:
+                        index.setdefault(key, {})[order_id] = order
+
+    def select(self, symbols: list = None, osi_symbols: list = None) -> list:
+        """:description: orderIds of the open orders on any of the given symbols
+
+        :param symbols: Underlying (or equity) symbols, defaults to None
+        :type symbols: list[str], optional
+        :param osi_symbols: OSI option symbols, defaults to None
+        :type osi_symbols: list[str], optional
+        :return: Matching orderIds, every indexed one when no symbol is given
+        :rtype: list
+        """
+
+        if symbols is None and osi_symbols is None:
+            return list(self.orders)
+
+        selected = {}
+        for symbol in as_list(symbols):
+            selected.update(self.by_underlier.get(symbol.upper(), {}))
+        for osi in as_list(osi_symbols):
+            selected.update(self.by_osi.get(osi, {}))
+
+        return list(selected)
+
+    def refresh(self, full: bool = False) -> "OpenOrderIndex":
+        """:description: Brings the index up to date with ETrade
+
+        :param full: Rebuilds the index from every OPEN order instead of only
+                     applying orders since the last refresh, defaults to False
+        :type full: bool, optional
+        :return: The index
+        :rtype: OpenOrderIndex
+        """
+
+        now = datetime.now()
+
+        if full or self.refreshed is None:
+            self.orders.clear()
+            self.by_osi.clear()
+            self.by_underlier.clear()
+            self.by_expiry.clear()
+            self.update(self.orders_api.iter_orders(self.account_id_key, status="OPEN"))
+        else:
+            # Dates are day granular, go back a day to not miss late orders
+            self.update(
+                self.orders_api.iter_orders(
+                    self.account_id_key,
+                    from_date=self.refreshed - timedelta(days=1),
+                    to_date=now,
+                )
+            )
+
+        self.refreshed = now
+        return self
+
+    def find(self, osi: str = None, underlier: str = None, expiry: str = None) -> list:
+        """:description: Open orders matching every given key
+
+        :param osi: OSI symbol, e.g. ``PLTR--220218P00023000`` from :func:`option_symbol`
+        :type osi: str, optional
+        :param underlier: Underlying (or equity) symbol
+        :type underlier: str, optional
+        :param expiry: Option expiry as ``YYYY-MM-DD``
+        :type expiry: str, optional
+        :return: Matching ``Order`` elements
+        :rtype: list
+        """
+
+        matches = None
+        for index, key in (
+            (self.by_osi, osi),
+            (self.by_underlier, underlier.upper() if underlier else None),
+            (self.by_expiry, expiry),
+        ):
+            if key is None:
+                continue
+            found = index.get(key, {})
+            matches = (
+                dict(found)
+                if matches is None
+                else {k: v for k, v in matches.items() if k in found}
+            )
+
+        return list((matches or {}).values())
+
+
 class ETradeOrder(object):
     """:description: Object to perform Orders
 
@@ -111,6 +341,19 @@ class ETradeOrder(object):
     :type dev: bool, optional
     :param timeout: Timeout value for OAuth, defaults to 30
     :type timeout: int, optional
+    :param session: Shared session from :func:`pyetrade.session.create_session`,
+                    defaults to None (a new session is created)
+    :type session: OAuth1Session, optional
+    :param retry: Retry policy for preview, place and cancel requests, e.g. from
+                  :func:`pyetrade.session.create_retry`. Only requests that cannot
+                  create a duplicate order are retried, defaults to None (no retries)
+    :type retry: urllib3.util.Retry, optional
+    :param preview_cache: Cache of previews reused by place order requests
+                          without ``previewId``, defaults to None (no caching)
+    :type preview_cache: :class:`pyetrade.cache.PreviewCache`, optional
+    :param timings: Records the phases of every preview, place, change and
+                    cancel, defaults to None (no timing)
+    :type timings: :class:`pyetrade.timing.OrderTimings`, optional
     :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
     """
 
@@ -122,17 +365,28 @@ class ETradeOrder(object):
         resource_owner_secret: str,
         dev: bool = True,
         timeout: int = 30,
+        session: OAuth1Session = None,
+        retry: Retry = None,
+        preview_cache: PreviewCache = None,
+        timings: OrderTimings = None,
     ):
         self.dev_environment = dev
         self.base_url = f'https://{"apisb" if dev else "api"}.etrade.com/v1/accounts'
         self.timeout = timeout
-        self.session = OAuth1Session(
-            client_key,
-            client_secret,
-            resource_owner_key,
-            resource_owner_secret,
-            signature_type="AUTH_HEADER",
-        )
+        self.retry = retry
+        self.preview_cache = preview_cache
+        if session is None:
+            session = OAuth1Session(
+                client_key,
+                client_secret,
+                resource_owner_key,
+                resource_owner_secret,
+                signature_type="AUTH_HEADER",
+            )
+        self.session = session
+        self.timings = timings
+        if timings is not None and not isinstance(session.auth, TimedAuth):
+            session.auth = TimedAuth(session.auth)
 
     def list_orders(
         self,
@@ -238,6 +492,71 @@ class ETradeOrder(object):
 
         return get_request_result(req, resp_format)
 
+    def iter_orders(
+        self,
+        account_id_key: str,
+        status: str = None,
+        from_date: datetime = None,
+        to_date: datetime = None,
+        symbols: list[str] = None,
+        security_type: str = None,
+        transaction_type: str = None,
+        market_session: str = "REGULAR",
+        resp_format: str = "json",
+    ):
+        """:description: Iterates over every order of an account, page by page
+
+        Pages of 100 orders are requested as the iteration reaches them,
+        following the ``marker`` of each :class:`list_orders` response.
+
+        :param account_id_key: AccountIDKey from :class:`pyetrade.accounts.ETradeAccounts.list_accounts`
+        :type  account_id_key: str, required
+        :param status: Order status, see :class:`list_orders` (defaults to None)
+        :type  status: str, optional
+        :param from_date: The earliest date to include in the date range (defaults to None)
+        :type  from_date: datetime obj, optional
+        :param to_date: The latest date to include in the date range (defaults to None)
+        :type  to_date: datetime obj, optional
+        :param symbols: The market symbol(s) of the orders (defaults to None, Max 25 symbols)
+        :type  symbols: list[str], optional
+        :param security_type: The security type (defaults to None - Returns all types)
+        :type  security_type: str, optional
+        :param transaction_type: Type of transaction (defaults to None - Returns all types)
+        :type  transaction_type: str, optional
+        :param market_session: The market session, defaults to REGULAR
+        :type  market_session: str, optional
+        :param resp_format: Desired Response format, defaults to json
+        :type  resp_format: str, optional
+        :return: Generator of ``Order`` elements
+        :rtype: generator
+        :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
+        """
+
+        marker = None
+
+        while True:
+            orders = self.list_orders(
+                account_id_key,
+                marker=marker,
+                count=100,
+                status=status,
+                from_date=from_date,
+                to_date=to_date,
+                symbols=symbols,
+                security_type=security_type,
+                transaction_type=transaction_type,
+                market_session=market_session,
+                resp_format=resp_format,
+            )  # this call may return empty
+
+            orders_response = orders.get("OrdersResponse") or {}
+            yield from as_list(orders_response.get("Order"))
+
+            next_marker = orders_response.get("marker")
+            if not next_marker or next_marker == marker:
+                return
+            marker = next_marker
+
     def list_order_details(
         self, account_id_key: str, order_id: int, resp_format: str = "json"
     ):
@@ -287,27 +606,13 @@ class ETradeOrder(object):
         :type  strike_price: str, required
 
         :return: List of matching option orders in an account
+        :Note: Every page of OPEN orders is searched, use :class:`OpenOrderIndex`
+               for repeated lookups
         """
 
         opt_sym = option_symbol(symbol, call_put, expiry_date, strike_price)
-        orders = self.list_orders(
-            account_id_key, resp_format="json", status="OPEN"
-        )  # this call may return empty
-
-        results = []
-
-        if len(orders) > 0:
-            for o in orders["OrdersResponse"]["Order"]:
-                product = o["OrderDetail"][0]["Instrument"][0]["Product"]
-
-                if product["securityType"] == "OPTN":
-                    symbol = product["productId"][
-                        "symbol"
-                    ]  # e.g. "PLTR--220218P00023000"
 
-                    if symbol == opt_sym:
-                        results.append(o)
-        return results
+        return OpenOrderIndex(self, account_id_key).refresh().find(osi=opt_sym)
 
     @staticmethod
     def check_order(**kwargs):
@@ -318,18 +623,32 @@ class ETradeOrder(object):
 
         mandatory = [
             "accountIdKey",
-            "symbol",
-            "orderAction",
             "clientOrderId",
             "priceType",
-            "quantity",
             "orderTerm",
             "marketSession",
         ]
+        leg_mandatory = ["symbol", "orderAction", "quantity"]
+        legs = kwargs.get("legs")
+        if legs is None:
+            mandatory += leg_mandatory
 
         if not all(param in kwargs for param in mandatory):
             raise OrderException
 
+        if legs is not None:
+            if (
+                len(legs) < 2
+                or kwargs.get("orderType", "SPREADS") not in SPREAD_ORDER_TYPES
+            ):
+                raise OrderException
+            for leg in legs:
+                required = leg_mandatory
+                if leg.get("securityType", "OPTN") == "OPTN":
+                    required = required + ["callPut", "expiryDate", "strikePrice"]
+                if not all(param in leg for param in required):
+                    raise OrderException
+
         if kwargs["priceType"] == "STOP" and "stopPrice" not in kwargs:
             raise OrderException
         if kwargs["priceType"] == "LIMIT" and "limitPrice" not in kwargs:
@@ -340,6 +659,11 @@ class ETradeOrder(object):
             and "stopPrice" not in kwargs
         ):
             raise OrderException
+        if (
+            kwargs["priceType"] in ("NET_DEBIT", "NET_CREDIT")
+            and "limitPrice" not in kwargs
+        ):
+            raise OrderException
 
     @staticmethod
     def build_order_payload(order_type: str, **kwargs) -> dict:
@@ -352,34 +676,27 @@ class ETradeOrder(object):
         :orderAction: for OPTN: BUY_OPEN, SELL_CLOSE
         :callPut: CALL or PUT
         :expiryDate: string, e.g. "2022-02-18"
+        :legs: list of dicts with the symbol, orderAction, quantity, and for
+               options callPut, expiryDate and strikePrice of each leg.
+               Legs are OPTN unless their securityType is EQ.
+        :orderType: with legs, one of :data:`SPREAD_ORDER_TYPES`, defaults to SPREADS
         :return: Builds Order Payload
         :rtype: ``xml`` or ``json`` based on ``resp_format``
         :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
 
         """
-        securityType = kwargs.get("securityType", "EQ")  # EQ by default
-        product = {"securityType": securityType, "symbol": kwargs["symbol"]}
-
-        if securityType == "OPTN":
-            expiryDate = dateutil.parser.parse(
-                kwargs.pop("expiryDate")
-            )  # dateutil can handle most date formats
-            product.update(
-                {
-                    "expiryDay": expiryDate.day,
-                    "expiryMonth": expiryDate.month,
-                    "expiryYear": expiryDate.year,
-                    "callPut": kwargs["callPut"],
-                    "strikePrice": kwargs["strikePrice"],
-                }
-            )
-
-        instrument = {
-            "Product": product,
-            "orderAction": kwargs["orderAction"],
-            "quantityType": "QUANTITY",
-            "quantity": kwargs["quantity"],
-        }
+        legs = kwargs.pop("legs", None)
+        if legs is None:
+            securityType = kwargs.get("securityType", "EQ")  # EQ by default
+            orderType = securityType
+            instrument = _order_instrument(kwargs, securityType)
+        else:
+            # One Instrument per leg, copied to leave the caller's legs as given
+            orderType = kwargs.pop("orderType", "SPREADS")
+            instrument = [
+                _order_instrument(dict(leg), leg.get("securityType", "OPTN"))
+                for leg in legs
+            ]
 
         order = kwargs
         order["Instrument"] = instrument
@@ -393,14 +710,14 @@ class ETradeOrder(object):
 
         if "stopPrice" in kwargs:
             stopPrice = float(kwargs["stopPrice"])
-            round_down = "SELL" == kwargs["orderAction"][:4]
+            round_down = "SELL" == kwargs.get("orderAction", "")[:4]
             spstr = to_decimal_str(stopPrice, round_down)
 
             order["stopPrice"] = spstr
 
         payload = {
             order_type: {
-                "orderType": securityType,
+                "orderType": orderType,
                 "clientOrderId": kwargs["clientOrderId"],
                 "Order": order,
             }
@@ -411,8 +728,48 @@ class ETradeOrder(object):
 
         return payload
 
+    @staticmethod
+    def _preview_key(**kwargs) -> str:
+        """Key of an order in ``preview_cache``, the same for its preview and place parameters"""
+
+        order_id = kwargs.pop("orderId", None)
+        kwargs.pop("previewId", None)
+        payload = ETradeOrder.build_order_payload("PreviewOrderRequest", **kwargs)
+
+        return PreviewCache.key({"orderId": order_id, "payload": payload})
+
+    def _cache_preview(self, preview: dict, **kwargs) -> dict:
+        if self.preview_cache is not None and "PreviewIds" in (
+            preview.get("PreviewOrderResponse") or {}
+        ):
+            self.preview_cache.put(self._preview_key(**kwargs), preview)
+
+        return preview
+
+    def _cached_preview(self, **kwargs) -> dict:
+        if self.preview_cache is None:
+            return None
+
+        preview = self.preview_cache.lookup(self._preview_key(**kwargs))
+        if preview is not None:
+            LOGGER.debug("Reusing cached preview of %s", kwargs.get("clientOrderId"))
+
+        return preview
+
+    def _forget_preview(self, result: dict, **kwargs) -> dict:
+        # A previewId places one order only
+        if self.preview_cache is not None:
+            self.preview_cache.discard(self._preview_key(**kwargs))
+
+        return result
+
     def perform_request(
-        self, method, api_url: str, payload: Union[dict, str], resp_format: str = "xml"
+        self,
+        method,
+        api_url: str,
+        payload: Union[dict, str],
+        resp_format: str = "xml",
+        retry_safe: bool = False,
     ) -> dict:
         """:description: POST or PUT request with json or xml used by preview, place and cancel
 
@@ -424,6 +781,13 @@ class ETradeOrder(object):
         :type  api_url: str, required
         :param payload: Payload
         :type  payload: json/dict or str xml, required
+        :param retry_safe: Request can be sent again without side effects (previews
+                           and cancels), so transient failures are retried with
+                           ``self.retry``. Other requests are only retried when
+                           refused with :data:`pyetrade.session.REFUSED_STATUSES`,
+                           since a lost response may belong to a placed order,
+                           defaults to False
+        :type  retry_safe: bool, optional
         :return: Return request
         :rtype: xml or json based on ``resp_format``
         :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
@@ -434,15 +798,51 @@ class ETradeOrder(object):
         LOGGER.debug("payload: %s", payload)
 
         if resp_format == "json":
-            req = method(api_url, json=payload, timeout=self.timeout)
+            kwargs = {"json": payload, "timeout": self.timeout}
         else:
             headers = {"Content-Type": "application/xml"}
-            payload = emit_xml(payload)
+            payload = emit_order_xml(payload)
             LOGGER.debug("xml payload: %s", payload)
-            req = method(api_url, data=payload, headers=headers, timeout=self.timeout)
-
-        return get_request_result(req, resp_format)
-
+            kwargs = {"data": payload, "headers": headers, "timeout": self.timeout}
+        mark("serialize")
+
+        retry = self.retry
+        max_retries = (retry.total or 0) if retry is not None else 0
+        if retry is not None:
+            statuses = set(retry.status_forcelist or ())
+            if not retry_safe:
+                statuses &= set(REFUSED_STATUSES)
+        attempt = 0
+
+        while True:
+            try:
+                req = method(api_url, **kwargs)
+                mark("network")
+            except (
+                requests_exceptions.ConnectionError,
+                requests_exceptions.Timeout,
+            ) as err:
+                if not retry_safe or attempt >= max_retries:
+                    raise
+                delay = get_retry_delay(retry, attempt)
+                LOGGER.warning(
+                    "%s failed with %r, retrying in %.2fs", api_url, err, delay
+                )
+            else:
+                if attempt >= max_retries or req.status_code not in statuses:
+                    result = get_request_result(req, resp_format)
+                    mark("parse")
+                    return result
+                delay = get_retry_delay(retry, attempt, req)
+                LOGGER.warning(
+                    "%s returned %s, retrying in %.2fs", api_url, req.status_code, delay
+                )
+
+            attempt += 1
+            time.sleep(delay)
+            mark("network")
+
+    @timed("preview")
     def preview_equity_order(self, **kwargs) -> dict:
         """API is used to submit an order request for preview before placing it
 
@@ -457,6 +857,22 @@ class ETradeOrder(object):
             * SELL
             * BUY_TO_COVER
             * SELL_SHORT
+        :param legs: Legs of a spread, sent as one order with one preview.
+                     Each leg is a dict with its own ``symbol``, ``orderAction``
+                     (e.g. BUY_OPEN, SELL_OPEN) and ``quantity``, plus
+                     ``callPut``, ``expiryDate`` and ``strikePrice`` for options.
+                     Legs are options unless their ``securityType`` is EQ.
+                     Replaces ``symbol``, ``orderAction`` and ``quantity``.
+        :type  legs: list[dict], optional
+        :param orderType: Type of a spread given with ``legs``, defaults to SPREADS
+        :type  orderType: str, optional
+        :orderType values:
+            * SPREADS
+            * BUY_WRITES
+            * BUTTERFLY
+            * IRON_BUTTERFLY
+            * CONDOR
+            * IRON_CONDOR
         :param previewId: Required only if order was previewed.
                           Numeric preview ID from preview.
                           **Note** - Other parameters much match that of preview
@@ -475,6 +891,9 @@ class ETradeOrder(object):
             * STOP - Requires `stopPrice`
             * STOP_LIMIT - Requires `limitPrice`
             * MARKET_ON_CLOSE
+            * NET_DEBIT - Requires `limitPrice`, spreads only
+            * NET_CREDIT - Requires `limitPrice`, spreads only
+            * NET_EVEN - spreads only
         :param limitPrice: Highest to buy or lowest to sell.
                            Required if `priceType` is `STOP` or `STOP_LIMIT`
         :type  limitPrice: double, conditional
@@ -539,23 +958,38 @@ class ETradeOrder(object):
         :type  symbolDesc: str
         :param symbol: The market symbol for the underlier
         :type  symbol: str
+        :param resp_format: Format of the request and response, json responses are
+                            reshaped like xml ones (see :func:`pyetrade.utils.xml_shaped`),
+                            defaults to xml
+        :type  resp_format: str, optional
         :return: Confirmation of the Preview Equity Order
         :rtype: ``xml`` or ``json`` based on ``resp_format``
         :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
 
         """
         LOGGER.debug(kwargs)
+        resp_format = kwargs.pop("resp_format", "xml")
 
         # Test required values
         self.check_order(**kwargs)
+        mark("check")
 
         api_url = f'{self.base_url}/{kwargs["accountIdKey"]}/orders/preview'
+        if resp_format == "json":
+            api_url += ".json"
 
         # payload creation
         payload = self.build_order_payload("PreviewOrderRequest", **kwargs)
+        mark("build")
 
-        return self.perform_request(self.session.post, api_url, payload, "xml")
+        preview = self.perform_request(
+            self.session.post, api_url, payload, resp_format, retry_safe=True
+        )
+        if resp_format == "json":
+            preview = xml_shaped(preview)
+        return self._cache_preview(preview, **kwargs)
 
+    @timed("change_preview")
     def change_preview_equity_order(
         self, account_id_key: str, order_id: str, **kwargs
     ) -> dict:
@@ -564,6 +998,10 @@ class ETradeOrder(object):
         :type  order_id: str, required
         :param account_id_key: account_id_key retrieved from :class:`list_accounts`
         :type  account_id_key: str, required
+        :param resp_format: Format of the request and response, json responses are
+                            reshaped like xml ones (see :func:`pyetrade.utils.xml_shaped`),
+                            defaults to xml
+        :type  resp_format: str, optional
         :return: Previews Changed order with orderId for account with account_id_key
         :rtype: dict/json
         :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
@@ -571,47 +1009,66 @@ class ETradeOrder(object):
         """
 
         LOGGER.debug(kwargs)
+        resp_format = kwargs.pop("resp_format", "xml")
 
         # Test required values
         self.check_order(**kwargs)
+        mark("check")
 
         api_url = f"{self.base_url}/{account_id_key}/orders/{order_id}/change/preview"
+        if resp_format == "json":
+            api_url += ".json"
 
         # payload creation
         payload = self.build_order_payload("PreviewOrderRequest", **kwargs)
+        mark("build")
 
-        return self.perform_request(self.session.put, api_url, payload, "xml")
+        preview = self.perform_request(
+            self.session.put, api_url, payload, resp_format, retry_safe=True
+        )
+        if resp_format == "json":
+            preview = xml_shaped(preview)
+        return self._cache_preview(preview, **{**kwargs, "orderId": order_id})
 
     def place_option_order(self, **kwargs) -> dict:
-        """:description: Places Option Order, only single leg CALL or PUT is supported for now
+        """:description: Places Option Order, a single CALL or PUT or, with ``legs``,
+        a whole spread in one preview and one place request
         :return: Returns confirmation of the equity order
         """
         kwargs["securityType"] = "OPTN"
 
         return self.place_equity_order(**kwargs)
 
+    @timed("place")
     def place_equity_order(self, **kwargs) -> dict:
         """:description: Places Equity Order
 
-        :param kwargs: Parameters for api, refer :class:`preview_equity_order`
+        :param kwargs: Parameters for api, refer :class:`preview_equity_order`,
+                       including ``resp_format``
         :type  kwargs: ``**kwargs``, required
         :return: Returns confirmation of the equity order
-        :rtype: xml or json based on ``resp_format``
+        :rtype: dict parsed from xml or json based on ``resp_format``
         :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
         """
 
         LOGGER.debug(kwargs)
+        resp_format = kwargs.pop("resp_format", "xml")
 
         # Test required values
         self.check_order(**kwargs)
+        mark("check")
+
+        preview = None if "previewId" in kwargs else self._cached_preview(**kwargs)
 
-        if "previewId" not in kwargs:
+        if "previewId" not in kwargs and preview is None:
             LOGGER.debug(
                 "No previewId given, previewing before placing order "
                 "because Etrade requires all orders to have a previewId"
             )
 
-            preview = self.preview_equity_order(**kwargs)
+            preview = self.preview_equity_order(resp_format=resp_format, **kwargs)
+
+        if preview is not None:
             kwargs["previewId"] = preview["PreviewOrderResponse"]["PreviewIds"][
                 "previewId"
             ]
@@ -619,46 +1076,130 @@ class ETradeOrder(object):
             LOGGER.debug(
                 "Got a successful preview with previewId: %s", kwargs["previewId"]
             )
+            mark("preview")
 
         api_url = f'{self.base_url}/{kwargs["accountIdKey"]}/orders/place'
+        if resp_format == "json":
+            api_url += ".json"
 
         # payload creation
         payload = self.build_order_payload("PlaceOrderRequest", **kwargs)
+        mark("build")
 
-        return self.perform_request(self.session.post, api_url, payload, "xml")
+        # Not retry_safe: if the response of a placed order is lost, a resend
+        # is rejected as a duplicate clientOrderId and the order looks failed
+        result = self.perform_request(self.session.post, api_url, payload, resp_format)
+        if resp_format == "json":
+            result = xml_shaped(result)
+        return self._forget_preview(result, **kwargs)
+
+    def place_orders(self, orders: list, max_workers: int = 4) -> list:
+        """:description: Previews and places a basket of orders concurrently
+
+        Every order is previewed on one of ``max_workers`` threads and placed
+        as soon as its previewId arrives, so a basket takes about
+        ``2 * len(orders) / max_workers`` round trips instead of
+        ``2 * len(orders)``. Use a session from
+        :func:`pyetrade.session.create_session` with a ``rate_limiter`` to stay
+        within the ETrade order limits, which are shared by previews and places.
+        A failing order does not stop the others.
+
+        :param orders: Parameters of each order, refer :class:`place_equity_order`.
+                       Set ``securityType`` to ``OPTN`` for option orders,
+                       or give ``legs`` for spreads.
+        :type  orders: list[dict], required
+        :param max_workers: Maximum number of orders in flight, defaults to 4
+        :type  max_workers: int, optional
+        :return: One result per order, in the order of ``orders``
+        :rtype: list[dict]
+        :result values:
+            * order - The order parameters as given
+            * preview - :class:`preview_equity_order` response or None
+            * place - Place order response or None
+            * error - Exception that stopped the order or None
+            * timing - ``{"preview", "place", "total"}`` seconds
+        :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
+        """
+
+        def submit(kwargs):
+            result = {
+                "order": kwargs,
+                "preview": None,
+                "place": None,
+                "error": None,
+                "timing": {},
+            }
+            started = time.perf_counter()
+            try:
+                self.check_order(**kwargs)
+                kwargs = dict(kwargs)
+
+                if "previewId" not in kwargs:
+                    start = time.perf_counter()
+                    result["preview"] = self.preview_equity_order(**kwargs)
+                    result["timing"]["preview"] = time.perf_counter() - start
+                    kwargs["previewId"] = result["preview"]["PreviewOrderResponse"][
+                        "PreviewIds"
+                    ]["previewId"]
+
+                start = time.perf_counter()
+                result["place"] = self.place_equity_order(**kwargs)
+                result["timing"]["place"] = time.perf_counter() - start
+            except Exception as err:
+                LOGGER.warning(
+                    "Basket order %s failed: %s", kwargs.get("clientOrderId"), err
+                )
+                result["error"] = err
+
+            result["timing"]["total"] = time.perf_counter() - started
+            return result
+
+        if not orders:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(orders))) as pool:
+            return list(pool.map(submit, orders))
 
     def place_changed_option_order(self, **kwargs) -> dict:
-        """:description: Places Option Order, only single leg CALL or PUT is supported for now
+        """:description: Places changes to an Option Order, single leg or spread,
+        refer :class:`place_option_order`
         :return: Returns confirmation of the equity order
         """
         kwargs["securityType"] = "OPTN"
 
         return self.place_changed_equity_order(**kwargs)
 
+    @timed("place_changed")
     def place_changed_equity_order(self, **kwargs) -> dict:
         """:description: Places changes to equity orders
          NOTE: the ETrade server will actually cancel the old orderId, and create a new orderId
 
-        :param kwargs: Parameters for api, refer :class:`change_preview_equity_order`
+        :param kwargs: Parameters for api, refer :class:`change_preview_equity_order`,
+                       including ``resp_format``
         :type  kwargs: ``**kwargs``, required
         :return: Returns confirmation similar to :class:`preview_equity_order`
-        :rtype: xml or json based on ``resp_format``
+        :rtype: dict parsed from xml or json based on ``resp_format``
         :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
 
         """
 
         LOGGER.debug(kwargs)
+        resp_format = kwargs.pop("resp_format", "xml")
 
         # Test required values
         self.check_order(**kwargs)
+        mark("check")
+
+        preview = None if "previewId" in kwargs else self._cached_preview(**kwargs)
 
-        if "previewId" not in kwargs:
+        if "previewId" not in kwargs and preview is None:
             LOGGER.debug(
                 "No previewId given, previewing before placing order "
                 "because of an Etrade bug as of 1/1/2019"
             )
-            preview = self.preview_equity_order(**kwargs)
+            preview = self.preview_equity_order(resp_format=resp_format, **kwargs)
 
+        if preview is not None:
             if "Error" in preview:
                 LOGGER.error(preview)
                 raise Exception("Please check your order!")
@@ -669,14 +1210,24 @@ class ETradeOrder(object):
             LOGGER.debug(
                 "Got a successful preview with previewId: %s", kwargs["previewId"]
             )
+            mark("preview")
 
         api_url = f'{self.base_url}/{kwargs["accountIdKey"]}/orders/{kwargs["orderId"]}/change/place'
+        if resp_format == "json":
+            api_url += ".json"
 
         # payload creation
         payload = self.build_order_payload("PlaceOrderRequest", **kwargs)
+        mark("build")
 
-        return self.perform_request(self.session.put, api_url, payload, "xml")
+        # Not retry_safe: if the response of a placed order is lost, a resend
+        # is rejected as a duplicate clientOrderId and the order looks failed
+        result = self.perform_request(self.session.put, api_url, payload, resp_format)
+        if resp_format == "json":
+            result = xml_shaped(result)
+        return self._forget_preview(result, **kwargs)
 
+    @timed("cancel")
     def cancel_order(
         self, account_id_key: str, order_num: int, resp_format: str = "xml"
     ) -> dict:
@@ -687,14 +1238,110 @@ class ETradeOrder(object):
         :type  account_id_key: str, required
         :param order_num: Numeric id for this order listed in :class:`list_orders`
         :type  order_num: int, required
-        :param resp_format: Desired Response format, defaults to xml
-        :type  resp_format: str, required
+        :param resp_format: Format of the request and response, json responses are
+                            reshaped like xml ones (see :func:`pyetrade.utils.xml_shaped`),
+                            defaults to xml
+        :type  resp_format: str, optional
         :return: Confirmation of cancellation
-        :rtype: ``dict/json``
+        :rtype: ``xml`` or ``json`` based on ``resp_format``
         :EtradeRef: https://apisb.etrade.com/docs/api/order/api-order-v1.html
         """
 
         api_url = f"{self.base_url}/{account_id_key}/orders/cancel"
+        if resp_format == "json":
+            api_url += ".json"
         payload = {"CancelOrderRequest": {"orderId": order_num}}
+        mark("build")
 
-        return self.perform_request(self.session.put, api_url, payload, resp_format)
+        # Cancelling an order twice leaves it cancelled
+        result = self.perform_request(
+            self.session.put, api_url, payload, resp_format, retry_safe=True
+        )
+        if resp_format == "json":
+            result = xml_shaped(result)
+        return result
+
+    def cancel_orders(
+        self,
+        account_id_key: str,
+        order_ids: list = None,
+        symbols: list = None,
+        osi_symbols: list = None,
+        max_workers: int = 8,
+        resp_format: str = "xml",
+    ) -> dict:
+        """:description: Cancels many orders of an account concurrently
+
+        Without ``order_ids`` every page of OPEN orders is listed and the
+        orders on ``symbols`` or ``osi_symbols`` are cancelled, or all of them
+        when neither is given. Cancels run on ``max_workers`` threads; use a
+        session from :func:`pyetrade.session.create_session` with a
+        ``rate_limiter`` to stay within the ETrade order limits.
+
+        :param account_id_key: AccountIDkey retrieved from
+                           :class:`pyetrade.accounts.ETradeAccounts.list_accounts`
+        :type  account_id_key: str, required
+        :param order_ids: Order numbers to cancel, defaults to None (select open orders)
+        :type  order_ids: list[int], optional
+        :param symbols: Cancel the open orders on these underlying (or equity)
+                        symbols, defaults to None
+        :type  symbols: list[str], optional
+        :param osi_symbols: Cancel the open orders on these OSI option symbols,
+                            e.g. from :func:`option_symbol`, defaults to None
+        :type  osi_symbols: list[str], optional
+        :param max_workers: Maximum number of cancels in flight, defaults to 8
+        :type  max_workers: int, optional
+        :param resp_format: Desired Response format, defaults to xml
+        :type  resp_format: str, optional
+        :return: ``{"orders": {orderId: result}, "cancelled", "failed", "elapsed"}``,
+                 ``elapsed`` the seconds from the call until the last cancel returned
+        :rtype: dict
+        :result values:
+            * response - :class:`cancel_order` response or None
+            * error - Exception of the failed cancel or None
+            * elapsed - Seconds the cancel took
+        """
+
+        started = time.perf_counter()
+
+        if order_ids is None:
+            order_ids = (
+                OpenOrderIndex(self, account_id_key)
+                .refresh()
+                .select(symbols=symbols, osi_symbols=osi_symbols)
+            )
+        order_ids = list(dict.fromkeys(order_ids))
+
+        def cancel(order_id):
+            start = time.perf_counter()
+            try:
+                response = self.cancel_order(
+                    account_id_key, order_id, resp_format=resp_format
+                )
+                return response, None, time.perf_counter() - start
+            except Exception as err:
+                LOGGER.warning("Cancel of order %s failed: %s", order_id, err)
+                return None, err, time.perf_counter() - start
+
+        results = {}
+        if order_ids:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(order_ids))
+            ) as pool:
+                for order_id, (response, error, elapsed) in zip(
+                    order_ids, pool.map(cancel, order_ids)
+                ):
+                    results[order_id] = {
+                        "response": response,
+                        "error": error,
+                        "elapsed": elapsed,
+                    }
+
+        failed = sum(result["error"] is not None for result in results.values())
+
+        return {
+            "orders": results,
+            "cancelled": len(results) - failed,
+            "failed": failed,
+            "elapsed": time.perf_counter() - started,
+        }
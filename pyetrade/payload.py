@@ -0,0 +1,116 @@
+"""Payload - Fast XML serialization of order request payloads
+
+    :func:`emit_order_xml` turns the payloads of
+    :class:`pyetrade.order.ETradeOrder.build_order_payload` and of order
+    cancellation into the exact string :func:`jxmlease.emit_xml` produces,
+    in a fraction of the time. Opening and closing tags are compiled once per
+    tag and depth and cancellations use a fixed template, so a call only
+    escapes and joins the field values. Payloads holding anything else than
+    dicts, lists and plain scalars fall back to :func:`jxmlease.emit_xml`.
+
+"""
+import logging
+from decimal import Decimal
+from functools import lru_cache
+
+from jxmlease import emit_xml
+
+LOGGER = logging.getLogger(__name__)
+
+HEADER = '<?xml version="1.0" encoding="utf-8"?>'
+INDENT = "    "
+
+CANCEL_TEMPLATE = (
+    HEADER
+    + "\n<CancelOrderRequest>\n"
+    + INDENT
+    + "<orderId>%s</orderId>\n</CancelOrderRequest>"
+)
+
+SCALARS = frozenset((str, int, float, bool, Decimal))
+
+
+class _Unsupported(Exception):
+    """Raised for values :func:`emit_xml` renders differently than ``str``"""
+
+
+@lru_cache(maxsize=1024)
+def _tags(tag: str, depth: int) -> tuple:
+    """Compiled ``(open, close, empty)`` strings of ``tag`` at ``depth``"""
+
+    indent = "\n" + INDENT * depth
+    return (
+        f"{indent}<{tag}>",
+        f"{indent}</{tag}>",
+        f"{indent}<{tag}></{tag}>",
+    )
+
+
+def _escape(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _emit(tag: str, value, depth: int, out: list) -> None:
+    kind = type(value)
+
+    if kind in SCALARS:
+        opening, _, _ = _tags(tag, depth)
+        out.append(f"{opening}{_escape(str(value))}</{tag}>")
+    elif kind is dict:
+        opening, closing, empty = _tags(tag, depth)
+        if not value:
+            out.append(empty)
+            return
+        out.append(opening)
+        for child, child_value in value.items():
+            if type(child) is not str:
+                raise _Unsupported(child)
+            _emit(child, child_value, depth + 1, out)
+        out.append(closing)
+    elif kind is list:
+        for item in value:
+            _emit(tag, item, depth, out)
+    elif value is None:
+        out.append(_tags(tag, depth)[2])
+    else:
+        raise _Unsupported(kind)
+
+
+def emit_order_xml(payload: dict) -> str:
+    """:description: Serializes an order request payload like :func:`jxmlease.emit_xml`
+
+    :param payload: ``{"PreviewOrderRequest" | "PlaceOrderRequest" | "CancelOrderRequest": {...}}``
+    :type payload: dict, required
+    :return: XML document, identical to ``emit_xml(payload)``
+    :rtype: str
+    """
+
+    if type(payload) is not dict or len(payload) != 1:
+        return emit_xml(payload)
+
+    ((root, value),) = payload.items()
+    if type(value) is list:
+        # Repeated roots are emitted without the XML declaration
+        return emit_xml(payload)
+
+    if root == "CancelOrderRequest" and type(value) is dict and len(value) == 1:
+        order_id = value.get("orderId")
+        if type(order_id) in SCALARS:
+            return CANCEL_TEMPLATE % _escape(str(order_id))
+
+    out = [HEADER]
+    try:
+        if type(root) is not str:
+            raise _Unsupported(root)
+        _emit(root, value, 0, out)
+    except _Unsupported as err:
+        LOGGER.debug("Falling back to emit_xml for %r", err)
+        return emit_xml(payload)
+
+    return "".join(out)
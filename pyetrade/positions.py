@@ -0,0 +1,154 @@
+"""Positions - Columnar table of positions across accounts
+
+    :class:`PositionTable` flattens the ``Position`` elements of
+    :class:`pyetrade.accounts.ETradeAccounts.get_account_portfolio` responses
+    of many accounts into one column per field. Numeric columns are
+    :class:`array.array` of doubles, so totals over tens of thousands of
+    positions take a few milliseconds without any dependency outside the
+    standard library.
+
+"""
+import logging
+from array import array
+
+from .utils import as_list
+
+LOGGER = logging.getLogger(__name__)
+
+STRING_COLUMNS = ("account_id_key", "symbol", "osi_key", "security_type")
+NUMBER_COLUMNS = ("quantity", "cost_basis", "market_value")
+
+
+def _number(value) -> float:
+    # XML responses hold strings, missing fields count as 0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PositionTable(object):
+    """:description: Positions of many accounts stored column by column
+
+    Columns: ``account_id_key``, ``symbol`` (underlier for options), ``osi_key``
+    (options only, else empty), ``security_type``, ``quantity``, ``cost_basis``
+    (``totalCost``) and ``market_value``.
+    """
+
+    def __init__(self):
+        for column in STRING_COLUMNS:
+            setattr(self, column, [])
+        for column in NUMBER_COLUMNS:
+            setattr(self, column, array("d"))
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+    @classmethod
+    def from_portfolios(cls, portfolios: dict) -> "PositionTable":
+        """:description: Builds a table out of portfolio responses
+
+        :param portfolios: ``{account_id_key: get_account_portfolio response}``,
+                           xml or json, all pages merged
+        :type portfolios: dict, required
+        :return: Table of every position
+        :rtype: PositionTable
+        """
+
+        table = cls()
+        for account_id_key, portfolio in portfolios.items():
+            table.add_portfolio(account_id_key, portfolio)
+        return table
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "PositionTable":
+        """:description: Builds a table out of
+        :class:`pyetrade.accounts.ETradeAccounts.get_snapshot`, skipping accounts
+        whose portfolio request failed"""
+
+        return cls.from_portfolios(
+            {
+                key: account["portfolio"]
+                for key, account in snapshot["accounts"].items()
+                if account.get("portfolio")
+            }
+        )
+
+    def add_portfolio(self, account_id_key: str, portfolio: dict) -> None:
+        """:description: Appends the positions of one portfolio response"""
+
+        response = (portfolio or {}).get("PortfolioResponse") or {}
+        for account_portfolio in as_list(response.get("AccountPortfolio")):
+            for position in as_list(account_portfolio.get("Position")):
+                product = position.get("Product") or {}
+                self.account_id_key.append(account_id_key)
+                self.symbol.append(product.get("symbol", ""))
+                self.osi_key.append(position.get("osiKey") or "")
+                self.security_type.append(product.get("securityType", ""))
+                self.quantity.append(_number(position.get("quantity")))
+                self.cost_basis.append(_number(position.get("totalCost")))
+                self.market_value.append(_number(position.get("marketValue")))
+
+    def rows(self):
+        """:description: Iterates over the positions as dicts"""
+
+        columns = STRING_COLUMNS + NUMBER_COLUMNS
+        for values in zip(*[getattr(self, column) for column in columns]):
+            yield dict(zip(columns, values))
+
+    def totals(self, by: str = "symbol") -> dict:
+        """:description: Sums the positions of every ``by`` value
+
+        :param by: Column to group by, one of ``symbol``, ``osi_key``,
+                   ``account_id_key`` or ``security_type``, defaults to ``symbol``
+        :type by: str, optional
+        :return: ``{value: {"quantity", "cost_basis", "market_value", "pnl",
+                 "pnl_pct", "positions"}}``, ``pnl_pct`` is None without cost basis
+        :rtype: dict
+        """
+
+        if by not in STRING_COLUMNS:
+            raise ValueError(f"Cannot group by {by}, use one of {STRING_COLUMNS}")
+
+        sums = {}
+        for key, quantity, cost_basis, market_value in zip(
+            getattr(self, by), self.quantity, self.cost_basis, self.market_value
+        ):
+            total = sums.get(key)
+            if total is None:
+                sums[key] = [quantity, cost_basis, market_value, 1]
+            else:
+                total[0] += quantity
+                total[1] += cost_basis
+                total[2] += market_value
+                total[3] += 1
+
+        return {
+            key: {
+                "quantity": quantity,
+                "cost_basis": cost_basis,
+                "market_value": market_value,
+                "pnl": market_value - cost_basis,
+                "pnl_pct": (market_value - cost_basis) / abs(cost_basis) * 100
+                if cost_basis
+                else None,
+                "positions": positions,
+            }
+            for key, (quantity, cost_basis, market_value, positions) in sums.items()
+        }
+
+    def total(self) -> dict:
+        """:description: Sums of every position
+
+        :return: ``{"cost_basis", "market_value", "pnl"}``
+        :rtype: dict
+        """
+
+        cost_basis = sum(self.cost_basis)
+        market_value = sum(self.market_value)
+
+        return {
+            "cost_basis": cost_basis,
+            "market_value": market_value,
+            "pnl": market_value - cost_basis,
+        }
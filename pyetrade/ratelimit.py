@@ -0,0 +1,284 @@
+"""RateLimit - Client side throttling of ETrade API calls
+
+    ETrade throttles the market, accounts and order APIs separately for each
+    consumer key. :class:`RateLimiter` keeps one token bucket per
+    (module, consumer key) pair and can be shared by every API object through
+    :func:`pyetrade.session.create_session` and
+    :class:`pyetrade.aio.AsyncOAuth1Session`. It is safe to use from many
+    threads and asyncio tasks at once.
+
+"""
+import asyncio
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from .timing import mark
+
+LOGGER = logging.getLogger(__name__)
+
+# Requests per second and burst size per module. Bursts of 1 spread calls
+# evenly so no one second window ever sees more than the allowed rate.
+DEFAULT_LIMITS = {
+    "market": (4.0, 1),
+    "accounts": (2.0, 1),
+    "order": (2.0, 1),
+    "alerts": (2.0, 1),
+    "authorization": (2.0, 1),
+}
+
+
+def module_for_url(url: str) -> str:
+    """:description: Maps an ETrade API URL to the module whose limit applies
+
+    :param url: API URL
+    :type url: str, required
+    :return: One of ``market``, ``order``, ``accounts``, ``alerts``,
+             ``authorization`` or ``default``
+    :rtype: str
+    """
+
+    path = urlparse(url).path
+
+    if path.startswith("/v1/market"):
+        return "market"
+    if path.startswith("/v1/accounts"):
+        return "order" if "/orders" in path else "accounts"
+    if path.startswith("/v1/user/alerts"):
+        return "alerts"
+    if path.startswith("/oauth"):
+        return "authorization"
+    return "default"
+
+
+class TokenBucket(object):
+    """:description: Token bucket handing out reservations
+
+    A caller takes a token straight away and is told how long to wait for
+    it, so the lock is never held while sleeping.
+
+    :param rate: Tokens added per second
+    :type rate: float, required
+    :param capacity: Maximum number of tokens (burst size), defaults to 1
+    :type capacity: int, optional
+    :param clock: Monotonic clock, defaults to :func:`time.monotonic`
+    :type clock: callable, optional
+    """
+
+    def __init__(self, rate: float, capacity: int = 1, clock=time.monotonic):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be > 0 and capacity >= 1")
+
+        self.rate = float(rate)
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """:description: Takes one token
+
+        :return: Seconds to wait before the request may be sent
+        :rtype: float
+        """
+
+        with self.lock:
+            self._refill(self.clock())
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+
+        return wait
+
+    def wait_time(self) -> float:
+        """:description: Seconds the next request would wait, without taking a token"""
+
+        with self.lock:
+            self._refill(self.clock())
+            return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+            }
+
+
+class RateLimiter(object):
+    """:description: Shared rate limiter with one bucket per module and consumer key
+
+    :param limits: ``{module: (requests_per_second, burst)}`` overriding
+                   :data:`DEFAULT_LIMITS`, defaults to None
+    :type limits: dict, optional
+    :param clock: Monotonic clock, defaults to :func:`time.monotonic`
+    :type clock: callable, optional
+    """
+
+    def __init__(self, limits: dict = None, clock=time.monotonic):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self.clock = clock
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, module: str, consumer_key: str) -> TokenBucket:
+        """:description: Returns the bucket of ``module`` for ``consumer_key``
+
+        Modules without a configured limit fall back to the ``accounts`` limit.
+        """
+
+        key = (module, consumer_key)
+
+        with self.lock:
+            if key not in self.buckets:
+                rate, burst = self.limits.get(module, self.limits["accounts"])
+                self.buckets[key] = TokenBucket(rate, burst, self.clock)
+            return self.buckets[key]
+
+    def acquire(self, module: str, consumer_key: str) -> float:
+        """:description: Blocks the calling thread until a request may be sent
+
+        :param module: API module, see :func:`module_for_url`
+        :type module: str, required
+        :param consumer_key: Consumer key the request is made with
+        :type consumer_key: str, required
+        :return: Seconds waited
+        :rtype: float
+        """
+
+        wait = self.bucket(module, consumer_key).reserve()
+
+        if wait > 0:
+            LOGGER.debug("Throttling %s request for %.3fs", module, wait)
+            time.sleep(wait)
+
+        return wait
+
+    async def acquire_async(self, module: str, consumer_key: str) -> float:
+        """:description: Same as :class:`acquire` without blocking the event loop"""
+
+        wait = self.bucket(module, consumer_key).reserve()
+
+        if wait > 0:
+            LOGGER.debug("Throttling %s request for %.3fs", module, wait)
+            await asyncio.sleep(wait)
+
+        return wait
+
+    def wait_time(self, module: str, consumer_key: str) -> float:
+        """:description: Seconds the next ``module`` request would currently wait"""
+
+        return self.bucket(module, consumer_key).wait_time()
+
+    def stats(self) -> dict:
+        """:description: Throttling counters per bucket
+
+        :return: ``{(module, consumer_key): {"requests", "throttled", "total_wait", "max_wait"}}``
+        :rtype: dict
+        """
+
+        with self.lock:
+            buckets = dict(self.buckets)
+
+        return {key: bucket.stats() for key, bucket in buckets.items()}
+
+
+class RateLimitedRetry(Retry):
+    """:description: :class:`urllib3.util.Retry` that waits for :class:`RateLimiter`
+    after each backoff, so every retried attempt takes a token like the first one
+
+    :param rate_limiter: Limiter shared by all sessions of the process, defaults to None
+    :type rate_limiter: RateLimiter, optional
+    :param consumer_key: Consumer key the session signs with, defaults to None
+    :type consumer_key: str, optional
+    :param kwargs: Passed to :class:`urllib3.util.Retry`
+    """
+
+    def __init__(
+        self,
+        *args,
+        rate_limiter: RateLimiter = None,
+        consumer_key: str = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+        self.consumer_key = consumer_key
+
+    @classmethod
+    def from_retry(
+        cls, retry: Retry, rate_limiter: RateLimiter, consumer_key: str
+    ) -> "RateLimitedRetry":
+        """:description: Same policy as ``retry``, waiting for ``rate_limiter``"""
+
+        params = {
+            name: value
+            for name, value in vars(retry).items()
+            if name not in ("rate_limiter", "consumer_key")
+        }
+        return cls(rate_limiter=rate_limiter, consumer_key=consumer_key, **params)
+
+    def new(self, **kwargs) -> "RateLimitedRetry":
+        # urllib3 derives a new Retry for every attempt
+        retry = super().new(**kwargs)
+        retry.rate_limiter = self.rate_limiter
+        retry.consumer_key = self.consumer_key
+        return retry
+
+    def sleep(self, response=None) -> None:
+        super().sleep(response)
+
+        if self.rate_limiter is not None and self.history:
+            self.rate_limiter.acquire(
+                module_for_url(self.history[-1].url), self.consumer_key
+            )
+            mark("throttle")
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """:description: :class:`requests.adapters.HTTPAdapter` that waits for
+    :class:`RateLimiter` before sending each request
+
+    Retries of ``max_retries`` wait for the limiter as well, see
+    :class:`RateLimitedRetry`.
+
+    :param rate_limiter: Limiter shared by all sessions of the process
+    :type rate_limiter: RateLimiter, required
+    :param consumer_key: Consumer key the session signs with
+    :type consumer_key: str, required
+    :param kwargs: Passed to :class:`requests.adapters.HTTPAdapter`
+    """
+
+    def __init__(self, rate_limiter: RateLimiter, consumer_key: str, **kwargs):
+        self.rate_limiter = rate_limiter
+        self.consumer_key = consumer_key
+        super().__init__(**kwargs)
+        self.max_retries = RateLimitedRetry.from_retry(
+            self.max_retries, rate_limiter, consumer_key
+        )
+
+    def send(self, request, **kwargs):
+        self.rate_limiter.acquire(module_for_url(request.url), self.consumer_key)
+        mark("throttle")
+        return super().send(request, **kwargs)
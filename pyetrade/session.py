@@ -0,0 +1,179 @@
+"""Session - Shared OAuth1 session for ETrade API objects
+
+    A single session can be handed to :class:`pyetrade.market.ETradeMarket`,
+    :class:`pyetrade.accounts.ETradeAccounts`, :class:`pyetrade.order.ETradeOrder`,
+    :class:`pyetrade.alerts.ETradeAlerts` and
+    :class:`pyetrade.authorization.ETradeAccessManager` so that they all reuse
+    the same warm connection pool instead of opening one each.
+
+"""
+import logging
+import random
+
+from requests.adapters import HTTPAdapter
+from requests_oauthlib import OAuth1Session
+from urllib3.util import Retry
+
+from .ratelimit import RateLimitedAdapter
+from .ratelimit import RateLimiter
+
+LOGGER = logging.getLogger(__name__)
+
+# Number of host pools to keep (api.etrade.com, apisb.etrade.com, ...)
+DEFAULT_POOL_CONNECTIONS = 4
+# Number of connections kept alive per host
+DEFAULT_POOL_MAXSIZE = 10
+# Throttled, internal errors and gateway failures are worth another try
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Requests refused before being processed, safe to resend even when placing orders
+REFUSED_STATUSES = (429, 503)
+
+
+def create_retry(
+    total: int = 3,
+    backoff_factor: float = 0.5,
+    backoff_jitter: float = 0.25,
+    backoff_max: float = 30,
+    status_forcelist: tuple = RETRY_STATUSES,
+    allowed_methods: tuple = ("GET",),
+) -> Retry:
+    """:description: Creates the retry policy used for transient failures
+
+    Only GET requests are retried by the session. Order requests (POST and
+    PUT) are retried by :class:`pyetrade.order.ETradeOrder` only when doing
+    so cannot submit an order twice: previews and cancels on any transient
+    failure, places only when refused with one of :data:`REFUSED_STATUSES`.
+
+    :param total: Maximum number of retries, defaults to 3
+    :type total: int, optional
+    :param backoff_factor: Exponential backoff base in seconds, defaults to 0.5
+    :type backoff_factor: float, optional
+    :param backoff_jitter: Random delay added to each backoff, defaults to 0.25
+    :type backoff_jitter: float, optional
+    :param backoff_max: Longest backoff in seconds, defaults to 30
+    :type backoff_max: float, optional
+    :param status_forcelist: HTTP statuses to retry, defaults to 429, 500, 502, 503 and 504
+    :type status_forcelist: tuple, optional
+    :param allowed_methods: HTTP methods the session retries, defaults to GET
+    :type allowed_methods: tuple, optional
+    :return: Retry policy, Retry-After headers are honored
+    :rtype: urllib3.util.Retry
+    """
+
+    return Retry(
+        total=total,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        backoff_max=backoff_max,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset(allowed_methods),
+        respect_retry_after_header=True,
+        # Hand the last response back so raise_for_status() reports it
+        raise_on_status=False,
+    )
+
+
+def get_retry_delay(retry: Retry, attempt: int, response=None) -> float:
+    """:description: Seconds to wait before retry number ``attempt + 1``
+
+    Honors the Retry-After header of ``response``, otherwise backs off
+    exponentially with jitter (Used internally)
+
+    :param retry: Retry policy from :func:`create_retry`
+    :type retry: urllib3.util.Retry, required
+    :param attempt: Number of retries already made
+    :type attempt: int, required
+    :param response: Response that failed, defaults to None
+    :type response: requests.Response, optional
+    :return: Delay in seconds
+    :rtype: float
+    """
+
+    if response is not None and retry.respect_retry_after_header:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            return retry.parse_retry_after(retry_after)
+
+    delay = min(retry.backoff_max, retry.backoff_factor * (2**attempt))
+    if retry.backoff_jitter:
+        delay += random.uniform(0, retry.backoff_jitter)
+
+    return delay
+
+
+def create_session(
+    client_key: str,
+    client_secret: str,
+    resource_owner_key: str,
+    resource_owner_secret: str,
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+    rate_limiter: RateLimiter = None,
+    retry: Retry = None,
+) -> OAuth1Session:
+    """:description: Creates an OAuth1 session that can be shared by all API objects
+
+    :param client_key: Client key provided by Etrade
+    :type client_key: str, required
+    :param client_secret: Client secret provided by Etrade
+    :type client_secret: str, required
+    :param resource_owner_key: Resource key from :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_key: str, required
+    :param resource_owner_secret: Resource secret from
+           :class:`pyetrade.authorization.ETradeOAuth`
+    :type resource_owner_secret: str, required
+    :param pool_connections: Number of per-host connection pools to cache, defaults to 4
+    :type pool_connections: int, optional
+    :param pool_maxsize: Maximum number of connections kept per host, defaults to 10
+    :type pool_maxsize: int, optional
+    :param pool_block: Block when no free connection is available instead of
+                       opening a throwaway one, defaults to False
+    :type pool_block: bool, optional
+    :param keep_alive: Keep connections open between requests, defaults to True
+    :type keep_alive: bool, optional
+    :param rate_limiter: Limiter shared by all sessions of the process, every
+                         request waits for it before being sent, defaults to None
+    :type rate_limiter: :class:`pyetrade.ratelimit.RateLimiter`, optional
+    :param retry: Retry policy for GET requests, e.g. from :func:`create_retry`,
+                  defaults to None (no retries)
+    :type retry: urllib3.util.Retry, optional
+    :return: Session to pass as ``session`` to the API objects
+    :rtype: OAuth1Session
+    """
+
+    session = OAuth1Session(
+        client_key,
+        client_secret,
+        resource_owner_key,
+        resource_owner_secret,
+        signature_type="AUTH_HEADER",
+    )
+
+    pool_kwargs = {
+        "pool_connections": pool_connections,
+        "pool_maxsize": pool_maxsize,
+        "pool_block": pool_block,
+    }
+
+    if retry is not None:
+        pool_kwargs["max_retries"] = retry
+
+    if rate_limiter is not None:
+        adapter = RateLimitedAdapter(rate_limiter, client_key, **pool_kwargs)
+    else:
+        adapter = HTTPAdapter(**pool_kwargs)
+    session.mount("https://", adapter)
+
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    LOGGER.debug(
+        "Created session with pool_connections=%d pool_maxsize=%d keep_alive=%s",
+        pool_connections,
+        pool_maxsize,
+        keep_alive,
+    )
+
+    return session
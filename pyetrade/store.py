@@ -0,0 +1,266 @@
+"""Store - Local SQLite copy of ETrade transaction history
+
+    :class:`TransactionStore` keeps transactions keyed by account and
+    transactionId together with a high-water mark per account (the newer
+    of its last transaction and its last sync), so each
+    :class:`TransactionStore.sync` only downloads what is new since the
+    previous one. Reports then query the indexed tables locally.
+
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+LOGGER = logging.getLogger(__name__)
+
+# ETrade keeps two years of transaction history
+HISTORY_DAYS = 730
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    account_id_key TEXT NOT NULL,
+    transaction_id TEXT NOT NULL,
+    transaction_date INTEGER,
+    post_date INTEGER,
+    transaction_type TEXT,
+    symbol TEXT,
+    amount REAL,
+    description TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (account_id_key, transaction_id)
+);
+CREATE INDEX IF NOT EXISTS transactions_date
+    ON transactions (account_id_key, transaction_date);
+CREATE INDEX IF NOT EXISTS transactions_symbol
+    ON transactions (account_id_key, symbol, transaction_date);
+CREATE INDEX IF NOT EXISTS transactions_type
+    ON transactions (account_id_key, transaction_type, transaction_date);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account_id_key TEXT PRIMARY KEY,
+    high_water_mark INTEGER,
+    synced_at REAL
+);
+"""
+
+
+def _epoch_ms(value) -> int:
+    """Dates are taken as UTC midnight, like the high-water mark in :class:`TransactionStore.sync`"""
+
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    if isinstance(value, date):
+        return int(
+            datetime(
+                value.year, value.month, value.day, tzinfo=timezone.utc
+            ).timestamp()
+            * 1000
+        )
+    return value
+
+
+class TransactionStore(object):
+    """:description: SQLite store of transactions synced from ETrade
+
+    :param path: Database file, defaults to ``:memory:``
+    :type path: str, optional
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def high_water_mark(self, account_id_key: str) -> int:
+        """:description: Newest stored transactionDate or sync end date (epoch ms)
+
+        :return: High-water mark or None if the account was never synced
+        :rtype: int
+        """
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT high_water_mark FROM sync_state WHERE account_id_key = ?",
+                (account_id_key,),
+            ).fetchone()
+
+        return row["high_water_mark"] if row else None
+
+    def save(
+        self, account_id_key: str, transactions, synced_through: date = None
+    ) -> int:
+        """:description: Inserts or updates transactions of an account
+
+        :param account_id_key: AccountIDKey the transactions belong to
+        :type account_id_key: str, required
+        :param transactions: JSON ``Transaction`` elements
+        :type transactions: iterable, required
+        :param synced_through: Last day the transactions were downloaded for, raises
+                               the high-water mark even if there were none, defaults to None
+        :type synced_through: datetime.date, optional
+        :return: Number of transactions that were not stored yet
+        :rtype: int
+        """
+
+        new = 0
+        newest = _epoch_ms(synced_through)
+
+        with self.lock, self.connection:
+            for transaction in transactions:
+                transaction_id = str(transaction["transactionId"])
+                transaction_date = transaction.get("transactionDate")
+                brokerage = transaction.get("brokerage") or {}
+                product = brokerage.get("product") or {}
+
+                exists = self.connection.execute(
+                    "SELECT 1 FROM transactions"
+                    " WHERE account_id_key = ? AND transaction_id = ?",
+                    (account_id_key, transaction_id),
+                ).fetchone()
+                new += exists is None
+
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        account_id_key,
+                        transaction_id,
+                        transaction_date,
+                        transaction.get("postDate"),
+                        transaction.get("transactionType"),
+                        product.get("symbol") or brokerage.get("displaySymbol"),
+                        transaction.get("amount"),
+                        transaction.get("description"),
+                        json.dumps(transaction),
+                    ),
+                )
+                if transaction_date is not None:
+                    newest = max(newest or transaction_date, transaction_date)
+
+            self.connection.execute(
+                "INSERT INTO sync_state VALUES (?, ?, ?)"
+                " ON CONFLICT (account_id_key) DO UPDATE SET"
+                " high_water_mark = max(coalesce(high_water_mark, 0), coalesce(excluded.high_water_mark, 0)),"
+                " synced_at = excluded.synced_at",
+                (account_id_key, newest, time.time()),
+            )
+
+        return new
+
+    def sync(self, accounts, account_id_key: str, windows: int = 1) -> dict:
+        """:description: Downloads the transactions made since the last sync
+
+        The first sync of an account downloads the full two year history.
+        Later syncs start on the day of the high-water mark, transactions
+        seen again are updated in place.
+
+        :param accounts: Accounts API object the transactions are listed with
+        :type accounts: pyetrade.accounts.ETradeAccounts, required
+        :param account_id_key: AccountIDKey retrieved from
+                               :class:`pyetrade.accounts.ETradeAccounts.list_accounts`
+        :type account_id_key: str, required
+        :param windows: Date windows fetched in parallel, see
+                        :class:`pyetrade.accounts.ETradeAccounts.iter_transactions`,
+                        defaults to 1
+        :type windows: int, optional
+        :return: ``{"fetched", "new", "high_water_mark"}``
+        :rtype: dict
+        """
+
+        end_date = date.today()
+        high_water_mark = self.high_water_mark(account_id_key)
+
+        if high_water_mark:
+            # Dates are day granular and in ETrade's time zone, start a day early
+            start_date = datetime.fromtimestamp(
+                high_water_mark / 1000, tz=timezone.utc
+            ).date() - timedelta(days=1)
+        else:
+            start_date = end_date - timedelta(days=HISTORY_DAYS)
+        start_date = min(start_date, end_date)
+
+        fetched = []
+        for transaction in accounts.iter_transactions(
+            account_id_key,
+            start_date=start_date,
+            end_date=end_date,
+            sort_order="ASC",
+            windows=windows,
+            resp_format="json",
+        ):
+            fetched.append(transaction)
+
+        # Without transactions in the window the mark still moves to the end
+        # date, otherwise every sync would download the full history again
+        new = self.save(account_id_key, fetched, synced_through=end_date)
+        LOGGER.debug(
+            "Synced %s: %d fetched, %d new since %s",
+            account_id_key,
+            len(fetched),
+            new,
+            start_date,
+        )
+
+        return {
+            "fetched": len(fetched),
+            "new": new,
+            "high_water_mark": self.high_water_mark(account_id_key),
+        }
+
+    def transactions(
+        self,
+        account_id_key: str = None,
+        start_date: date = None,
+        end_date: date = None,
+        symbol: str = None,
+        transaction_type: str = None,
+    ) -> list:
+        """:description: Queries stored transactions, oldest first
+
+        :param account_id_key: Only this account, defaults to None (all accounts)
+        :type account_id_key: str, optional
+        :param start_date: Earliest transactionDate, defaults to None
+        :type start_date: datetime.date, optional
+        :param end_date: Transactions before this date, defaults to None
+        :type end_date: datetime.date, optional
+        :param symbol: Only transactions of this symbol, defaults to None
+        :type symbol: str, optional
+        :param transaction_type: Only this transactionType (e.g. ``Bought``), defaults to None
+        :type transaction_type: str, optional
+        :return: JSON ``Transaction`` elements as stored
+        :rtype: list
+        """
+
+        clauses = []
+        params = []
+        for column, operator, value in (
+            ("account_id_key", "=", account_id_key),
+            ("transaction_date", ">=", _epoch_ms(start_date)),
+            ("transaction_date", "<", _epoch_ms(end_date)),
+            ("symbol", "=", symbol),
+            ("transaction_type", "=", transaction_type),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {operator} ?")
+                params.append(value)
+
+        query = "SELECT data FROM transactions"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY transaction_date, transaction_id"
+
+        with self.lock:
+            rows = self.connection.execute(query, params).fetchall()
+
+        return [json.loads(row["data"]) for row in rows]
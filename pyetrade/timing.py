@@ -0,0 +1,242 @@
+"""Timing - Opt-in per-phase latency records of order requests
+
+    Pass an :class:`OrderTimings` to :class:`pyetrade.order.ETradeOrder` or
+    :class:`pyetrade.aio.AsyncETradeOrder` as ``timings`` and every preview,
+    place, change and cancel is split into the phases it spent its time in:
+
+    * check - :class:`pyetrade.order.ETradeOrder.check_order`
+    * preview - the preview a place sends first, or finds in the preview cache
+    * build - :class:`pyetrade.order.ETradeOrder.build_order_payload`
+    * serialize - XML encoding of the payload, and JSON encoding on asyncio
+    * sign - OAuth signing, with request preparation and JSON encoding when
+      not on asyncio
+    * throttle - waiting for the :class:`pyetrade.ratelimit.RateLimiter`
+    * network - sending the request and reading the response, retries included
+    * parse - :func:`pyetrade.order.get_request_result`
+
+    Each call becomes one record and feeds one histogram per operation and
+    phase. Without ``timings`` the order methods only pay an ``is None`` check
+    and :func:`mark` a context variable lookup.
+
+"""
+import bisect
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+LOGGER = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the histogram buckets, 0.1ms to ~100s, 4 per decade
+BUCKETS = tuple(10 ** (exponent / 4) for exponent in range(-16, 9))
+
+_current = ContextVar("pyetrade_order_timer", default=None)
+
+
+def mark(phase: str) -> None:
+    """:description: Attributes the time since the previous mark of the current call to ``phase``"""
+
+    timer = _current.get()
+    if timer is not None:
+        timer.mark(phase)
+
+
+class CallTimer(object):
+    """:description: Phase durations of one order call"""
+
+    __slots__ = ("operation", "phases", "started", "last")
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.phases = {}
+        self.started = self.last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.last
+        self.last = now
+
+
+class Histogram(object):
+    """:description: Counts of durations per bucket of :data:`BUCKETS`"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float:
+        """:description: Upper bound of the bucket holding the ``percent`` percentile"""
+
+        if not self.count:
+            return None
+
+        rank = percent / 100 * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """:description: ``{"count", "mean", "min", "max", "p50", "p90", "p99", "buckets"}``,
+        ``buckets`` the ``(upper bound, count)`` pairs of non empty buckets"""
+
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": [
+                (bound, count)
+                for bound, count in zip(BUCKETS + (float("inf"),), self.counts)
+                if count
+            ],
+        }
+
+
+class OrderTimings(object):
+    """:description: Thread safe store of order call timings
+
+    :param maxlen: Number of most recent records kept, defaults to 1000
+    :type maxlen: int, optional
+    :param on_record: Called with every record as it completes, defaults to None
+    :type on_record: callable, optional
+    """
+
+    def __init__(self, maxlen: int = 1000, on_record=None):
+        self.records = deque(maxlen=maxlen)
+        self.histograms = {}
+        self.on_record = on_record
+        self.lock = threading.Lock()
+
+    def add(self, timer: CallTimer, error: Exception = None) -> dict:
+        """:description: Stores the record of a finished call
+
+        :return: ``{"operation", "phases", "total", "error"}`` with seconds per phase
+        :rtype: dict
+        """
+
+        total = time.perf_counter() - timer.started
+        record = {
+            "operation": timer.operation,
+            "phases": dict(timer.phases),
+            "total": total,
+            "error": error,
+        }
+
+        with self.lock:
+            self.records.append(record)
+            for phase, seconds in list(record["phases"].items()) + [("total", total)]:
+                key = (timer.operation, phase)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram()
+                histogram.add(seconds)
+
+        if self.on_record is not None:
+            try:
+                self.on_record(record)
+            except Exception as err:
+                LOGGER.warning("Timing callback failed: %s", err)
+
+        return record
+
+    def summary(self) -> dict:
+        """:description: Histogram summaries of every operation and phase
+
+        :return: ``{operation: {phase: Histogram.summary()}}``, phase ``total``
+                 covering whole calls
+        :rtype: dict
+        """
+
+        with self.lock:
+            summary = {}
+            for (operation, phase), histogram in self.histograms.items():
+                summary.setdefault(operation, {})[phase] = histogram.summary()
+            return summary
+
+    def clear(self) -> None:
+        with self.lock:
+            self.records.clear()
+            self.histograms.clear()
+
+
+def timed(operation: str):
+    """:description: Decorator recording the calls of an order method into ``self.timings``
+
+    Works on plain and ``async`` methods. Calls made while ``self.timings`` is
+    None run untouched.
+    """
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                if self.timings is None:
+                    return await method(self, *args, **kwargs)
+
+                timer = CallTimer(operation)
+                token = _current.set(timer)
+                try:
+                    result = await method(self, *args, **kwargs)
+                except Exception as err:
+                    self.timings.add(timer, err)
+                    raise
+                finally:
+                    _current.reset(token)
+                self.timings.add(timer)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.timings is None:
+                return method(self, *args, **kwargs)
+
+            timer = CallTimer(operation)
+            token = _current.set(timer)
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception as err:
+                self.timings.add(timer, err)
+                raise
+            finally:
+                _current.reset(token)
+            self.timings.add(timer)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class TimedAuth(object):
+    """:description: Wraps the ``auth`` of a :class:`requests.Session` to mark the
+    ``sign`` phase once a request is signed"""
+
+    def __init__(self, auth):
+        self.auth = auth
+
+    def __call__(self, request):
+        request = self.auth(request)
+        mark("sign")
+        return request
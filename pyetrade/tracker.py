@@ -0,0 +1,283 @@
+"""Tracker - Local book of open orders kept up to date by polling
+
+    :class:`OrderTracker` sends one paginated
+    :class:`pyetrade.order.ETradeOrder.iter_orders` sweep per account and
+    interval, diffs it against the previous sweep and calls subscribers on
+    new orders, partial fills, fills, cancels and other status changes. Only
+    orders that left the swept status are looked up one by one, to learn how
+    they ended, until they reach one of ``CLOSED_STATUSES``. :class:`pyetrade.aio.AsyncOrderTracker` does the same on
+    asyncio.
+
+"""
+import logging
+import threading
+
+from .utils import as_list
+
+LOGGER = logging.getLogger(__name__)
+
+# Event types, in the ``type`` key of every event
+NEW = "new"
+PARTIAL_FILL = "partial_fill"
+FILLED = "filled"
+CANCELLED = "cancelled"
+STATUS = "status"
+
+EVENT_TYPES = (NEW, PARTIAL_FILL, FILLED, CANCELLED, STATUS)
+
+# Statuses of orders that are done, orders leave the book on them
+CLOSED_STATUSES = ("EXECUTED", "CANCELLED", "EXPIRED", "REJECTED")
+
+
+def order_status(order: dict) -> str:
+    """:description: Status of an ``Order`` element, None when missing"""
+
+    details = as_list(order.get("OrderDetail"))
+    return details[0].get("status") if details else None
+
+
+def filled_quantity(order: dict) -> float:
+    """:description: Sum of ``filledQuantity`` over the instruments of an ``Order`` element"""
+
+    filled = 0.0
+    for detail in as_list(order.get("OrderDetail")):
+        for instrument in as_list(detail.get("Instrument")):
+            try:
+                filled += float(instrument.get("filledQuantity") or 0)
+            except (TypeError, ValueError):
+                pass
+    return filled
+
+
+class OrderTracker(object):
+    """:description: Tracks the orders of accounts and reports their changes
+
+    The first sweep of an account fills the book without events. Every later
+    sweep reports orders that appeared (``new``), whose filled quantity grew
+    (``partial_fill``) or whose status changed (``status``). Orders missing
+    from a sweep are looked up with
+    :class:`pyetrade.order.ETradeOrder.list_order_details`. Closed ones are
+    reported as ``filled``, ``cancelled`` or ``status`` and leave the book;
+    live ones (e.g. CANCEL_REQUESTED) report their changes and are looked up
+    again on the next sweep.
+
+    Events are dicts with ``type``, ``account_id_key``, ``order_id``,
+    ``status``, ``previous_status``, ``filled``, ``previous_filled`` and
+    ``order`` (the latest ``Order`` element). Orders whose lookup fails stay
+    in the book and are looked up again on the next sweep.
+
+    :param orders_api: Order API the orders are listed with
+    :type orders_api: pyetrade.order.ETradeOrder, required
+    :param account_id_keys: AccountIDKeys to track
+    :type account_id_keys: list[str], required
+    :param interval: Seconds between sweeps of :class:`start`, defaults to 5
+    :type interval: float, optional
+    :param status: Status the sweeps list, defaults to OPEN
+    :type status: str, optional
+    """
+
+    def __init__(
+        self,
+        orders_api,
+        account_id_keys: list,
+        interval: float = 5.0,
+        status: str = "OPEN",
+    ):
+        self.orders_api = orders_api
+        self.account_id_keys = list(account_id_keys)
+        self.interval = interval
+        self.status = status
+        self.book = {}
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def subscribe(self, callback, types: tuple = None) -> None:
+        """:description: Calls ``callback(event)`` for events of the given types
+
+        :param callback: Called on the polling thread, exceptions are logged
+        :type callback: callable, required
+        :param types: Event types, defaults to None (every type)
+        :type types: tuple, optional
+        """
+
+        self.subscribers.append((callback, None if types is None else set(types)))
+
+    def open_orders(self, account_id_key: str = None) -> list:
+        """:description: ``Order`` elements in the book
+
+        :param account_id_key: Only this account, defaults to None (all accounts)
+        :type account_id_key: str, optional
+        :return: Tracked orders
+        :rtype: list
+        """
+
+        with self.lock:
+            return [
+                state["order"]
+                for key, orders in self.book.items()
+                if account_id_key in (None, key)
+                for state in orders.values()
+            ]
+
+    @staticmethod
+    def _event(kind, account_id_key, order_id, state, order) -> dict:
+        return {
+            "type": kind,
+            "account_id_key": account_id_key,
+            "order_id": order_id,
+            "status": order_status(order),
+            "previous_status": state["status"] if state else None,
+            "filled": filled_quantity(order),
+            "previous_filled": state["filled"] if state else 0.0,
+            "order": order,
+        }
+
+    def _changes(self, account_id_key, order_id, state, order) -> list:
+        if filled_quantity(order) > state["filled"]:
+            return [self._event(PARTIAL_FILL, account_id_key, order_id, state, order)]
+        if order_status(order) != state["status"]:
+            return [self._event(STATUS, account_id_key, order_id, state, order)]
+        return []
+
+    def _diff(self, account_id_key: str, orders: list) -> tuple:
+        """:description: Applies a sweep to the book
+
+        :return: ``(events, missing)``, ``missing`` the orderIds that left the sweep
+        :rtype: tuple
+        """
+
+        events = []
+        seen = {}
+        for order in orders:
+            seen[order.get("orderId")] = order
+
+        with self.lock:
+            first = account_id_key not in self.book
+            book = self.book.setdefault(account_id_key, {})
+
+            for order_id, order in seen.items():
+                state = book.get(order_id)
+                status = order_status(order)
+                filled = filled_quantity(order)
+
+                if not first:
+                    if state is None:
+                        events.append(
+                            self._event(NEW, account_id_key, order_id, None, order)
+                        )
+                    else:
+                        events.extend(
+                            self._changes(account_id_key, order_id, state, order)
+                        )
+
+                book[order_id] = {"status": status, "filled": filled, "order": order}
+
+            missing = [order_id for order_id in book if order_id not in seen]
+
+        return events, missing
+
+    def _close(self, account_id_key: str, order_id, details: dict) -> list:
+        """:description: Applies the lookup of an order that left the sweep
+
+        Orders in ``CLOSED_STATUSES`` leave the book, others stay in it and
+        are looked up again on the next sweep.
+
+        :param details: :class:`pyetrade.order.ETradeOrder.list_order_details` response
+        :return: Event of how the order ended or changed, empty if it is unknown
+        """
+
+        response = details.get("OrdersResponse") or {}
+        orders = as_list(response.get("Order"))
+
+        with self.lock:
+            book = self.book.get(account_id_key, {})
+            state = book.get(order_id)
+            if state is None:
+                return []
+            if not orders:
+                book.pop(order_id)
+                return []
+
+            order = dict(orders[0])
+            order.setdefault("orderId", order_id)
+            status = order_status(order)
+
+            if status not in CLOSED_STATUSES:
+                book[order_id] = {
+                    "status": status,
+                    "filled": filled_quantity(order),
+                    "order": order,
+                }
+                return self._changes(account_id_key, order_id, state, order)
+
+            book.pop(order_id)
+
+        kind = {"EXECUTED": FILLED, "CANCELLED": CANCELLED}.get(status, STATUS)
+        return [self._event(kind, account_id_key, order_id, state, order)]
+
+    def _publish(self, events: list) -> None:
+        for event in events:
+            for callback, types in self.subscribers:
+                if types is None or event["type"] in types:
+                    try:
+                        callback(event)
+                    except Exception as err:
+                        LOGGER.warning("Order tracker callback failed: %s", err)
+
+    def poll(self) -> list:
+        """:description: Sweeps every account once and publishes the changes
+
+        :return: Published events
+        :rtype: list
+        """
+
+        published = []
+        for account_id_key in self.account_id_keys:
+            orders = list(
+                self.orders_api.iter_orders(
+                    account_id_key, status=self.status, resp_format="json"
+                )
+            )
+            events, missing = self._diff(account_id_key, orders)
+
+            for order_id in missing:
+                try:
+                    details = self.orders_api.list_order_details(
+                        account_id_key, order_id, resp_format="json"
+                    )
+                except Exception as err:
+                    # Stays in the book and is looked up again next sweep
+                    LOGGER.warning("Order %s lookup failed: %s", order_id, err)
+                    continue
+                events.extend(self._close(account_id_key, order_id, details))
+
+            self._publish(events)
+            published.extend(events)
+
+        return published
+
+    def start(self) -> threading.Thread:
+        """:description: Polls every ``interval`` seconds on a daemon thread until :class:`stop`"""
+
+        def run():
+            while not self.stopped.is_set():
+                try:
+                    self.poll()
+                except Exception as err:
+                    LOGGER.warning("Order tracker sweep failed: %s", err)
+                self.stopped.wait(self.interval)
+
+        self.stopped.clear()
+        self.thread = threading.Thread(
+            target=run, name="pyetrade-order-tracker", daemon=True
+        )
+        self.thread.start()
+        return self.thread
+
+    def stop(self, timeout: float = None) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
@@ -0,0 +1,57 @@
+"""Utils - Helpers shared by the pyetrade API modules
+
+"""
+
+
+def as_list(value) -> list:
+    """:description: Normalizes a repeated response element to a list
+
+    ``xmltodict`` returns a single element as a dict and several as a list, and
+    ETrade omits empty elements altogether.
+
+    :param value: Parsed response element
+    :type value: dict, list or None, required
+    :return: ``value`` as a list
+    :rtype: list
+    """
+
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def xml_shaped(value):
+    """:description: Reshapes a parsed JSON response like ``xmltodict`` parses the XML one
+
+    ETrade wraps repeated elements in lists even when there is only one and
+    sends numbers and booleans unquoted. Single element lists are unwrapped,
+    empty lists dropped, empty elements set to None and scalars turned into
+    the strings of the XML response, so code written against XML responses
+    reads JSON ones unchanged.
+
+    :param value: Parsed JSON response or element
+    :type value: dict, list or scalar, required
+    :return: ``value`` shaped like the parsed XML response
+    :rtype: dict, list, str or None
+    """
+
+    if isinstance(value, dict):
+        shaped = {}
+        for key, item in value.items():
+            if isinstance(item, list) and not item:
+                continue
+            item = xml_shaped(item)
+            # Empty elements parse as None
+            shaped[key] = None if item == "" or item == {} else item
+        return shaped
+    if isinstance(value, list):
+        if len(value) == 1:
+            return xml_shaped(value[0])
+        return [xml_shaped(item) for item in value]
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return None
+    return str(value)
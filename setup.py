@@ -30,6 +30,7 @@ setup(
     license="GPLv3",
     packages=find_packages(exclude=["docs", "test*"]),
     install_requires=install_requires,
+    extras_require={"async": ["aiohttp>=3.9.0,<4.0.0"]},
     platforms=["any"],
     keywords=["etrade", "pyetrade", "stocks"],
     classifiers=[
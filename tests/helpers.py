@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""pyetrade unit test helpers
+"""
+
+
+class FakeClock(object):
+    """Clock for ``clock`` arguments that only moves when ``now`` is set"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
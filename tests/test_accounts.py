@@ -3,10 +3,16 @@
    TODO:
        * Test request error
 """
+import datetime as dt
+import os
+import tempfile
+import time
 import unittest
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+from requests.exceptions import HTTPError
+
 from pyetrade import accounts
 
 
@@ -52,6 +58,120 @@ class TestETradeAccounts(unittest.TestCase):
         self.assertTrue(isinstance(result, dict))
         self.assertTrue(MockOAuthSession().get.called)
 
+    @patch("pyetrade.accounts.OAuth1Session")
+    def test_list_accounts_cache(self, MockOAuthSession):
+        """test_list_accounts_cache(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: the account list is cached, persisted and refreshed"""
+        accounts_list = {
+            "AccountListResponse": {
+                "Accounts": {
+                    "Account": [
+                        {
+                            "accountId": "840104290",
+                            "accountIdKey": "JIdOIAcSpwR1Jva7RQBraQ",
+                        }
+                    ]
+                }
+            }
+        }
+        MockOAuthSession().get().json.return_value = accounts_list
+        MockOAuthSession().get.reset_mock()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "accounts.json")
+            account = accounts.ETradeAccounts(
+                "abc123",
+                "xyz123",
+                "abctoken",
+                "xyzsecret",
+                accounts_ttl=60,
+                accounts_cache_path=path,
+            )
+
+            self.assertEqual(account.list_accounts(resp_format="json"), accounts_list)
+            self.assertEqual(
+                account.get_account_id_key(840104290), "JIdOIAcSpwR1Jva7RQBraQ"
+            )
+            self.assertEqual(MockOAuthSession().get.call_count, 1)
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+
+            # A new object reads the persisted list
+            account = accounts.ETradeAccounts(
+                "abc123",
+                "xyz123",
+                "abctoken",
+                "xyzsecret",
+                accounts_ttl=60,
+                accounts_cache_path=path,
+            )
+            self.assertEqual(account.list_accounts(resp_format="json"), accounts_list)
+            self.assertEqual(MockOAuthSession().get.call_count, 1)
+
+            # Live accounts are cached apart from the sandbox ones
+            live = accounts.ETradeAccounts(
+                "abc123",
+                "xyz123",
+                "abctoken",
+                "xyzsecret",
+                dev=False,
+                accounts_ttl=60,
+                accounts_cache_path=path,
+            )
+            live.refresh_accounts(resp_format="json")
+            self.assertEqual(MockOAuthSession().get.call_count, 2)
+            MockOAuthSession().get.assert_called_with(
+                "https://api.etrade.com/v1/accounts/list.json"
+            )
+            account.accounts_cache = None
+            account.list_accounts(resp_format="json")
+            self.assertEqual(MockOAuthSession().get.call_count, 2)
+
+            # Other users of the same consumer key are cached apart, without
+            # their access tokens in the file
+            other = accounts.ETradeAccounts(
+                "abc123",
+                "xyz123",
+                "othertoken",
+                "othersecret",
+                accounts_ttl=60,
+                accounts_cache_path=path,
+            )
+            other.list_accounts(resp_format="json")
+            self.assertEqual(MockOAuthSession().get.call_count, 3)
+            with open(path) as cache_file:
+                self.assertNotIn("othertoken", cache_file.read())
+
+            # Unknown accounts refresh the list once
+            with self.assertRaises(KeyError):
+                account.get_account_id_key("123")
+            self.assertEqual(MockOAuthSession().get.call_count, 4)
+
+            # Expired entries are fetched again
+            with patch("pyetrade.accounts.time.time", return_value=time.time() + 61):
+                account.list_accounts(resp_format="json")
+            self.assertEqual(MockOAuthSession().get.call_count, 5)
+
+            with open(path, "w") as cache_file:
+                cache_file.write("not json")
+            account = accounts.ETradeAccounts(
+                "abc123",
+                "xyz123",
+                "abctoken",
+                "xyzsecret",
+                accounts_ttl=60,
+                accounts_cache_path=path,
+            )
+            account.list_accounts(resp_format="json")
+            self.assertEqual(MockOAuthSession().get.call_count, 6)
+
+        # Without accounts_ttl nothing is cached
+        account = accounts.ETradeAccounts("abc123", "xyz123", "abctoken", "xyzsecret")
+        account.list_accounts(resp_format="json")
+        account.list_accounts(resp_format="json")
+        self.assertEqual(MockOAuthSession().get.call_count, 8)
+
     @patch("pyetrade.accounts.OAuth1Session")
     def test_get_account_balance(self, MockOAuthSession):
         """test_get_account_balance(MockOAuthSession) -> None
@@ -115,6 +235,56 @@ class TestETradeAccounts(unittest.TestCase):
         self.assertTrue(MockOAuthSession().get().json.called)
         self.assertTrue(MockOAuthSession().get.called)
 
+    def test_get_snapshot(self):
+        """test_get_snapshot() -> None
+        description: balances and portfolios of open accounts are fetched concurrently
+        """
+        account = accounts.ETradeAccounts("abc123", "xyz123", "abctoken", "xyzsecret")
+        account.list_accounts = MagicMock(
+            return_value={
+                "AccountListResponse": {
+                    "Accounts": {
+                        "Account": [
+                            {"accountIdKey": "k1", "accountStatus": "ACTIVE"},
+                            {"accountIdKey": "k2", "accountStatus": "ACTIVE"},
+                            {"accountIdKey": "k3", "accountStatus": "CLOSED"},
+                        ]
+                    }
+                }
+            }
+        )
+        account.get_account_balance = MagicMock(
+            side_effect=lambda key, resp_format: {"BalanceResponse": {"key": key}}
+        )
+
+        def portfolio(key, all_pages, resp_format):
+            if key == "k2":
+                raise HTTPError("500 Server Error")
+            return {"PortfolioResponse": {"key": key}}
+
+        account.get_account_portfolio = MagicMock(side_effect=portfolio)
+
+        snapshot = account.get_snapshot()
+
+        self.assertEqual(list(snapshot["accounts"]), ["k1", "k2"])
+        k1 = snapshot["accounts"]["k1"]
+        self.assertEqual(k1["account"]["accountIdKey"], "k1")
+        self.assertEqual(k1["balance"], {"BalanceResponse": {"key": "k1"}})
+        self.assertEqual(k1["portfolio"], {"PortfolioResponse": {"key": "k1"}})
+        self.assertEqual(k1["errors"], {})
+        self.assertEqual(set(k1["timing"]), {"balance", "portfolio", "total"})
+        k2 = snapshot["accounts"]["k2"]
+        self.assertIsNone(k2["portfolio"])
+        self.assertTrue(isinstance(k2["errors"]["portfolio"], HTTPError))
+        self.assertTrue(snapshot["elapsed"] >= 0)
+        account.get_account_portfolio.assert_any_call(
+            "k1", all_pages=True, resp_format="json"
+        )
+
+        snapshot = account.get_snapshot(["k9"])
+        self.assertIsNone(snapshot["accounts"]["k9"]["account"])
+        self.assertEqual(account.list_accounts.call_count, 1)
+
     @patch("pyetrade.accounts.OAuth1Session")
     def test_get_account_portfolio(self, MockOAuthSession):
         """test_get_account_positions(MockOAuthSession) -> None
@@ -167,6 +337,74 @@ class TestETradeAccounts(unittest.TestCase):
         result = account.get_account_portfolio("12345abcd", resp_format="xml")
         self.assertTrue(isinstance(result, dict))
 
+    @patch("pyetrade.accounts.OAuth1Session")
+    def test_get_account_portfolio_all_pages(self, MockOAuthSession):
+        """test_get_account_portfolio_all_pages(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: page 1 gives totalPages, the other pages are merged in order"""
+
+        def get(url, params):
+            page = params["pageNumber"]
+            resp = MagicMock()
+            resp.text = (
+                "<PortfolioResponse><AccountPortfolio><totalPages>3</totalPages>"
+                "<nextPageNo>%d</nextPageNo>"
+                "<Position><symbolDescription>P%d</symbolDescription></Position>"
+                "</AccountPortfolio></PortfolioResponse>" % (page + 1, page)
+            )
+            return resp
+
+        MockOAuthSession().get.side_effect = get
+        account = accounts.ETradeAccounts(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+
+        result = account.get_account_portfolio("12345abcd", all_pages=True)
+        portfolio = result["PortfolioResponse"]["AccountPortfolio"]
+        self.assertEqual(
+            [p["symbolDescription"] for p in portfolio["Position"]], ["P1", "P2", "P3"]
+        )
+        self.assertNotIn("nextPageNo", portfolio)
+        self.assertEqual(
+            sorted(
+                c[1]["params"]["pageNumber"]
+                for c in MockOAuthSession().get.call_args_list
+            ),
+            [1, 2, 3],
+        )
+
+        self.assertEqual(
+            [
+                p["symbolDescription"]
+                for p in account.iter_portfolio_positions("12345abcd", max_workers=2)
+            ],
+            ["P1", "P2", "P3"],
+        )
+
+    @patch("pyetrade.accounts.OAuth1Session")
+    def test_get_account_portfolio_single_page(self, MockOAuthSession):
+        """test_get_account_portfolio_single_page(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: a single page is returned as is"""
+        page = {
+            "PortfolioResponse": {
+                "AccountPortfolio": [{"totalPages": 1, "Position": [{"positionId": 1}]}]
+            }
+        }
+        MockOAuthSession().get().json.return_value = page
+        MockOAuthSession().get.reset_mock()
+        account = accounts.ETradeAccounts("abc123", "xyz123", "abctoken", "xyzsecret")
+
+        self.assertEqual(
+            account.get_account_portfolio(
+                "12345abcd", all_pages=True, resp_format="json"
+            ),
+            page,
+        )
+        self.assertEqual(MockOAuthSession().get.call_count, 1)
+
     @patch("pyetrade.accounts.OAuth1Session")
     def test_get_portfolio_position_lot(self, MockOAuthSession):
         """test_get_portfolio_position_lot(MockOAuthSession) -> None
@@ -235,6 +473,65 @@ class TestETradeAccounts(unittest.TestCase):
         with self.assertRaises(KeyError):
             account.get_portfolio_position_lot("GOOG", "account_id_key", "xml")
 
+    @patch("pyetrade.accounts.OAuth1Session")
+    def test_get_portfolio_position_lots(self, MockOAuthSession):
+        """test_get_portfolio_position_lots(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: the positionId index is built once and lots fetched per symbol"""
+
+        def get(url):
+            resp = MagicMock()
+            resp.json.return_value = {"PositionLotsResponse": {"url": url}}
+            if url.endswith("/3.json"):
+                resp.raise_for_status.side_effect = HTTPError("404 Not Found")
+            return resp
+
+        MockOAuthSession().get.side_effect = get
+        account = accounts.ETradeAccounts(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+        positions = [
+            {"positionId": 1, "Product": {"symbol": "AAPL"}},
+            {"positionId": 2, "Product": {"symbol": "MSFT"}},
+        ]
+        account.get_account_portfolio = MagicMock(
+            return_value={
+                "PortfolioResponse": {"AccountPortfolio": [{"Position": positions}]}
+            }
+        )
+
+        result = account.get_portfolio_position_lots(
+            ["msft", "AAPL"], "12345abcd", resp_format="json"
+        )
+        self.assertEqual(list(result), ["msft", "AAPL"])
+        self.assertEqual(
+            result["msft"]["PositionLotsResponse"]["url"],
+            "https://api.etrade.com/v1/accounts/12345abcd/portfolio/2.json",
+        )
+        account.get_account_portfolio.assert_called_once_with(
+            "12345abcd", all_pages=True, resp_format="json"
+        )
+
+        # The cached index serves later calls
+        account.get_portfolio_position_lot("AAPL", "12345abcd", "json")
+        self.assertEqual(account.get_account_portfolio.call_count, 1)
+
+        # A new symbol rebuilds the index once
+        positions.append({"positionId": 3, "Product": {"symbol": "GOOG"}})
+        with self.assertRaises(HTTPError):
+            account.get_portfolio_position_lots(
+                ["GOOG"], "12345abcd", resp_format="json"
+            )
+        self.assertEqual(account.get_account_portfolio.call_count, 2)
+
+        # A failed lot request drops the index
+        self.assertEqual(account.position_index, {})
+        with self.assertRaises(KeyError):
+            account.get_portfolio_position_lots(["TSLA"], "12345abcd")
+        self.assertEqual(account.get_account_portfolio.call_count, 3)
+        self.assertEqual(account.get_portfolio_position_lots([], "12345abcd"), {})
+
     @patch("pyetrade.accounts.OAuth1Session")
     def test_list_transactions(self, MockOAuthSession):
         """test_list_transactions(MockOAuthSession) -> None
@@ -307,6 +604,162 @@ class TestETradeAccounts(unittest.TestCase):
         self.assertTrue(MockOAuthSession().get().json.called)
         self.assertTrue(MockOAuthSession().get.called)
 
+    def test_date_windows(self):
+        """test_date_windows() -> None
+        description: windows cover the range without gaps or overlaps"""
+        self.assertEqual(
+            accounts.date_windows(dt.date(2023, 1, 1), dt.date(2023, 1, 10), 3),
+            [
+                (dt.date(2023, 1, 1), dt.date(2023, 1, 4)),
+                (dt.date(2023, 1, 5), dt.date(2023, 1, 7)),
+                (dt.date(2023, 1, 8), dt.date(2023, 1, 10)),
+            ],
+        )
+        self.assertEqual(
+            accounts.date_windows(dt.date(2023, 1, 1), dt.date(2023, 1, 2), 5),
+            [
+                (dt.date(2023, 1, 1), dt.date(2023, 1, 1)),
+                (dt.date(2023, 1, 2), dt.date(2023, 1, 2)),
+            ],
+        )
+        with self.assertRaises(ValueError):
+            accounts.date_windows(dt.date(2023, 1, 2), dt.date(2023, 1, 1), 2)
+
+    @patch("pyetrade.accounts.OAuth1Session")
+    def test_iter_transactions(self, MockOAuthSession):
+        """test_iter_transactions(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: pages are followed while moreTransactions is true"""
+        pages = [
+            {
+                "TransactionListResponse": {
+                    "marker": "m1",
+                    "moreTransactions": True,
+                    "Transaction": [{"transactionId": 1}, {"transactionId": 2}],
+                }
+            },
+            {
+                "TransactionListResponse": {
+                    "marker": "m2",
+                    "moreTransactions": False,
+                    "Transaction": {"transactionId": 3},
+                }
+            },
+        ]
+        MockOAuthSession().get().text = "{}"
+        MockOAuthSession().get().json.side_effect = pages
+        MockOAuthSession().get.reset_mock()
+        account = accounts.ETradeAccounts(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+
+        self.assertEqual(
+            [
+                t["transactionId"]
+                for t in account.iter_transactions("12345", resp_format="json")
+            ],
+            [1, 2, 3],
+        )
+        params = [c[1]["params"] for c in MockOAuthSession().get.call_args_list]
+        self.assertEqual([p["marker"] for p in params], [None, "m1"])
+        self.assertEqual({p["count"] for p in params}, {50})
+
+        # No transactions in the range
+        MockOAuthSession().get().text = ""
+        self.assertEqual(list(account.iter_transactions("12345")), [])
+
+    @patch("pyetrade.accounts.OAuth1Session")
+    def test_iter_transactions_windows(self, MockOAuthSession):
+        """test_iter_transactions_windows(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: windows are fetched in parallel and yielded in sort order"""
+
+        def get(url, params):
+            resp = MagicMock(text="{}")
+            resp.json.return_value = {
+                "TransactionListResponse": {
+                    "moreTransactions": False,
+                    "Transaction": [{"window": params["startDate"]}],
+                }
+            }
+            return resp
+
+        MockOAuthSession().get.side_effect = get
+        account = accounts.ETradeAccounts(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+        kwargs = dict(
+            start_date=dt.date(2023, 1, 1),
+            end_date=dt.date(2023, 1, 10),
+            windows=3,
+            resp_format="json",
+        )
+
+        self.assertEqual(
+            [t["window"] for t in account.iter_transactions("12345", **kwargs)],
+            ["01082023", "01052023", "01012023"],
+        )
+        self.assertEqual(
+            [
+                t["window"]
+                for t in account.iter_transactions("12345", sort_order="ASC", **kwargs)
+            ],
+            ["01012023", "01052023", "01082023"],
+        )
+        with self.assertRaises(ValueError):
+            list(account.iter_transactions("12345", windows=2))
+
+    def test_iter_transaction_details(self):
+        """test_iter_transaction_details() -> None
+        description: details are fetched concurrently once and settled ones cached"""
+        account = accounts.ETradeAccounts("abc123", "xyz123", "abctoken", "xyzsecret")
+        now = time.time() * 1000
+        recent = {6, 8}
+
+        def details(key, transaction_id, store_id, resp_format):
+            if transaction_id == 7:
+                raise HTTPError("500 Server Error")
+            age = 86400000 if transaction_id in recent else 30 * 86400000
+            return {
+                "TransactionDetailsResponse": {
+                    "transactionId": transaction_id,
+                    "transactionDate": str(int(now - age)),
+                    "storeId": store_id,
+                }
+            }
+
+        account.list_transaction_details = MagicMock(side_effect=details)
+
+        result = dict(
+            account.iter_transaction_details(
+                "12345abcd", [1, (2, "s2"), 3, 4, 5], max_workers=2
+            )
+        )
+        self.assertEqual(sorted(result), [1, 2, 3, 4, 5])
+        self.assertEqual(result[2]["TransactionDetailsResponse"]["storeId"], "s2")
+        self.assertEqual(account.list_transaction_details.call_count, 5)
+        account.list_transaction_details.assert_any_call(
+            "12345abcd", 2, store_id="s2", resp_format="xml"
+        )
+
+        # Cached details make no request, unsettled ones are not cached
+        result = list(account.iter_transaction_details("12345abcd", [5, 6]))
+        self.assertEqual([t for t, _ in result], [5, 6])
+        self.assertEqual(account.list_transaction_details.call_count, 6)
+        self.assertIn("12345abcd/5/xml", account.transaction_details_cache)
+        self.assertNotIn("12345abcd/6/xml", account.transaction_details_cache)
+
+        # A failed request yields its error and the others complete
+        result = dict(
+            account.iter_transaction_details("12345abcd", [6, 7, 8], max_workers=2)
+        )
+        self.assertEqual(sorted(result), [6, 7, 8])
+        self.assertIsInstance(result[7], HTTPError)
+        self.assertEqual(result[8]["TransactionDetailsResponse"]["transactionId"], 8)
+        self.assertEqual(account.list_transaction_details.call_count, 9)
+
     @patch("pyetrade.accounts.OAuth1Session")
     def test_list_transaction_details(self, MockOAuthSession):
         """test_get_transaction_details(MockOAuthSession) -> None
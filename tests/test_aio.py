@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""pyetrade aio unit tests
+"""
+import asyncio
+import datetime as dt
+import unittest
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from requests.exceptions import HTTPError  # noqa: E402
+from urllib3.util import Retry  # noqa: E402
+
+from pyetrade import aio  # noqa: E402
+from pyetrade import order as etrade_order  # noqa: E402
+from pyetrade import session as etrade_session  # noqa: E402
+
+
+def make_response(text: str, status: int = 200) -> aio.AsyncResponse:
+    return aio.AsyncResponse(status, "OK", "https://api.etrade.com", {}, text)
+
+
+def serve(handler) -> TestServer:
+    """TestServer sending every request to ``handler``"""
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    return TestServer(app)
+
+
+def make_session() -> aio.AsyncOAuth1Session:
+    return aio.AsyncOAuth1Session("abc123", "xyz123", "abctoken", "xyzsecret")
+
+
+class TestAsyncOAuth1Session(unittest.TestCase):
+    """TestAsyncOAuth1Session Unit Test"""
+
+    def test_sign(self):
+        """test_sign() -> None
+        description: query string is encoded like requests and signed in the header"""
+        session = aio.AsyncOAuth1Session("abc123", "xyz123", "abctoken", "xyzsecret")
+        url, headers = session.sign(
+            "GET",
+            "https://api.etrade.com/v1/accounts/12345/portfolio",
+            params={"count": 50, "sortBy": None, "totalsRequired": False},
+        )
+
+        self.assertEqual(
+            url,
+            "https://api.etrade.com/v1/accounts/12345/portfolio?count=50&totalsRequired=False",
+        )
+        self.assertTrue(headers["Authorization"].startswith("OAuth "))
+        self.assertIn('oauth_consumer_key="abc123"', headers["Authorization"])
+        self.assertIn('oauth_token="abctoken"', headers["Authorization"])
+
+    def test_raise_for_status(self):
+        """test_raise_for_status() -> None
+        description: 4xx and 5xx raise requests.HTTPError"""
+        make_response("", 200).raise_for_status()
+
+        with self.assertRaises(HTTPError):
+            make_response("", 404).raise_for_status()
+        with self.assertRaises(HTTPError):
+            make_response("", 503).raise_for_status()
+
+    def test_request(self):
+        """test_request() -> None
+        description: requests go through aiohttp with the OAuth header attached"""
+        seen = {}
+        limiter = MagicMock()
+        limiter.acquire_async = AsyncMock(return_value=0.0)
+
+        async def handler(request):
+            seen["authorization"] = request.headers.get("Authorization")
+            seen["query"] = request.query_string
+            seen["body"] = await request.text()
+            seen["content_type"] = request.headers.get("Content-Type")
+            return web.Response(text='{"ok": true}')
+
+        async def run():
+            app = web.Application()
+            app.router.add_route("*", "/{tail:.*}", handler)
+
+            async with TestServer(app) as server:
+                async with aio.AsyncOAuth1Session(
+                    "abc123", "xyz123", "abctoken", "xyzsecret", rate_limiter=limiter
+                ) as session:
+                    resp = await session.get(
+                        str(server.make_url("/v1/market/quote/MMM")),
+                        params={"symbol": "MMM"},
+                    )
+                    self.assertEqual(resp.json(), {"ok": True})
+                    self.assertEqual(seen["query"], "symbol=MMM")
+                    self.assertTrue(seen["authorization"].startswith("OAuth "))
+                    limiter.acquire_async.assert_awaited_with("market", "abc123")
+
+                    resp = await session.put(
+                        str(server.make_url("/v1/accounts/1/orders/cancel")),
+                        json={"CancelOrderRequest": {"orderId": 42}},
+                    )
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertEqual(seen["content_type"], "application/json")
+                    self.assertEqual(
+                        seen["body"], '{"CancelOrderRequest": {"orderId": 42}}'
+                    )
+
+        asyncio.run(run())
+
+    def test_request_retry(self):
+        """test_request_retry() -> None
+        description: GETs and retry_safe requests are retried on transient
+        failures, other requests only when refused with 429 or 503"""
+        calls = []
+        statuses = [503, 200, 500, 503, 200, 500, 200]
+
+        async def handler(request):
+            calls.append(request.method)
+            return web.Response(
+                status=statuses.pop(0), headers={"retry-after": "0"}, text="{}"
+            )
+
+        async def run():
+            retry = etrade_session.create_retry(backoff_factor=0, backoff_jitter=0)
+
+            async with serve(handler) as server:
+                async with aio.AsyncOAuth1Session(
+                    "abc123", "xyz123", "abctoken", "xyzsecret", retry=retry
+                ) as session:
+                    url = str(server.make_url("/v1/accounts/1/orders/place"))
+
+                    resp = await session.get(url)
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertEqual(calls, ["GET", "GET"])
+
+                    resp = await session.post(url)
+                    self.assertEqual(resp.status_code, 500)
+                    resp = await session.post(url)
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertEqual(calls[2:], ["POST", "POST", "POST"])
+
+                    session.retry = Retry(total=3, status_forcelist=[500])
+                    resp = await session.put(url, retry_safe=True)
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertEqual(calls[5:], ["PUT", "PUT"])
+
+        asyncio.run(run())
+
+    def test_request_put_not_retried(self):
+        """test_request_put_not_retried() -> None
+        description: a Retry allowing PUT does not resend changes and places"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.method)
+            return web.Response(status=500, text="{}")
+
+        async def run():
+            async with serve(handler) as server:
+                async with aio.AsyncOAuth1Session(
+                    "abc123",
+                    "xyz123",
+                    "abctoken",
+                    "xyzsecret",
+                    retry=Retry(total=3, status_forcelist=[500], backoff_factor=0),
+                ) as session:
+                    resp = await session.put(
+                        str(server.make_url("/v1/accounts/1/orders/42/change/place"))
+                    )
+                    self.assertEqual(resp.status_code, 500)
+
+        asyncio.run(run())
+        self.assertEqual(calls, ["PUT"])
+
+    def test_response_headers(self):
+        """test_response_headers() -> None
+        description: headers are looked up case-insensitively like requests"""
+        resp = aio.AsyncResponse(
+            429, "Too Many Requests", "https://api.etrade.com", {"retry-after": "7"}, ""
+        )
+
+        self.assertEqual(resp.headers["Retry-After"], "7")
+        self.assertEqual(
+            etrade_session.get_retry_delay(etrade_session.create_retry(), 0, resp), 7
+        )
+
+
+class TestAsyncETradeMarket(unittest.TestCase):
+    """TestAsyncETradeMarket Unit Test"""
+
+    def test_get_quote(self):
+        """test_get_quote() -> None
+        description: same URL and parsed structure as ETradeMarket.get_quote"""
+        session = AsyncMock()
+        session.get.return_value = make_response(
+            "<QuoteResponse><QuoteData><Product><symbol>MMM</symbol></Product>"
+            "</QuoteData></QuoteResponse>"
+        )
+        mark = aio.AsyncETradeMarket(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False, session=session
+        )
+
+        resp = asyncio.run(mark.get_quote(["MMM"], detail_flag="intraday"))
+
+        self.assertEqual(resp["QuoteResponse"]["QuoteData"]["Product"]["symbol"], "MMM")
+        session.get.assert_awaited_with(
+            "https://api.etrade.com/v1/market/quote/MMM?detailflag=INTRADAY"
+        )
+
+    def test_get_option_chains(self):
+        """test_get_option_chains() -> None
+        description: chain and expiry date queries reach the server as the sync ones do
+        """
+        seen = []
+
+        async def handler(request):
+            seen.append((request.path, request.query_string))
+            if "optionexpiredate" in request.path:
+                return web.Response(
+                    text="<OptionExpireDateResponse><ExpirationDate><year>2022</year>"
+                    "</ExpirationDate></OptionExpireDateResponse>"
+                )
+            return web.Response(text='{"OptionChainResponse": {"OptionPair": []}}')
+
+        async def run():
+            async with serve(handler) as server:
+                async with aio.AsyncETradeMarket(
+                    "abc123", "xyz123", "abctoken", "xyzsecret", session=make_session()
+                ) as market:
+                    market.base_url = str(server.make_url("/v1/market/"))
+                    chains = await market.get_option_chains(
+                        "IBM",
+                        dt.date(2018, 8, 17),
+                        chain_type="CALL",
+                        strike_price_near=200,
+                        no_of_strikes=3,
+                        option_category="standard",
+                        price_type="atmn",
+                        skip_adjusted=True,
+                        resp_format="json",
+                    )
+                    expiry = await market.get_option_expire_date("IBM")
+                    return chains, expiry
+
+        chains, expiry = asyncio.run(run())
+
+        self.assertEqual(chains, {"OptionChainResponse": {"OptionPair": []}})
+        self.assertEqual(
+            expiry["OptionExpireDateResponse"]["ExpirationDate"]["year"], "2022"
+        )
+        self.assertEqual(
+            seen,
+            [
+                (
+                    "/v1/market/optionchains.json",
+                    "symbol=IBM&expiryDay=17&expiryMonth=08&expiryYear=2018"
+                    "&strikePriceNear=200.00&chainType=CALL&optionCategory=STANDARD"
+                    "&priceType=ATMN&skipAdjusted=True&noOfStrikes=3",
+                ),
+                ("/v1/market/optionexpiredate", "symbol=IBM&expiryType=ALL"),
+            ],
+        )
+
+
+class TestAsyncETradeAccounts(unittest.TestCase):
+    """TestAsyncETradeAccounts Unit Test"""
+
+    def test_list_transactions_empty(self):
+        """test_list_transactions_empty() -> None
+        description: an empty body is returned as an empty dict"""
+        session = AsyncMock()
+        session.get.return_value = make_response("")
+        account = aio.AsyncETradeAccounts(
+            "abc123", "xyz123", "abctoken", "xyzsecret", session=session
+        )
+
+        self.assertEqual(
+            asyncio.run(account.list_transactions("12345abcd", resp_format="json")),
+            {},
+        )
+
+    def test_get_account_balance(self):
+        """test_get_account_balance() -> None"""
+        session = AsyncMock()
+        session.get.return_value = make_response('{"BalanceResponse": {}}')
+        account = aio.AsyncETradeAccounts(
+            "abc123", "xyz123", "abctoken", "xyzsecret", session=session
+        )
+
+        self.assertEqual(
+            asyncio.run(account.get_account_balance("12345abcd", resp_format="json")),
+            {"BalanceResponse": {}},
+        )
+        session.get.assert_awaited_with(
+            "https://apisb.etrade.com/v1/accounts/12345abcd/balance.json",
+            params={"realTimeNAV": True, "instType": "BROKERAGE"},
+        )
+
+    def test_get_account_portfolio_all_pages(self):
+        """test_get_account_portfolio_all_pages() -> None
+        description: remaining pages are fetched as tasks and merged"""
+        session = AsyncMock()
+
+        async def get(url, params):
+            return make_response(
+                '{"PortfolioResponse": {"AccountPortfolio": [{"totalPages": 2, '
+                '"Position": [{"positionId": %d}]}]}}' % params["pageNumber"]
+            )
+
+        session.get.side_effect = get
+        account = aio.AsyncETradeAccounts(
+            "abc123", "xyz123", "abctoken", "xyzsecret", session=session
+        )
+
+        result = asyncio.run(
+            account.get_account_portfolio("12345", all_pages=True, resp_format="json")
+        )
+        self.assertEqual(
+            result["PortfolioResponse"]["AccountPortfolio"][0]["Position"],
+            [{"positionId": 1}, {"positionId": 2}],
+        )
+
+        async def run():
+            return [
+                p["positionId"]
+                async for p in account.iter_portfolio_positions(
+                    "12345", resp_format="json"
+                )
+            ]
+
+        self.assertEqual(asyncio.run(run()), [1, 2])
+
+    def test_iter_transactions_windows(self):
+        """test_iter_transactions_windows() -> None
+        description: windows run as tasks and are yielded newest first"""
+        session = AsyncMock()
+
+        async def get(url, params):
+            return make_response(
+                '{"TransactionListResponse": {"moreTransactions": false, '
+                '"Transaction": [{"window": "%s"}]}}' % params["startDate"]
+            )
+
+        session.get.side_effect = get
+        account = aio.AsyncETradeAccounts(
+            "abc123", "xyz123", "abctoken", "xyzsecret", session=session
+        )
+
+        async def run():
+            return [
+                t["window"]
+                async for t in account.iter_transactions(
+                    "12345",
+                    start_date=dt.date(2023, 1, 1),
+                    end_date=dt.date(2023, 1, 4),
+                    windows=2,
+                    resp_format="json",
+                )
+            ]
+
+        self.assertEqual(asyncio.run(run()), ["01032023", "01012023"])
+
+
+class TestAsyncETradeOrder(unittest.TestCase):
+    """TestAsyncETradeOrder Unit Test"""
+
+    def test_place_equity_order(self):
+        """test_place_equity_order() -> None
+        description: previews first, then places with the returned previewId"""
+        session = AsyncMock()
+        session.post.return_value = make_response(
+            "<PreviewOrderResponse><PreviewIds><previewId>321</previewId>"
+            "</PreviewIds></PreviewOrderResponse>"
+        )
+        orders = aio.AsyncETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False, session=session
+        )
+
+        resp = asyncio.run(
+            orders.place_equity_order(
+                accountIdKey="12345",
+                symbol="ABC",
+                orderAction="BUY",
+                clientOrderId="1a2b3c",
+                priceType="MARKET",
+                quantity=100,
+                orderTerm="GOOD_UNTIL_CANCEL",
+                marketSession="REGULAR",
+            )
+        )
+
+        self.assertEqual(resp["PreviewOrderResponse"]["PreviewIds"]["previewId"], "321")
+        self.assertEqual(session.post.await_count, 2)
+        self.assertEqual(
+            session.post.await_args[0][0],
+            "https://api.etrade.com/v1/accounts/12345/orders/place",
+        )
+        self.assertIn("<previewId>321</previewId>", session.post.await_args[1]["data"])
+
+    def test_change_order(self):
+        """test_change_order() -> None
+        description: a change is previewed and placed with PUTs to the order's
+        change endpoints"""
+        seen = []
+
+        async def handler(request):
+            seen.append((request.method, request.path, await request.text()))
+            if request.path.endswith("/change/place"):
+                return web.Response(
+                    text="<PlaceOrderResponse><OrderIds><orderId>43</orderId>"
+                    "</OrderIds></PlaceOrderResponse>"
+                )
+            return web.Response(
+                text="<PreviewOrderResponse><PreviewIds><previewId>321</previewId>"
+                "</PreviewIds></PreviewOrderResponse>"
+            )
+
+        order = dict(
+            accountIdKey="12345",
+            symbol="ABC",
+            orderAction="BUY",
+            clientOrderId="1a2b3c",
+            priceType="LIMIT",
+            limitPrice=10.5,
+            quantity=100,
+            orderTerm="GOOD_FOR_DAY",
+            marketSession="REGULAR",
+        )
+
+        async def run():
+            async with serve(handler) as server:
+                async with aio.AsyncETradeOrder(
+                    "abc123",
+                    "xyz123",
+                    "abctoken",
+                    "xyzsecret",
+                    session=make_session(),
+                    preview_cache=aio.PreviewCache(),
+                ) as orders:
+                    orders.base_url = str(server.make_url("/v1/accounts"))
+                    preview = await orders.change_preview_equity_order(
+                        "12345", "42", **order
+                    )
+                    placed = await orders.place_changed_option_order(
+                        orderId="42",
+                        callPut="CALL",
+                        expiryDate="2022-02-18",
+                        strikePrice=20,
+                        **order,
+                    )
+                    # The equity change reuses its cached change preview
+                    await orders.place_changed_equity_order(orderId="42", **order)
+                    return preview, placed
+
+        preview, placed = asyncio.run(run())
+
+        self.assertEqual(
+            preview["PreviewOrderResponse"]["PreviewIds"]["previewId"], "321"
+        )
+        self.assertEqual(placed["PlaceOrderResponse"]["OrderIds"]["orderId"], "43")
+        self.assertEqual(
+            [(method, path) for method, path, _ in seen],
+            [
+                ("PUT", "/v1/accounts/12345/orders/42/change/preview"),
+                ("POST", "/v1/accounts/12345/orders/preview"),
+                ("PUT", "/v1/accounts/12345/orders/42/change/place"),
+                ("PUT", "/v1/accounts/12345/orders/42/change/place"),
+            ],
+        )
+        self.assertIn("<callPut>CALL</callPut>", seen[2][2])
+        self.assertIn("<previewId>321</previewId>", seen[2][2])
+
+    def test_find_option_orders(self):
+        """test_find_option_orders() -> None
+        description: open orders of every page are matched on the OSI symbol"""
+        pages = []
+
+        def option(order_id, strike):
+            product = {
+                "securityType": "OPTN",
+                "symbol": "PLTR",
+                "callPut": "PUT",
+                "expiryYear": 2022,
+                "expiryMonth": 2,
+                "expiryDay": 18,
+                "strikePrice": strike,
+                "productId": {
+                    "symbol": etrade_order.option_symbol(
+                        "PLTR", "PUT", "2022-02-18", strike
+                    )
+                },
+            }
+            return {
+                "orderId": order_id,
+                "OrderDetail": [
+                    {"status": "OPEN", "Instrument": [{"Product": product}]}
+                ],
+            }
+
+        async def handler(request):
+            pages.append(dict(request.query))
+            if "marker" in request.query:
+                response = {"Order": [option(2, 23)]}
+            else:
+                response = {"marker": "m1", "Order": [option(1, 22), option(3, 23)]}
+            return web.json_response({"OrdersResponse": response})
+
+        async def run():
+            async with serve(handler) as server:
+                async with aio.AsyncETradeOrder(
+                    "abc123", "xyz123", "abctoken", "xyzsecret", session=make_session()
+                ) as orders:
+                    orders.base_url = str(server.make_url("/v1/accounts"))
+                    return await orders.find_option_orders(
+                        "12345", "PLTR", "PUT", "2022-02-18", 23
+                    )
+
+        found = asyncio.run(run())
+
+        self.assertEqual(sorted(order["orderId"] for order in found), [2, 3])
+        self.assertEqual([page["status"] for page in pages], ["OPEN", "OPEN"])
+        self.assertEqual(pages[1]["marker"], "m1")
+
+    def test_cancel_order(self):
+        """test_cancel_order() -> None"""
+        session = AsyncMock()
+        session.put.return_value = make_response(
+            '{"CancelOrderResponse": {"orderId": 42, "Messages": {"Message": [{"code": 5011}]}}}'
+        )
+        orders = aio.AsyncETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False, session=session
+        )
+
+        self.assertEqual(
+            asyncio.run(orders.cancel_order("12345", 42, resp_format="json")),
+            {
+                "CancelOrderResponse": {
+                    "orderId": "42",
+                    "Messages": {"Message": {"code": "5011"}},
+                }
+            },
+        )
+        session.put.assert_awaited_with(
+            "https://api.etrade.com/v1/accounts/12345/orders/cancel.json",
+            json={"CancelOrderRequest": {"orderId": 42}},
+            timeout=30,
+            retry_safe=True,
+        )
+
+    def test_iter_orders(self):
+        """test_iter_orders() -> None
+        description: pages are fetched by following the marker"""
+        session = AsyncMock()
+        session.get.side_effect = [
+            make_response(
+                '{"OrdersResponse": {"marker": "m1", "Order": [{"orderId": 1}]}}'
+            ),
+            make_response('{"OrdersResponse": {"Order": [{"orderId": 2}]}}'),
+        ]
+        orders = aio.AsyncETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False, session=session
+        )
+
+        async def run():
+            return [o async for o in orders.iter_orders("12345")]
+
+        self.assertEqual(asyncio.run(run()), [{"orderId": 1}, {"orderId": 2}])
+        self.assertEqual(session.get.await_args[1]["params"]["marker"], "m1")
+        self.assertEqual(session.get.await_args[1]["params"]["count"], 100)
+
+    def test_cancel_orders(self):
+        """test_cancel_orders() -> None
+        description: every listed order is cancelled with per order results"""
+        session = AsyncMock()
+        session.put.side_effect = [
+            make_response(
+                "<CancelOrderResponse><orderId>1</orderId></CancelOrderResponse>"
+            ),
+            HTTPError("500"),
+        ]
+        orders = aio.AsyncETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False, session=session
+        )
+
+        result = asyncio.run(orders.cancel_orders("12345", order_ids=[1, 2]))
+
+        self.assertEqual(
+            result["orders"][1]["response"], {"CancelOrderResponse": {"orderId": "1"}}
+        )
+        self.assertIsInstance(result["orders"][2]["error"], HTTPError)
+        self.assertEqual((result["cancelled"], result["failed"]), (1, 1))
+        self.assertEqual(session.put.await_count, 2)
+        self.assertEqual(
+            session.put.await_args[1]["headers"], {"Content-Type": "application/xml"}
+        )
+
+    def test_order_tracker(self):
+        """test_order_tracker() -> None
+        description: sweeps are diffed into events yielded by events() and
+        orders pending cancel are looked up until they are cancelled"""
+        first = {"orderId": 1, "OrderDetail": [{"status": "OPEN"}]}
+        second = {"orderId": 2, "OrderDetail": [{"status": "OPEN"}]}
+        sweeps = iter([[first], [first, second], [second], [second]])
+
+        async def iter_orders(*args, **kwargs):
+            for order in next(sweeps):
+                yield order
+
+        orders = MagicMock()
+        orders.iter_orders = iter_orders
+        orders.list_order_details = AsyncMock(
+            side_effect=[
+                {
+                    "OrdersResponse": {
+                        "Order": [dict(first, OrderDetail=[{"status": status}])]
+                    }
+                }
+                for status in ("CANCEL_REQUESTED", "CANCELLED")
+            ]
+        )
+        tracker = aio.AsyncOrderTracker(orders, ["12345"], interval=0)
+        seen = []
+        tracker.subscribe(seen.append)
+
+        async def run():
+            events = tracker.events()
+            return [await events.__anext__() for _ in range(3)]
+
+        events = asyncio.run(run())
+        self.assertEqual(
+            [(e["type"], e["order_id"], e["status"]) for e in events],
+            [
+                ("new", 2, "OPEN"),
+                ("status", 1, "CANCEL_REQUESTED"),
+                ("cancelled", 1, "CANCELLED"),
+            ],
+        )
+        self.assertEqual(seen, events)
+        orders.list_order_details.assert_awaited_with("12345", 1, resp_format="json")
+        self.assertEqual(orders.list_order_details.await_count, 2)
+
+    def test_order_tracker_start_stop(self):
+        """test_order_tracker_start_stop() -> None
+        description: the polling task sweeps the server until stopped and
+        failed sweeps do not end it"""
+        sweeps = []
+
+        def order(order_id, status="OPEN"):
+            return {"orderId": order_id, "OrderDetail": [{"status": status}]}
+
+        async def handler(request):
+            if not request.path.endswith("/orders.json"):
+                # Details of an order that left the sweep
+                return web.json_response(
+                    {"OrdersResponse": {"Order": [order(0, "EXECUTED")]}}
+                )
+            sweeps.append(request.path)
+            if len(sweeps) == 1:
+                return web.Response(status=500, text="{}")
+            response = {"Order": [order(len(sweeps))]}
+            return web.json_response({"OrdersResponse": response})
+
+        async def run():
+            async with serve(handler) as server:
+                async with aio.AsyncETradeOrder(
+                    "abc123", "xyz123", "abctoken", "xyzsecret", session=make_session()
+                ) as orders:
+                    orders.base_url = str(server.make_url("/v1/accounts"))
+                    tracker = aio.AsyncOrderTracker(orders, ["12345"], interval=0)
+                    seen = []
+                    tracker.subscribe(seen.append, types=("new",))
+
+                    task = tracker.start()
+                    while not seen:
+                        await asyncio.sleep(0.01)
+                    tracker.stop()
+                    await asyncio.gather(task, return_exceptions=True)
+
+                    self.assertTrue(task.cancelled())
+                    self.assertIsNone(tracker.task)
+                    tracker.stop()
+                    return seen
+
+        seen = asyncio.run(run())
+
+        self.assertGreaterEqual(len(sweeps), 3)
+        self.assertEqual((seen[0]["type"], seen[0]["order_id"]), ("new", 3))
+
+
+class TestAsyncETradeAlerts(unittest.TestCase):
+    """TestAsyncETradeAlerts Unit Test"""
+
+    def test_list_alerts(self):
+        """test_list_alerts() -> None"""
+        session = AsyncMock()
+        session.get.return_value = make_response("<xml> returns </xml>")
+        alert = aio.AsyncETradeAlerts(
+            "abc123", "xyz123", "abctoken", "xyzsecret", session=session
+        )
+
+        self.assertEqual(asyncio.run(alert.list_alerts(count=301)), {"xml": "returns"})
+        session.get.assert_awaited_with(
+            "https://apisb.etrade.com/v1/user/alerts",
+            params={"count": 300, "direction": "DESC"},
+        )
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""pyetrade cache unit tests
+"""
+import threading
+import unittest
+
+from pyetrade import cache
+from tests.helpers import FakeClock
+
+
+class TestQuoteCache(unittest.TestCase):
+    """TestQuoteCache Unit Test"""
+
+    def test_ttl(self):
+        """test_ttl() -> None
+        description: quotes expire after the TTL of their detail flag"""
+        clock = FakeClock()
+        quotes = cache.QuoteCache(ttls={"intraday": 2.0}, clock=clock)
+        quotes.put("MMM", "intraday", "json", {"lastTrade": 1})
+        quotes.put("MMM", "fundamental", "json", {"pe": 20})
+
+        self.assertEqual(
+            quotes.lookup("MMM", "intraday", "json"), ({"lastTrade": 1}, False)
+        )
+        self.assertIsNone(quotes.lookup("MMM", "intraday", "xml"))
+        self.assertEqual(quotes.ttl(None), cache.DEFAULT_TTLS["all"])
+
+        clock.now = 5.0
+        self.assertIsNone(quotes.lookup("MMM", "intraday", "json"))
+        self.assertEqual(
+            quotes.lookup("MMM", "fundamental", "json"), ({"pe": 20}, False)
+        )
+
+        stats = quotes.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["size"], 1)
+
+    def test_stale(self):
+        """test_stale() -> None
+        description: expired quotes are served as stale within stale_ttl"""
+        clock = FakeClock()
+        quotes = cache.QuoteCache(default_ttl=1.0, stale_ttl=2.0, clock=clock)
+        quotes.put("MMM", None, "xml", {"lastTrade": 1})
+
+        clock.now = 2.0
+        self.assertEqual(quotes.lookup("MMM", None, "xml"), ({"lastTrade": 1}, True))
+        clock.now = 3.5
+        self.assertIsNone(quotes.lookup("MMM", None, "xml"))
+        self.assertEqual(quotes.stats()["stale_hits"], 1)
+
+    def test_lru(self):
+        """test_lru() -> None
+        description: least recently used quotes are evicted first"""
+        quotes = cache.QuoteCache(maxsize=2, clock=FakeClock())
+        quotes.put("A", None, "xml", 1)
+        quotes.put("B", None, "xml", 2)
+        quotes.lookup("A", None, "xml")
+        quotes.put("C", None, "xml", 3)
+
+        self.assertIsNone(quotes.lookup("B", None, "xml"))
+        self.assertEqual(quotes.lookup("A", None, "xml"), (1, False))
+        self.assertEqual(quotes.stats()["evictions"], 1)
+
+        with self.assertRaises(ValueError):
+            cache.QuoteCache(maxsize=0)
+
+    def test_refresh(self):
+        """test_refresh() -> None
+        description: keys already refreshing are not fetched twice"""
+        quotes = cache.QuoteCache()
+        release = threading.Event()
+        fetched = []
+
+        def fetch(keys):
+            release.wait(5)
+            fetched.append(keys)
+
+        key = ("MMM", None, "xml")
+        thread = quotes.refresh([key], fetch)
+        self.assertIsNone(quotes.refresh([key], fetch))
+        release.set()
+        thread.join(5)
+
+        self.assertEqual(fetched, [[key]])
+        self.assertEqual(quotes.stats()["refreshes"], 1)
+        self.assertEqual(quotes.refreshing, set())
+
+        def fail(keys):
+            raise RuntimeError("boom")
+
+        quotes.refresh([key], fail).join(5)
+        self.assertEqual(quotes.refreshing, set())
+
+
+class TestPreviewCache(unittest.TestCase):
+    """TestPreviewCache Unit Test"""
+
+    def test_key(self):
+        """test_key() -> None
+        description: equal payloads hash equal whatever their key order"""
+        self.assertEqual(
+            cache.PreviewCache.key({"a": 1, "b": {"c": 2, "d": 3}}),
+            cache.PreviewCache.key({"b": {"d": 3, "c": 2}, "a": 1}),
+        )
+        self.assertNotEqual(
+            cache.PreviewCache.key({"a": 1}), cache.PreviewCache.key({"a": 2})
+        )
+
+    def test_ttl(self):
+        """test_ttl() -> None
+        description: previews expire after the TTL and are evicted oldest first"""
+        clock = FakeClock()
+        previews = cache.PreviewCache(ttl=120.0, maxsize=2, clock=clock)
+        previews.put("a", {"previewId": 1})
+
+        clock.now = 119.0
+        self.assertEqual(previews.lookup("a"), {"previewId": 1})
+        clock.now = 120.0
+        self.assertIsNone(previews.lookup("a"))
+
+        for key in "bcd":
+            previews.put(key, key)
+        previews.discard("d")
+        self.assertIsNone(previews.lookup("b"))
+        self.assertEqual(
+            previews.stats(), {"size": 1, "hits": 1, "misses": 2, "evictions": 1}
+        )
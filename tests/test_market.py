@@ -4,10 +4,16 @@
     * pyetrade.market fixture
 """
 import datetime as dt
+import threading
 import unittest
+from unittest.mock import MagicMock
 from unittest.mock import patch
 
+from requests.exceptions import HTTPError
+
+from pyetrade import cache
 from pyetrade import market
+from tests.helpers import FakeClock
 
 
 # Mock out OAuth1Session
@@ -147,6 +153,296 @@ class TestETradeMarket(unittest.TestCase):
         # test the assertion failure of detail_flag, requireEarningsDate,
         # skipMiniOptionsCheck
 
+    @patch("pyetrade.market.OAuth1Session")
+    def test_get_quotes(self, MockOAuthSession):
+        """test_get_quotes(MockOAuthSession)
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: chunks of 25 are merged in order, failed chunks reported"""
+        symbols = ["S%d" % i for i in range(51)]
+
+        def get(url):
+            chunk = url.split("/quote/")[1].split(".json")[0].split(",")
+            resp = MagicMock()
+            if chunk[0] == "S25":
+                resp.raise_for_status.side_effect = HTTPError("500 Server Error")
+            elif len(chunk) == 1:
+                resp.json.return_value = {
+                    "QuoteResponse": {
+                        "QuoteData": {"Product": {"symbol": chunk[0]}},
+                        "Messages": {"Message": {"code": 1002}},
+                    }
+                }
+            else:
+                resp.json.return_value = {
+                    "QuoteResponse": {
+                        "QuoteData": [{"Product": {"symbol": s}} for s in chunk]
+                    }
+                }
+            return resp
+
+        MockOAuthSession().get.side_effect = get
+        mark = market.ETradeMarket(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+        resp = mark.get_quotes(
+            symbols, detail_flag="intraday", max_workers=3, resp_format="json"
+        )
+
+        self.assertEqual(
+            [q["Product"]["symbol"] for q in resp["QuoteResponse"]["QuoteData"]],
+            symbols[:25] + symbols[50:],
+        )
+        self.assertEqual(
+            resp["QuoteResponse"]["Messages"], {"Message": [{"code": 1002}]}
+        )
+        self.assertEqual(len(resp["Errors"]), 1)
+        self.assertEqual(resp["Errors"][0]["symbols"], symbols[25:50])
+        self.assertTrue(isinstance(resp["Errors"][0]["error"], HTTPError))
+        MockOAuthSession().get.assert_any_call(
+            "https://api.etrade.com/v1/market/quote/S50.json?detailflag=INTRADAY"
+        )
+
+        self.assertEqual(
+            mark.get_quotes([]), {"QuoteResponse": {"QuoteData": []}, "Errors": []}
+        )
+
+    @patch("pyetrade.market.OAuth1Session")
+    def test_get_quote_cache(self, MockOAuthSession):
+        """test_get_quote_cache(MockOAuthSession)
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: only symbols missing from the cache are requested"""
+        clock = FakeClock()
+        quote_cache = cache.QuoteCache(default_ttl=1.0, stale_ttl=5.0, clock=clock)
+        MockOAuthSession().get().text = (
+            "<QuoteResponse><QuoteData><Product><symbol>MMM</symbol></Product>"
+            "</QuoteData></QuoteResponse>"
+        )
+        MockOAuthSession().get.reset_mock()
+        mark = market.ETradeMarket(
+            "abc123",
+            "xyz123",
+            "abctoken",
+            "xyzsecret",
+            dev=False,
+            quote_cache=quote_cache,
+        )
+
+        resp = mark.get_quote(["MMM"])
+        self.assertEqual(resp["QuoteResponse"]["QuoteData"]["Product"]["symbol"], "MMM")
+        self.assertEqual(mark.get_quote(["MMM"]), resp)
+        self.assertEqual(MockOAuthSession().get.call_count, 1)
+
+        MockOAuthSession().get().text = (
+            "<QuoteResponse><QuoteData><Product><symbol>AAPL</symbol></Product>"
+            "</QuoteData></QuoteResponse>"
+        )
+        MockOAuthSession().get.reset_mock()
+        resp = mark.get_quote(["MMM", "AAPL"])
+        self.assertEqual(
+            [q["Product"]["symbol"] for q in resp["QuoteResponse"]["QuoteData"]],
+            ["MMM", "AAPL"],
+        )
+        MockOAuthSession().get.assert_called_once_with(
+            "https://api.etrade.com/v1/market/quote/AAPL"
+        )
+
+        # Stale quotes are returned while a background refresh runs
+        clock.now = 2.0
+        MockOAuthSession().get.reset_mock()
+        with patch.object(quote_cache, "refresh") as mock_refresh:
+            resp = mark.get_quote(["AAPL"])
+        self.assertEqual(
+            resp["QuoteResponse"]["QuoteData"]["Product"]["symbol"], "AAPL"
+        )
+        self.assertFalse(MockOAuthSession().get.called)
+        keys, refresh = mock_refresh.call_args[0]
+        self.assertEqual(keys, [("AAPL", None, "xml")])
+        refresh(keys)
+        MockOAuthSession().get.assert_called_once_with(
+            "https://api.etrade.com/v1/market/quote/AAPL"
+        )
+        self.assertEqual(quote_cache.lookup("AAPL", None, "xml")[1], False)
+
+        # Options bypass the cache
+        mark.get_quote(["MMM"], require_earnings_date=True)
+        MockOAuthSession().get.assert_called_with(
+            "https://api.etrade.com/v1/market/quote/MMM?requireEarningsDate=true"
+        )
+
+    @patch("pyetrade.market.OAuth1Session")
+    def test_get_quote_cache_rejected(self, MockOAuthSession):
+        """test_get_quote_cache_rejected(MockOAuthSession)
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: only quotes matching their symbol are cached"""
+        equity = {"Product": {"symbol": "AAPL", "securityType": "EQ"}}
+        option = {
+            "Product": {
+                "symbol": "AAPL",
+                "securityType": "OPTN",
+                "callPut": "CALL",
+                "expiryYear": 2025,
+                "expiryMonth": 1,
+                "expiryDay": 17,
+                "strikePrice": 150,
+            }
+        }
+        MockOAuthSession().get().json.return_value = {
+            "QuoteResponse": {"QuoteData": [option, equity]}
+        }
+        quote_cache = cache.QuoteCache(default_ttl=60.0)
+        mark = market.ETradeMarket(
+            "abc123",
+            "xyz123",
+            "abctoken",
+            "xyzsecret",
+            dev=False,
+            quote_cache=quote_cache,
+        )
+
+        resp = mark.get_quote(
+            ["AAPL", "AAPL:2025:1:17:CALL:150", "BADSYM"], resp_format="json"
+        )
+        self.assertEqual(resp["QuoteResponse"]["QuoteData"], [equity, option])
+        self.assertEqual(quote_cache.lookup("AAPL", None, "json")[0], equity)
+        self.assertEqual(
+            quote_cache.lookup("AAPL:2025:1:17:CALL:150", None, "json")[0], option
+        )
+        self.assertIsNone(quote_cache.lookup("BADSYM", None, "json"))
+
+        # A positional match of another product is returned but not cached
+        MockOAuthSession().get().json.return_value = {
+            "QuoteResponse": {"QuoteData": [equity]}
+        }
+        resp = mark.get_quote(["MSFT"], resp_format="json")
+        self.assertEqual(resp["QuoteResponse"]["QuoteData"], [equity])
+        self.assertIsNone(quote_cache.lookup("MSFT", None, "json"))
+
+    def test_quote_batcher(self):
+        """test_quote_batcher() -> None
+        description: concurrent calls share requests of up to 25 symbols"""
+        requested = []
+
+        def request(symbols, detail_flag, resp_format):
+            requested.append(list(symbols))
+            return {
+                "QuoteResponse": {
+                    "QuoteData": [{"Product": {"symbol": s}} for s in symbols]
+                }
+            }
+
+        batcher = market.QuoteBatcher(request, window=1.0)
+        results = {}
+
+        def call(symbol):
+            results[symbol] = batcher.get([symbol], None, "json")
+
+        threads = [threading.Thread(target=call, args=("S%d" % i,)) for i in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(sorted(len(symbols) for symbols in requested), [15, 25])
+        self.assertEqual(batcher.stats(), {"calls": 40, "requests": 2})
+        for symbol, resp in results.items():
+            self.assertEqual(
+                resp,
+                {"QuoteResponse": {"QuoteData": [{"Product": {"symbol": symbol}}]}},
+            )
+
+    def test_quote_batcher_rejected(self):
+        """test_quote_batcher_rejected() -> None
+        description: with a rejected symbol in the batch, equity and option
+        quotes of one underlier still reach the calls that asked for them"""
+        equity = {"Product": {"symbol": "AAPL", "securityType": "EQ"}}
+        option = {
+            "Product": {
+                "symbol": "AAPL",
+                "securityType": "OPTN",
+                "callPut": "CALL",
+                "expiryYear": 2025,
+                "expiryMonth": 1,
+                "expiryDay": 17,
+                "strikePrice": 150,
+            }
+        }
+        requested = []
+
+        def request(symbols, detail_flag, resp_format):
+            requested.append(list(symbols))
+            return {
+                "QuoteResponse": {
+                    "QuoteData": [option, equity],
+                    "Messages": {"Message": [{"code": 1019}]},
+                }
+            }
+
+        batcher = market.QuoteBatcher(request, window=0.5)
+        results = {}
+
+        def call(symbols):
+            results[symbols[0]] = batcher.get(symbols, None, "json")
+
+        threads = [
+            threading.Thread(target=call, args=(symbols,))
+            for symbols in (["AAPL", "BADSYM"], ["AAPL:2025:1:17:CALL:150"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(requested), 1)
+        self.assertEqual(results["AAPL"]["QuoteResponse"]["QuoteData"], [equity])
+        self.assertEqual(
+            results["AAPL:2025:1:17:CALL:150"]["QuoteResponse"]["QuoteData"], [option]
+        )
+
+        # Quotes that cannot be told apart are left out
+        quotes, messages = market.match_quotes(
+            ["AAPL", "AAPL:2025:1:17:PUT:150", "BADSYM", "BADSYM2"],
+            {"QuoteResponse": {"QuoteData": [option, equity, equity]}},
+        )
+        self.assertEqual((quotes, messages), ({}, []))
+
+    def test_quote_batcher_error(self):
+        """test_quote_batcher_error() -> None
+        description: a failed request is raised in every call of the batch"""
+
+        def request(symbols, detail_flag, resp_format):
+            raise HTTPError("500 Server Error")
+
+        batcher = market.QuoteBatcher(request, window=0)
+        with self.assertRaises(HTTPError):
+            batcher.get(["MMM"], None, "xml")
+
+    @patch("pyetrade.market.OAuth1Session")
+    def test_get_quote_batch_window(self, MockOAuthSession):
+        """test_get_quote_batch_window(MockOAuthSession)
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: get_quote goes through the batcher with batch_window set"""
+        MockOAuthSession().get().text = (
+            "<QuoteResponse><QuoteData><Product><symbol>MMM</symbol></Product>"
+            "</QuoteData><Messages><Message><code>1019</code></Message></Messages>"
+            "</QuoteResponse>"
+        )
+        MockOAuthSession().get.reset_mock()
+        mark = market.ETradeMarket(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False, batch_window=0
+        )
+
+        resp = mark.get_quote(["MMM", "BAD"], detail_flag="intraday")
+        self.assertEqual(resp["QuoteResponse"]["QuoteData"]["Product"]["symbol"], "MMM")
+        self.assertEqual(resp["QuoteResponse"]["Messages"]["Message"]["code"], "1019")
+        MockOAuthSession().get.assert_called_once_with(
+            "https://api.etrade.com/v1/market/quote/MMM,BAD?detailflag=INTRADAY"
+        )
+        self.assertEqual(mark.quote_batcher.stats(), {"calls": 1, "requests": 1})
+
     @patch("pyetrade.market.OAuth1Session")
     def test_get_option_chains(self, MockOAuthSession):
         """test_get_optionexpiredate(MockOAuthSession)
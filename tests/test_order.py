@@ -5,10 +5,19 @@
        * Test API URL
 """
 import unittest
+from datetime import timedelta
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import xmltodict
+from requests.exceptions import ConnectionError
+from requests.exceptions import Timeout
+
+from pyetrade import cache
 from pyetrade import order
+from pyetrade import session
+from pyetrade import timing
+from pyetrade import utils
 
 
 class TestETradeOrder(unittest.TestCase):
@@ -55,6 +64,37 @@ class TestETradeOrder(unittest.TestCase):
         self.assertTrue(MockOAuthSession().get().json.called)
         self.assertTrue(MockOAuthSession().get.called)
 
+    @patch("pyetrade.order.OAuth1Session")
+    def test_iter_orders(self, MockOAuthSession):
+        """test_iter_orders(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: pages of 100 are fetched by following the marker"""
+        pages = [
+            {"OrdersResponse": {"marker": "m1", "Order": [{"orderId": 1}]}},
+            {"OrdersResponse": {"Order": {"orderId": 2}}},
+        ]
+        MockOAuthSession().get().json.side_effect = pages
+        MockOAuthSession().get.reset_mock()
+        orders = order.ETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+
+        it = orders.iter_orders("12345", status="OPEN")
+        self.assertEqual(next(it), {"orderId": 1})
+        self.assertEqual(MockOAuthSession().get.call_count, 1)
+        self.assertEqual(list(it), [{"orderId": 2}])
+
+        params = [c[1]["params"] for c in MockOAuthSession().get.call_args_list]
+        self.assertEqual([p["marker"] for p in params], [None, "m1"])
+        self.assertEqual({p["count"] for p in params}, {100})
+        self.assertEqual({p["status"] for p in params}, {"OPEN"})
+
+        # An account without orders returns an empty body
+        MockOAuthSession().get().json.side_effect = None
+        MockOAuthSession().get().text = ""
+        self.assertEqual(list(orders.iter_orders("12345")), [])
+
     @patch("pyetrade.order.OAuth1Session")
     def test_list_order_details(self, MockOAuthSession):
         MockOAuthSession().get().json.return_value = {"accountId": "12345"}
@@ -109,6 +149,424 @@ class TestETradeOrder(unittest.TestCase):
 
         self.assertTrue(isinstance(result, list))
 
+    def test_find_option_orders_pages(self):
+        """test_find_option_orders_pages() -> None
+        description: matching orders past the first page are found"""
+        orders = order.ETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+
+        def option_order(order_id, osi):
+            return {
+                "orderId": order_id,
+                "OrderDetail": [
+                    {
+                        "status": "OPEN",
+                        "Instrument": [
+                            {
+                                "Product": {
+                                    "symbol": "AAPL",
+                                    "securityType": "OPTN",
+                                    "productId": {"symbol": osi},
+                                }
+                            }
+                        ],
+                    }
+                ],
+            }
+
+        orders.list_orders = MagicMock(
+            side_effect=[
+                {
+                    "OrdersResponse": {
+                        "marker": "m1",
+                        "Order": [option_order(1, "AAPL--220218P00065000")],
+                    }
+                },
+                {
+                    "OrdersResponse": {
+                        "Order": [option_order(2, "AAPL--220218C00065000")]
+                    }
+                },
+            ]
+        )
+
+        result = orders.find_option_orders("12345", "AAPL", "call", "2022-02-18", 65.0)
+
+        self.assertEqual([o["orderId"] for o in result], [2])
+        self.assertEqual(orders.list_orders.call_count, 2)
+
+    def test_open_order_index(self):
+        """test_open_order_index() -> None
+        description: orders are indexed by OSI, underlier and expiry and
+        dropped once no longer open"""
+
+        def product(symbol, osi=None, **expiry):
+            return {
+                "Product": dict(
+                    symbol=symbol,
+                    securityType="OPTN" if osi else "EQ",
+                    productId={"symbol": osi or symbol},
+                    **expiry,
+                )
+            }
+
+        def make_order(order_id, status, *instruments):
+            return {
+                "orderId": order_id,
+                "OrderDetail": [{"status": status, "Instrument": list(instruments)}],
+            }
+
+        spread = make_order(
+            1,
+            "OPEN",
+            product("MMM", "MMM---220318C00150000"),
+            product(
+                "MMM",
+                "MMM---220415C00150000",
+                expiryYear=2022,
+                expiryMonth=4,
+                expiryDay=15,
+            ),
+        )
+        equity = make_order(2, "PARTIAL", product("mmm"))
+        filled = make_order(3, "EXECUTED", product("MMM", "MMM---220318P00140000"))
+
+        index = order.OpenOrderIndex()
+        index.update([spread, equity, filled])
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.find(osi="MMM---220415C00150000"), [spread])
+        self.assertEqual(index.find(underlier="MMM"), [spread, equity])
+        self.assertEqual(index.find(expiry="2022-03-18"), [spread])
+        self.assertEqual(index.find(underlier="MMM", expiry="2022-04-15"), [spread])
+        self.assertEqual(index.find(underlier="MMM", expiry="2022-05-20"), [])
+        self.assertEqual(index.find(osi="MMM---220318P00140000"), [])
+
+        index.update([make_order(1, "CANCELLED")])
+        self.assertEqual(index.find(underlier="MMM"), [equity])
+        self.assertEqual(index.by_osi, {})
+        self.assertEqual(index.by_expiry, {})
+
+    def test_open_order_index_refresh(self):
+        """test_open_order_index_refresh() -> None
+        description: the first refresh lists OPEN orders, later ones only
+        the orders since the last refresh"""
+        api = MagicMock()
+        api.iter_orders.side_effect = [
+            iter([{"orderId": 1, "OrderDetail": [{"status": "OPEN"}]}]),
+            iter([{"orderId": 1, "OrderDetail": [{"status": "EXECUTED"}]}]),
+        ]
+
+        index = order.OpenOrderIndex(api, "12345").refresh()
+        self.assertEqual(len(index), 1)
+        api.iter_orders.assert_called_with("12345", status="OPEN")
+
+        refreshed = index.refreshed
+        index.refresh()
+        self.assertEqual(len(index), 0)
+        self.assertEqual(
+            api.iter_orders.call_args[1]["from_date"],
+            refreshed - timedelta(days=1),
+        )
+
+    @patch("pyetrade.order.OAuth1Session")
+    def test_place_orders(self, MockOAuthSession):
+        """test_place_orders(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: every order is previewed then placed with its previewId,
+        failed orders are reported without stopping the basket"""
+
+        def post(url, data=None, **kwargs):
+            response = MagicMock(status_code=200)
+            if "BAD" in data:
+                response.text = "<Error><code>100</code><message>bad</message></Error>"
+            elif url.endswith("/preview"):
+                symbol = data.split("<symbol>")[1].split("</symbol>")[0]
+                response.text = (
+                    "<PreviewOrderResponse><PreviewIds><previewId>"
+                    f"{symbol}-id</previewId></PreviewIds></PreviewOrderResponse>"
+                )
+            else:
+                preview_id = data.split("<previewId>")[1].split("</previewId>")[0]
+                response.text = (
+                    f"<PlaceOrderResponse><placed>{preview_id}</placed>"
+                    "</PlaceOrderResponse>"
+                )
+            return response
+
+        MockOAuthSession().post.side_effect = post
+        orders = order.ETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+
+        basket = [
+            dict(
+                accountIdKey="12345",
+                symbol=symbol,
+                orderAction="BUY",
+                clientOrderId=f"c{i}",
+                priceType="MARKET",
+                quantity=10,
+                orderTerm="GOOD_FOR_DAY",
+                marketSession="REGULAR",
+            )
+            for i, symbol in enumerate(["AAA", "BAD", "CCC"])
+        ]
+        basket.append({"symbol": "DDD"})
+
+        results = orders.place_orders(basket, max_workers=3)
+
+        self.assertEqual([r["order"] for r in results], basket)
+        self.assertEqual(results[0]["place"]["PlaceOrderResponse"]["placed"], "AAA-id")
+        self.assertEqual(results[2]["place"]["PlaceOrderResponse"]["placed"], "CCC-id")
+        self.assertIsInstance(results[1]["error"], order.RequestException)
+        self.assertIsNone(results[1]["place"])
+        self.assertIsInstance(results[3]["error"], order.OrderException)
+        self.assertEqual(set(results[0]["timing"]), {"preview", "place", "total"})
+        self.assertNotIn("previewId", basket[0])
+        self.assertEqual(orders.place_orders([]), [])
+
+    @patch("pyetrade.order.OAuth1Session")
+    def test_preview_cache(self, MockOAuthSession):
+        """test_preview_cache(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: a place after the same preview reuses its previewId once"""
+        MockOAuthSession().post().text = r"<PreviewOrderResponse><PreviewIds><previewId>321</previewId></PreviewIds></PreviewOrderResponse>"  # noqa: E501
+        MockOAuthSession().put().text = r"<PreviewOrderResponse><PreviewIds><previewId>654</previewId></PreviewIds></PreviewOrderResponse>"  # noqa: E501
+        MockOAuthSession().post.reset_mock()
+        MockOAuthSession().put.reset_mock()
+        orders = order.ETradeOrder(
+            "abc123",
+            "xyz123",
+            "abctoken",
+            "xyzsecret",
+            dev=False,
+            preview_cache=cache.PreviewCache(),
+        )
+        kwargs = dict(
+            accountIdKey="12345",
+            symbol="ABC",
+            orderAction="BUY",
+            clientOrderId="1a2b3c",
+            priceType="LIMIT",
+            limitPrice=10.5,
+            quantity=100,
+            orderTerm="GOOD_FOR_DAY",
+            marketSession="REGULAR",
+        )
+
+        orders.preview_equity_order(**kwargs)
+        orders.place_equity_order(**dict(reversed(list(kwargs.items()))))
+
+        urls = [c[0][0] for c in MockOAuthSession().post.call_args_list]
+        self.assertEqual([url.rsplit("/", 1)[1] for url in urls], ["preview", "place"])
+        self.assertIn(
+            "<previewId>321</previewId>", MockOAuthSession().post.call_args[1]["data"]
+        )
+
+        # The preview is used up by the place
+        orders.place_equity_order(**kwargs)
+        self.assertEqual(MockOAuthSession().post.call_count, 4)
+
+        # A different order is previewed again
+        orders.preview_equity_order(**kwargs)
+        orders.place_equity_order(**dict(kwargs, quantity=200))
+        self.assertEqual(MockOAuthSession().post.call_count, 7)
+
+        # Changed orders reuse the change preview of the same orderId
+        orders.change_preview_equity_order("12345", "77", **kwargs)
+        orders.place_changed_equity_order(orderId="77", **kwargs)
+        self.assertEqual(MockOAuthSession().post.call_count, 7)
+        self.assertIn(
+            "<previewId>654</previewId>", MockOAuthSession().put.call_args[1]["data"]
+        )
+
+    @patch("pyetrade.order.OAuth1Session")
+    def test_place_equity_order_json(self, MockOAuthSession):
+        """test_place_equity_order_json(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: json requests go to the .json endpoints and their
+        responses are shaped like the xml ones"""
+        MockOAuthSession().post().status_code = 200
+        MockOAuthSession().post().text = "{}"
+        MockOAuthSession().post().json.side_effect = [
+            {
+                "PreviewOrderResponse": {
+                    "PreviewIds": [{"previewId": 321}],
+                    "Order": [{"allOrNone": False, "estimatedCommission": 0.5}],
+                    "Messages": {"Message": []},
+                }
+            },
+            {"PlaceOrderResponse": {"OrderIds": [{"orderId": 7}, {"orderId": 8}]}},
+        ]
+        MockOAuthSession().post.reset_mock()
+        orders = order.ETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+
+        result = orders.place_equity_order(
+            resp_format="json",
+            accountIdKey="12345",
+            symbol="ABC",
+            orderAction="BUY",
+            clientOrderId="1a2b3c",
+            priceType="MARKET",
+            quantity=100,
+            orderTerm="GOOD_UNTIL_CANCEL",
+            marketSession="REGULAR",
+        )
+
+        self.assertEqual(
+            result,
+            {"PlaceOrderResponse": {"OrderIds": [{"orderId": "7"}, {"orderId": "8"}]}},
+        )
+        preview, place = MockOAuthSession().post.call_args_list
+        self.assertEqual(
+            preview[0][0],
+            "https://api.etrade.com/v1/accounts/12345/orders/preview.json",
+        )
+        self.assertEqual(
+            place[0][0], "https://api.etrade.com/v1/accounts/12345/orders/place.json"
+        )
+        self.assertNotIn(
+            "resp_format", preview[1]["json"]["PreviewOrderRequest"]["Order"]
+        )
+        self.assertEqual(
+            place[1]["json"]["PlaceOrderRequest"]["PreviewIds"], {"previewId": "321"}
+        )
+
+    @patch("pyetrade.order.OAuth1Session")
+    def test_timings(self, MockOAuthSession):
+        """test_timings(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: with timings every preview and place is recorded per phase"""
+        MockOAuthSession().post().text = r"<PreviewOrderResponse><PreviewIds><previewId>321</previewId></PreviewIds></PreviewOrderResponse>"  # noqa: E501
+        timings = timing.OrderTimings()
+        orders = order.ETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False, timings=timings
+        )
+        self.assertIsInstance(MockOAuthSession().auth, timing.TimedAuth)
+
+        orders.place_equity_order(
+            accountIdKey="12345",
+            symbol="ABC",
+            orderAction="BUY",
+            clientOrderId="1a2b3c",
+            priceType="MARKET",
+            quantity=100,
+            orderTerm="GOOD_UNTIL_CANCEL",
+            marketSession="REGULAR",
+        )
+
+        preview, place = timings.records
+        self.assertEqual(preview["operation"], "preview")
+        self.assertEqual(
+            set(preview["phases"]), {"check", "build", "serialize", "network", "parse"}
+        )
+        self.assertEqual(place["operation"], "place")
+        self.assertEqual(
+            set(place["phases"]),
+            {"check", "preview", "build", "serialize", "network", "parse"},
+        )
+        self.assertGreaterEqual(place["phases"]["preview"], preview["total"])
+        self.assertIsNone(place["error"])
+        self.assertEqual(timings.summary()["place"]["total"]["count"], 1)
+
+    def test_xml_shaped(self):
+        """test_xml_shaped() -> None
+        description: json responses are reshaped like parsed xml"""
+        self.assertEqual(
+            utils.xml_shaped(
+                {
+                    "PreviewOrderResponse": {
+                        "PreviewIds": [{"previewId": 321}],
+                        "Order": [{"allOrNone": False, "limitPrice": 1.5}],
+                        "Messages": {"Message": []},
+                        "dstFlag": None,
+                    }
+                }
+            ),
+            {
+                "PreviewOrderResponse": {
+                    "PreviewIds": {"previewId": "321"},
+                    "Order": {"allOrNone": "false", "limitPrice": "1.5"},
+                    "Messages": None,
+                    "dstFlag": None,
+                }
+            },
+        )
+
+    @patch("pyetrade.order.OAuth1Session")
+    def test_cancel_orders(self, MockOAuthSession):
+        """test_cancel_orders(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: open orders are selected by symbol or OSI symbol and
+        cancelled concurrently with per order results"""
+
+        def put(url, data=None, **kwargs):
+            order_id = xmltodict.parse(data)["CancelOrderRequest"]["orderId"]
+            if order_id == "3":
+                raise ConnectionError("down")
+            return MagicMock(
+                status_code=200,
+                text=f"<CancelOrderResponse><orderId>{order_id}</orderId></CancelOrderResponse>",
+            )
+
+        MockOAuthSession().put.side_effect = put
+        orders = order.ETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+
+        def make_order(order_id, symbol, osi=None):
+            product = {"symbol": symbol, "securityType": "OPTN" if osi else "EQ"}
+            if osi:
+                product["productId"] = {"symbol": osi}
+            return {
+                "orderId": order_id,
+                "OrderDetail": [
+                    {"status": "OPEN", "Instrument": [{"Product": product}]}
+                ],
+            }
+
+        orders.list_orders = MagicMock(
+            return_value={
+                "OrdersResponse": {
+                    "Order": [
+                        make_order(1, "MMM"),
+                        make_order(2, "IBM"),
+                        make_order(3, "AAPL", "AAPL--220218C00065000"),
+                        make_order(4, "AAPL", "AAPL--220218P00065000"),
+                    ]
+                }
+            }
+        )
+
+        result = orders.cancel_orders(
+            "12345", symbols=["mmm"], osi_symbols=["AAPL--220218C00065000"]
+        )
+
+        self.assertEqual(sorted(result["orders"]), [1, 3])
+        self.assertEqual(
+            result["orders"][1]["response"], {"CancelOrderResponse": {"orderId": "1"}}
+        )
+        self.assertIsInstance(result["orders"][3]["error"], ConnectionError)
+        self.assertEqual((result["cancelled"], result["failed"]), (1, 1))
+        self.assertGreaterEqual(result["elapsed"], result["orders"][1]["elapsed"])
+
+        self.assertEqual(sorted(orders.cancel_orders("12345")["orders"]), [1, 2, 3, 4])
+        self.assertEqual(orders.list_orders.call_count, 2)
+
+        result = orders.cancel_orders("12345", order_ids=[2, 2, 4])
+        self.assertEqual(list(result["orders"]), [2, 4])
+        self.assertEqual(orders.list_orders.call_count, 2)
+        self.assertEqual(orders.cancel_orders("12345", order_ids=[])["orders"], {})
+
     # Mock out OAuth1Session
     @patch("pyetrade.order.OAuth1Session")
     def test_place_equity_order(self, MockOAuthSession):
@@ -278,6 +736,80 @@ class TestETradeOrder(unittest.TestCase):
                     payload["PreviewOrderRequest"]["Order"]["stopPrice"], fd[1]
                 )
 
+    @patch("pyetrade.order.OAuth1Session")
+    def test_place_spread_order(self, MockOAuthSession):
+        """test_place_spread_order(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: a spread is previewed and placed as one order with one
+        Instrument per leg"""
+        MockOAuthSession().post().text = r"<PreviewOrderResponse><PreviewIds><previewId>321</previewId></PreviewIds></PreviewOrderResponse>"  # noqa: E501
+        MockOAuthSession().post.reset_mock()
+        orders = order.ETradeOrder(
+            "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
+        )
+        legs = [
+            dict(callPut=call_put, strikePrice=strike, orderAction=action)
+            for call_put, strike, action in (
+                ("PUT", 90, "BUY_OPEN"),
+                ("PUT", 95, "SELL_OPEN"),
+                ("CALL", 105, "SELL_OPEN"),
+                ("CALL", 110, "BUY_OPEN"),
+            )
+        ]
+        for leg in legs:
+            leg.update(symbol="ABC", expiryDate="2022-02-18", quantity=1)
+        kwargs = dict(
+            accountIdKey="12345",
+            orderType="IRON_CONDOR",
+            clientOrderId="1a2b3c",
+            priceType="NET_CREDIT",
+            limitPrice=1.25,
+            orderTerm="GOOD_FOR_DAY",
+            marketSession="REGULAR",
+        )
+
+        orders.place_option_order(legs=legs, **kwargs)
+
+        preview, place = MockOAuthSession().post.call_args_list
+        self.assertTrue(preview[0][0].endswith("/orders/preview"))
+        self.assertIn("<orderType>IRON_CONDOR</orderType>", place[1]["data"])
+        self.assertIn("<previewId>321</previewId>", place[1]["data"])
+        self.assertEqual(place[1]["data"].count("<Instrument>"), 4)
+        self.assertIn("<strikePrice>105</strikePrice>", place[1]["data"])
+        self.assertNotIn("<legs>", place[1]["data"])
+        self.assertEqual(legs[0]["expiryDate"], "2022-02-18")
+
+        # Buy writes mix a stock leg with an option leg
+        payload = orders.build_order_payload(
+            "PreviewOrderRequest",
+            legs=[
+                dict(securityType="EQ", symbol="ABC", orderAction="BUY", quantity=100),
+                dict(legs[2], orderAction="SELL_OPEN"),
+            ],
+            **dict(kwargs, orderType="BUY_WRITES", priceType="NET_DEBIT"),
+        )
+        instruments = payload["PreviewOrderRequest"]["Order"]["Instrument"]
+        self.assertEqual(payload["PreviewOrderRequest"]["orderType"], "BUY_WRITES")
+        self.assertEqual(
+            instruments[0]["Product"], {"securityType": "EQ", "symbol": "ABC"}
+        )
+        self.assertEqual(instruments[1]["Product"]["expiryDay"], 18)
+
+        # Missing leg fields, single legs, unknown types and prices are refused
+        for bad in (
+            dict(
+                kwargs,
+                legs=[{k: v for k, v in legs[0].items() if k != "callPut"}, legs[1]],
+            ),
+            dict(kwargs, legs=legs[:1]),
+            dict(kwargs, legs=legs, orderType="STRANGLE"),
+            dict({k: v for k, v in kwargs.items() if k != "limitPrice"}, legs=legs),
+        ):
+            with self.assertRaises(order.OrderException):
+                orders.place_option_order(**bad)
+        self.assertEqual(MockOAuthSession().post.call_count, 2)
+
     def test_place_equity_order_exception(self):
         """test_place_equity_order_exception(MockOAuthSession) -> None
         param: MockOAuthSession
@@ -338,18 +870,46 @@ class TestETradeOrder(unittest.TestCase):
         param: MockOAuthSession
         type: mock.MagicMock
         description: MagicMock of OAuth1Session"""
-        MockOAuthSession().put().json.return_value = {"accountIdKey": "12345"}
+        MockOAuthSession().put().json.return_value = {
+            "CancelOrderResponse": {
+                "accountId": "840104290",
+                "orderId": 42,
+                "cancelTime": 1529575616893,
+                "Messages": {
+                    "Message": [
+                        {
+                            "code": 5011,
+                            "description": "Your request to cancel your order is being processed.",
+                            "type": "WARNING",
+                        }
+                    ]
+                },
+            }
+        }
         MockOAuthSession().put().text = r"<xml> returns </xml>"
         orders = order.ETradeOrder(
             "abc123", "xyz123", "abctoken", "xyzsecret", dev=False
         )
-        # Prod
+        # Prod, json responses are shaped like xml ones
         self.assertEqual(
             orders.cancel_order("12345", 42, resp_format="json"),
-            {"accountIdKey": "12345"},
+            {
+                "CancelOrderResponse": {
+                    "accountId": "840104290",
+                    "orderId": "42",
+                    "cancelTime": "1529575616893",
+                    "Messages": {
+                        "Message": {
+                            "code": "5011",
+                            "description": "Your request to cancel your order is being processed.",
+                            "type": "WARNING",
+                        }
+                    },
+                }
+            },
         )
         MockOAuthSession().put.assert_called_with(
-            "https://api.etrade.com/v1/accounts" "/12345/orders/cancel",
+            "https://api.etrade.com/v1/accounts" "/12345/orders/cancel.json",
             json={"CancelOrderRequest": {"orderId": 42}},
             timeout=30,
         )
@@ -358,3 +918,133 @@ class TestETradeOrder(unittest.TestCase):
         self.assertTrue(
             isinstance(orders.cancel_order("12345", 42, resp_format="xml"), dict)
         )
+
+    @patch("pyetrade.order.time.sleep")
+    @patch("pyetrade.order.OAuth1Session")
+    def test_perform_request_retry(self, MockOAuthSession, mock_sleep):
+        """test_perform_request_retry(MockOAuthSession, mock_sleep) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: previews are retried on transient failures"""
+        unavailable = MagicMock(status_code=503, headers={"Retry-After": "2"})
+        preview = MagicMock(
+            status_code=200,
+            text=r"<PreviewOrderResponse><PreviewIds><previewId>321</previewId></PreviewIds></PreviewOrderResponse>",  # noqa: E501
+        )
+        MockOAuthSession().post.side_effect = [
+            ConnectionError("reset"),
+            unavailable,
+            preview,
+        ]
+        orders = order.ETradeOrder(
+            "abc123",
+            "xyz123",
+            "abctoken",
+            "xyzsecret",
+            dev=False,
+            retry=session.create_retry(total=3),
+        )
+
+        result = orders.preview_equity_order(
+            accountIdKey="12345",
+            symbol="ABC",
+            orderAction="BUY",
+            clientOrderId="1a2b3c",
+            priceType="MARKET",
+            quantity=100,
+            orderTerm="GOOD_UNTIL_CANCEL",
+            marketSession="REGULAR",
+        )
+
+        self.assertEqual(
+            result["PreviewOrderResponse"]["PreviewIds"]["previewId"], "321"
+        )
+        self.assertEqual(MockOAuthSession().post.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        mock_sleep.assert_called_with(2)
+
+    @patch("pyetrade.order.time.sleep")
+    @patch("pyetrade.order.OAuth1Session")
+    def test_place_retry(self, MockOAuthSession, mock_sleep):
+        """test_place_retry(MockOAuthSession, mock_sleep) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: places are only resent when ETrade refused them, never
+        after a lost response"""
+        placed = MagicMock(
+            status_code=200,
+            text=r"<PlaceOrderResponse><OrderIds><orderId>7</orderId></OrderIds></PlaceOrderResponse>",  # noqa: E501
+        )
+        MockOAuthSession().post.side_effect = [
+            MagicMock(status_code=429, headers={}),
+            MagicMock(status_code=503, headers={}),
+            placed,
+            MagicMock(
+                status_code=504,
+                headers={},
+                text="<Error><code>504</code><message>Timeout</message></Error>",
+            ),
+            Timeout("read timed out"),
+        ]
+        orders = order.ETradeOrder(
+            "abc123",
+            "xyz123",
+            "abctoken",
+            "xyzsecret",
+            dev=False,
+            retry=session.create_retry(total=3),
+        )
+        kwargs = dict(
+            accountIdKey="12345",
+            symbol="ABC",
+            orderAction="BUY",
+            clientOrderId="1a2b3c",
+            priceType="MARKET",
+            quantity=100,
+            orderTerm="GOOD_UNTIL_CANCEL",
+            marketSession="REGULAR",
+            previewId="321",
+        )
+
+        result = orders.place_equity_order(**kwargs)
+        self.assertEqual(result["PlaceOrderResponse"]["OrderIds"]["orderId"], "7")
+        self.assertEqual(MockOAuthSession().post.call_count, 3)
+
+        # A gateway timeout may hide a placed order
+        with self.assertRaises(order.RequestException):
+            orders.place_equity_order(**kwargs)
+        self.assertEqual(MockOAuthSession().post.call_count, 4)
+
+        with self.assertRaises(Timeout):
+            orders.place_equity_order(**kwargs)
+        self.assertEqual(MockOAuthSession().post.call_count, 5)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch("pyetrade.order.time.sleep")
+    @patch("pyetrade.order.OAuth1Session")
+    def test_perform_request_no_retry(self, MockOAuthSession, mock_sleep):
+        """test_perform_request_no_retry(MockOAuthSession, mock_sleep) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: unsafe requests and exhausted retries fail straight away"""
+        MockOAuthSession().put.side_effect = ConnectionError("reset")
+        orders = order.ETradeOrder(
+            "abc123",
+            "xyz123",
+            "abctoken",
+            "xyzsecret",
+            dev=False,
+            retry=session.create_retry(total=1),
+        )
+
+        with self.assertRaises(ConnectionError):
+            orders.perform_request(
+                orders.session.put, "https://api.etrade.com/v1/accounts", {}, "json"
+            )
+        self.assertEqual(MockOAuthSession().put.call_count, 1)
+
+        MockOAuthSession().put.reset_mock()
+        with self.assertRaises(ConnectionError):
+            orders.cancel_order("12345", 42, resp_format="json")
+        self.assertEqual(MockOAuthSession().put.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""pyetrade payload unit tests
+"""
+import random
+import unittest
+from collections import OrderedDict
+from decimal import Decimal
+
+from jxmlease import emit_xml
+
+from pyetrade import payload
+from pyetrade.order import ETradeOrder
+
+
+class TestEmitOrderXml(unittest.TestCase):
+    """TestEmitOrderXml Unit Test"""
+
+    def assertSameXml(self, value):
+        self.assertEqual(payload.emit_order_xml(value), emit_xml(value))
+
+    def test_order_payloads(self):
+        """test_order_payloads() -> None
+        description: preview, place and cancel payloads match emit_xml"""
+        equity = dict(
+            accountIdKey="12345",
+            symbol="A&B",
+            orderAction="SELL",
+            clientOrderId="1a2b3c",
+            priceType="STOP_LIMIT",
+            limitPrice=10.5,
+            stopPrice=9.123,
+            quantity=100,
+            allOrNone=False,
+            orderTerm="GOOD_FOR_DAY",
+            marketSession="REGULAR",
+        )
+        option = dict(
+            accountIdKey="12345",
+            symbol="PLTR",
+            securityType="OPTN",
+            callPut="PUT",
+            expiryDate="2022-02-18",
+            strikePrice=Decimal("23"),
+            orderAction="BUY_OPEN",
+            clientOrderId="c1",
+            priceType="LIMIT",
+            limitPrice=1.97,
+            quantity=1,
+            orderTerm="GOOD_UNTIL_CANCEL",
+            marketSession="REGULAR",
+        )
+
+        for kwargs in (equity, option):
+            for order_type in ("PreviewOrderRequest", "PlaceOrderRequest"):
+                self.assertSameXml(
+                    ETradeOrder.build_order_payload(order_type, **kwargs)
+                )
+            self.assertSameXml(
+                ETradeOrder.build_order_payload(
+                    "PlaceOrderRequest", previewId=321, **kwargs
+                )
+            )
+
+        self.assertSameXml({"CancelOrderRequest": {"orderId": 5}})
+        self.assertSameXml({"CancelOrderRequest": {"orderId": "<5>"}})
+
+    def test_edge_cases(self):
+        """test_edge_cases() -> None
+        description: empty, repeated and unsupported values match emit_xml"""
+        for value in (
+            {"R": {}},
+            {"R": None},
+            {"R": "x"},
+            {"R": [1, 2]},
+            {"R": []},
+            {"R": {"v": {"d": []}}},
+            {"R": {"v": [{"x": 1}, {"y": [2, [3]]}], "w": None}},
+            {"R": {"v": (1, 2), "w": b"x"}},
+            {"R": OrderedDict(v=1)},
+            {"a": 1, "b": 2},
+        ):
+            self.assertSameXml(value)
+
+    def test_random_payloads(self):
+        """test_random_payloads() -> None
+        description: random nested payloads match emit_xml"""
+        rng = random.Random(42)
+        scalars = ["", " a ", "x\ny", "é", "&<>\"'", 0, -7, 1.5, 1e20, True, None]
+
+        def value(depth):
+            kind = rng.random()
+            if depth > 3 or kind < 0.5:
+                return rng.choice(scalars)
+            if kind < 0.8:
+                return {
+                    rng.choice("abcdef"): value(depth + 1)
+                    for _ in range(rng.randint(0, 4))
+                }
+            return [value(depth + 1) for _ in range(rng.randint(0, 3))]
+
+        for _ in range(500):
+            self.assertSameXml({"R": {"Order": value(0)}})
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""pyetrade positions unit tests
+"""
+import unittest
+
+from pyetrade import positions
+
+
+def make_portfolio(*items):
+    return {
+        "PortfolioResponse": {
+            "AccountPortfolio": [
+                {
+                    "Position": [
+                        {
+                            "Product": {"symbol": symbol, "securityType": "EQ"},
+                            "quantity": quantity,
+                            "totalCost": cost,
+                            "marketValue": value,
+                        }
+                        for symbol, quantity, cost, value in items
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class TestPositionTable(unittest.TestCase):
+    """TestPositionTable Unit Test"""
+
+    def test_totals(self):
+        """test_totals() -> None
+        description: positions of all accounts are summed per symbol"""
+        table = positions.PositionTable.from_portfolios(
+            {
+                "k1": make_portfolio(
+                    ("AAPL", 10, 1000.0, 1500.0), ("MSFT", 5, 1000, 900)
+                ),
+                "k2": make_portfolio(("AAPL", 5, 500.0, 750.0)),
+            }
+        )
+
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.account_id_key, ["k1", "k1", "k2"])
+        totals = table.totals()
+        self.assertEqual(
+            totals["AAPL"],
+            {
+                "quantity": 15.0,
+                "cost_basis": 1500.0,
+                "market_value": 2250.0,
+                "pnl": 750.0,
+                "pnl_pct": 50.0,
+                "positions": 2,
+            },
+        )
+        self.assertEqual(totals["MSFT"]["pnl"], -100.0)
+        self.assertEqual(table.totals(by="account_id_key")["k2"]["market_value"], 750.0)
+        self.assertEqual(
+            table.total(), {"cost_basis": 2500.0, "market_value": 3150.0, "pnl": 650.0}
+        )
+
+        with self.assertRaises(ValueError):
+            table.totals(by="quantity")
+
+    def test_xml_and_options(self):
+        """test_xml_and_options() -> None
+        description: XML strings are parsed and options keep their osiKey"""
+        portfolio = {
+            "PortfolioResponse": {
+                "AccountPortfolio": {
+                    "Position": {
+                        "osiKey": "AAPL--240119C00150000",
+                        "Product": {"symbol": "AAPL", "securityType": "OPTN"},
+                        "quantity": "2",
+                        "totalCost": "300.5",
+                        "marketValue": "",
+                    }
+                }
+            }
+        }
+        snapshot = {
+            "accounts": {
+                "k1": {"portfolio": portfolio},
+                "k2": {"portfolio": None},
+            }
+        }
+        table = positions.PositionTable.from_snapshot(snapshot)
+
+        self.assertEqual(
+            list(table.rows()),
+            [
+                {
+                    "account_id_key": "k1",
+                    "symbol": "AAPL",
+                    "osi_key": "AAPL--240119C00150000",
+                    "security_type": "OPTN",
+                    "quantity": 2.0,
+                    "cost_basis": 300.5,
+                    "market_value": 0.0,
+                }
+            ],
+        )
+        self.assertIn("AAPL--240119C00150000", table.totals(by="osi_key"))
+        self.assertIsNone(positions.PositionTable().totals().get("AAPL"))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""pyetrade ratelimit unit tests
+"""
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pyetrade import ratelimit
+from pyetrade import session
+from tests.helpers import FakeClock
+
+
+class TestModuleForUrl(unittest.TestCase):
+    """TestModuleForUrl Unit Test"""
+
+    def test_module_for_url(self):
+        cases = {
+            "https://api.etrade.com/v1/market/quote/MMM": "market",
+            "https://api.etrade.com/v1/accounts/list.json": "accounts",
+            "https://api.etrade.com/v1/accounts/abc/portfolio": "accounts",
+            "https://api.etrade.com/v1/accounts/abc/orders/place": "order",
+            "https://apisb.etrade.com/v1/accounts/abc/orders.json": "order",
+            "https://api.etrade.com/v1/user/alerts/12": "alerts",
+            "https://api.etrade.com/oauth/renew_access_token": "authorization",
+            "https://example.com/": "default",
+        }
+        for url, module in cases.items():
+            self.assertEqual(ratelimit.module_for_url(url), module)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """TestTokenBucket Unit Test"""
+
+    def test_reserve(self):
+        """test_reserve() -> None
+        description: reservations queue up and refill at the configured rate"""
+        clock = FakeClock()
+        bucket = ratelimit.TokenBucket(2.0, capacity=2, clock=clock)
+
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+        self.assertAlmostEqual(bucket.wait_time(), 1.5)
+
+        clock.now = 10.0
+        self.assertEqual(bucket.wait_time(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+
+        stats = bucket.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["throttled"], 2)
+        self.assertAlmostEqual(stats["total_wait"], 1.5)
+        self.assertAlmostEqual(stats["max_wait"], 1.0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ratelimit.TokenBucket(0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """TestRateLimiter Unit Test"""
+
+    def test_separate_buckets(self):
+        """test_separate_buckets() -> None
+        description: each module and consumer key is throttled on its own"""
+        limiter = ratelimit.RateLimiter(limits={"market": (10.0, 1)}, clock=FakeClock())
+
+        self.assertEqual(limiter.bucket("market", "key1").rate, 10.0)
+        self.assertEqual(limiter.bucket("order", "key1").rate, 2.0)
+        self.assertIs(
+            limiter.bucket("market", "key1"), limiter.bucket("market", "key1")
+        )
+        self.assertIsNot(
+            limiter.bucket("market", "key1"), limiter.bucket("market", "key2")
+        )
+        self.assertEqual(limiter.bucket("default", "key1").rate, 2.0)
+
+    @patch("pyetrade.ratelimit.time.sleep")
+    def test_acquire(self, mock_sleep):
+        """test_acquire(mock_sleep) -> None
+        description: the caller sleeps for its reservation"""
+        limiter = ratelimit.RateLimiter(clock=FakeClock())
+
+        self.assertEqual(limiter.acquire("market", "key1"), 0.0)
+        self.assertFalse(mock_sleep.called)
+        self.assertAlmostEqual(limiter.wait_time("market", "key1"), 0.25)
+        self.assertAlmostEqual(limiter.acquire("market", "key1"), 0.25)
+        mock_sleep.assert_called_with(0.25)
+
+        self.assertEqual(limiter.stats()[("market", "key1")]["throttled"], 1)
+
+    def test_acquire_async(self):
+        """test_acquire_async() -> None
+        description: concurrent tasks are spread out by the bucket"""
+        limiter = ratelimit.RateLimiter(limits={"market": (100.0, 1)})
+
+        async def run():
+            return await asyncio.gather(
+                *[limiter.acquire_async("market", "key1") for _ in range(3)]
+            )
+
+        waits = sorted(asyncio.run(run()))
+        self.assertEqual(waits[0], 0.0)
+        self.assertGreater(waits[2], waits[1])
+
+
+class TestRateLimitedAdapter(unittest.TestCase):
+    """TestRateLimitedAdapter Unit Test"""
+
+    @patch.object(HTTPAdapter, "send")
+    def test_send(self, mock_send):
+        """test_send(mock_send) -> None
+        description: create_session throttles each request before sending"""
+        limiter = MagicMock()
+        sess = session.create_session(
+            "abc123", "xyz123", "abctoken", "xyzsecret", rate_limiter=limiter
+        )
+        adapter = sess.get_adapter("https://api.etrade.com/v1/market/quote/MMM")
+        self.assertTrue(isinstance(adapter, ratelimit.RateLimitedAdapter))
+
+        request = MagicMock(url="https://api.etrade.com/v1/market/quote/MMM")
+        adapter.send(request, timeout=30)
+
+        limiter.acquire.assert_called_with("market", "abc123")
+        mock_send.assert_called_with(request, timeout=30)
+
+    @patch("urllib3.util.retry.time.sleep")
+    def test_send_retries(self, mock_sleep):
+        """test_send_retries(mock_sleep) -> None
+        description: every retry of a throttled request waits for the limiter"""
+        statuses = [503, 429, 200]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(statuses.pop(0))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        limiter = MagicMock()
+        adapter = ratelimit.RateLimitedAdapter(
+            limiter, "abc123", max_retries=session.create_retry(backoff_jitter=0)
+        )
+        sess = requests.Session()
+        sess.mount("http://", adapter)
+
+        resp = sess.get("http://127.0.0.1:%d/v1/market/quote/MMM" % server.server_port)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(limiter.acquire.call_count, 3)
+        limiter.acquire.assert_called_with("market", "abc123")
+        self.assertEqual(adapter.max_retries.total, 3)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""pyetrade session unit tests
+"""
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from pyetrade import accounts
+from pyetrade import alerts
+from pyetrade import authorization
+from pyetrade import market
+from pyetrade import order
+from pyetrade import session
+
+
+class TestCreateSession(unittest.TestCase):
+    """TestCreateSession Unit Test"""
+
+    def test_create_session_pool(self):
+        """test_create_session_pool() -> None
+        description: adapter is mounted with the requested pool sizes"""
+        sess = session.create_session(
+            "abc123", "xyz123", "abctoken", "xyzsecret", pool_maxsize=20
+        )
+        adapter = sess.get_adapter("https://api.etrade.com/v1/market/quote/MMM")
+
+        self.assertTrue(isinstance(adapter, HTTPAdapter))
+        self.assertEqual(adapter._pool_maxsize, 20)
+        self.assertEqual(adapter._pool_connections, session.DEFAULT_POOL_CONNECTIONS)
+        self.assertEqual(sess.headers["Connection"], "keep-alive")
+
+    def test_create_session_no_keep_alive(self):
+        """test_create_session_no_keep_alive() -> None
+        description: keep_alive=False closes connections after each request"""
+        sess = session.create_session(
+            "abc123", "xyz123", "abctoken", "xyzsecret", keep_alive=False
+        )
+
+        self.assertEqual(sess.headers["Connection"], "close")
+
+    @patch("pyetrade.market.OAuth1Session")
+    def test_shared_session(self, MockOAuthSession):
+        """test_shared_session(MockOAuthSession) -> None
+        param: MockOAuthSession
+        type: mock.MagicMock
+        description: API objects use the given session instead of building one"""
+        shared = MagicMock()
+        shared.get().text = r"<xml> returns </xml>"
+        MockOAuthSession.reset_mock()
+
+        objs = [
+            market.ETradeMarket(
+                "abc123", "xyz123", "abctoken", "xyzsecret", session=shared
+            ),
+            accounts.ETradeAccounts(
+                "abc123", "xyz123", "abctoken", "xyzsecret", session=shared
+            ),
+            order.ETradeOrder(
+                "abc123", "xyz123", "abctoken", "xyzsecret", session=shared
+            ),
+            alerts.ETradeAlerts(
+                "abc123", "xyz123", "abctoken", "xyzsecret", session=shared
+            ),
+            authorization.ETradeAccessManager(
+                "abc123", "xyz123", "abctoken", "xyzsecret", session=shared
+            ),
+        ]
+
+        for obj in objs:
+            self.assertIs(obj.session, shared)
+        self.assertFalse(MockOAuthSession.called)
+
+        self.assertTrue(isinstance(objs[0].get_quote(["MMM"]), dict))
+        shared.get.assert_called_with("https://apisb.etrade.com/v1/market/quote/MMM")
+
+
+class TestRetry(unittest.TestCase):
+    """TestRetry Unit Test"""
+
+    def test_create_retry(self):
+        """test_create_retry() -> None
+        description: only GETs are retried by the session by default"""
+        retry = session.create_retry(total=5)
+
+        self.assertEqual(retry.total, 5)
+        self.assertTrue(retry.is_retry("GET", 503))
+        self.assertFalse(retry.is_retry("POST", 503))
+        self.assertFalse(retry.is_retry("GET", 400))
+        self.assertTrue(retry.respect_retry_after_header)
+        self.assertFalse(retry.raise_on_status)
+
+    def test_get_retry_delay(self):
+        """test_get_retry_delay() -> None
+        description: exponential backoff with jitter, Retry-After wins"""
+        retry = session.create_retry(backoff_factor=1, backoff_jitter=0, backoff_max=5)
+
+        self.assertEqual(session.get_retry_delay(retry, 0), 1)
+        self.assertEqual(session.get_retry_delay(retry, 2), 4)
+        self.assertEqual(session.get_retry_delay(retry, 10), 5)
+
+        response = MagicMock(headers={"Retry-After": "7"})
+        self.assertEqual(session.get_retry_delay(retry, 0, response), 7)
+
+        jittered = session.create_retry(backoff_factor=1, backoff_jitter=0.5)
+        self.assertTrue(1 <= session.get_retry_delay(jittered, 0) <= 1.5)
+
+    def test_create_session_retry(self):
+        """test_create_session_retry() -> None
+        description: the retry policy is mounted on the session adapter"""
+        retry = session.create_retry()
+        sess = session.create_session(
+            "abc123", "xyz123", "abctoken", "xyzsecret", retry=retry
+        )
+        adapter = sess.get_adapter("https://api.etrade.com/v1/accounts/list")
+
+        self.assertIs(adapter.max_retries, retry)
+        self.assertTrue(isinstance(adapter.max_retries, Retry))
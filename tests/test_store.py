@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""pyetrade store unit tests
+"""
+import datetime as dt
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from pyetrade import store
+
+
+def make_transaction(transaction_id, day, symbol="AAPL", transaction_type="Bought"):
+    return {
+        "transactionId": transaction_id,
+        "transactionDate": int(
+            dt.datetime(2023, 1, day, 12, tzinfo=dt.timezone.utc).timestamp() * 1000
+        ),
+        "amount": -100.0,
+        "description": "BOUGHT %s" % symbol,
+        "transactionType": transaction_type,
+        "brokerage": {"product": {"symbol": symbol}, "quantity": 1},
+    }
+
+
+class TestTransactionStore(unittest.TestCase):
+    """TestTransactionStore Unit Test"""
+
+    def test_sync(self):
+        """test_sync() -> None
+        description: later syncs start at the high-water mark"""
+        accounts = MagicMock()
+        accounts.iter_transactions.return_value = iter(
+            [make_transaction(1, 2), make_transaction(2, 3, "MSFT", "Sold")]
+        )
+        transactions = store.TransactionStore()
+
+        result = transactions.sync(accounts, "k1")
+
+        self.assertEqual(result["fetched"], 2)
+        self.assertEqual(result["new"], 2)
+        kwargs = accounts.iter_transactions.call_args[1]
+        self.assertEqual(result["high_water_mark"], store._epoch_ms(kwargs["end_date"]))
+        self.assertEqual(kwargs["end_date"] - kwargs["start_date"], dt.timedelta(730))
+        self.assertEqual(kwargs["sort_order"], "ASC")
+        self.assertEqual(kwargs["resp_format"], "json")
+
+        # The newest transaction is seen again and one is new
+        accounts.iter_transactions.return_value = iter(
+            [make_transaction(2, 3, "MSFT", "Sold"), make_transaction(3, 4)]
+        )
+        result = transactions.sync(accounts, "k1")
+
+        self.assertEqual(result["new"], 1)
+        self.assertEqual(
+            accounts.iter_transactions.call_args[1]["start_date"],
+            kwargs["end_date"] - dt.timedelta(1),
+        )
+        self.assertEqual(len(transactions.transactions("k1")), 3)
+        self.assertEqual(transactions.transactions("k2"), [])
+
+    def test_sync_empty(self):
+        """test_sync_empty() -> None
+        description: an account without transactions still records its sync"""
+        accounts = MagicMock()
+        accounts.iter_transactions.return_value = iter([])
+        transactions = store.TransactionStore()
+
+        result = transactions.sync(accounts, "k1")
+
+        end_date = accounts.iter_transactions.call_args[1]["end_date"]
+        self.assertEqual(result["fetched"], 0)
+        self.assertEqual(result["high_water_mark"], store._epoch_ms(end_date))
+
+        accounts.iter_transactions.return_value = iter([])
+        transactions.sync(accounts, "k1")
+
+        kwargs = accounts.iter_transactions.call_args[1]
+        self.assertEqual(kwargs["end_date"] - kwargs["start_date"], dt.timedelta(1))
+
+    def test_transactions(self):
+        """test_transactions() -> None
+        description: stored transactions are filtered locally"""
+        transactions = store.TransactionStore()
+        transactions.save(
+            "k1",
+            [
+                make_transaction(1, 2),
+                make_transaction(2, 3, "MSFT", "Sold"),
+                make_transaction(3, 4),
+            ],
+        )
+        transactions.save("k2", [make_transaction(4, 5)])
+
+        self.assertEqual(
+            [t["transactionId"] for t in transactions.transactions(symbol="AAPL")],
+            [1, 3, 4],
+        )
+        self.assertEqual(
+            [
+                t["transactionId"]
+                for t in transactions.transactions(
+                    "k1", start_date=dt.date(2023, 1, 3), end_date=dt.date(2023, 1, 4)
+                )
+            ],
+            [2],
+        )
+        self.assertEqual(
+            [
+                t["transactionId"]
+                for t in transactions.transactions(transaction_type="Sold")
+            ],
+            [2],
+        )
+        self.assertIsNone(transactions.high_water_mark("k3"))
+
+    def test_persisted(self):
+        """test_persisted() -> None
+        description: the database file keeps transactions and marks"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "transactions.db")
+            transactions = store.TransactionStore(path)
+            transactions.save("k1", [make_transaction(1, 2)])
+            transactions.close()
+
+            transactions = store.TransactionStore(path)
+            self.assertEqual(len(transactions.transactions()), 1)
+            self.assertEqual(
+                transactions.high_water_mark("k1"),
+                make_transaction(1, 2)["transactionDate"],
+            )
+            transactions.close()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""pyetrade timing unit tests
+"""
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from pyetrade import timing
+
+
+class Api(object):
+    def __init__(self, timings=None):
+        self.timings = timings
+
+    @timing.timed("place")
+    def place(self, fail=False):
+        timing.mark("check")
+        if fail:
+            raise ValueError("bad order")
+        timing.mark("network")
+        timing.mark("network")
+        return "placed"
+
+    @timing.timed("cancel")
+    async def cancel(self):
+        timing.mark("build")
+        await asyncio.sleep(0)
+        timing.mark("network")
+        return "cancelled"
+
+
+class TestHistogram(unittest.TestCase):
+    """TestHistogram Unit Test"""
+
+    def test_summary(self):
+        """test_summary() -> None
+        description: percentiles are the upper bounds of their buckets"""
+        histogram = timing.Histogram()
+        self.assertIsNone(histogram.summary()["p50"])
+
+        for seconds in [0.001] * 90 + [0.5] * 9 + [200.0]:
+            histogram.add(seconds)
+
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual((summary["min"], summary["max"]), (0.001, 200.0))
+        self.assertAlmostEqual(summary["p50"], 0.001)
+        self.assertAlmostEqual(summary["p90"], 0.001)
+        self.assertTrue(0.5 <= summary["p99"] < 0.6)
+        self.assertEqual(summary["buckets"][-1], (float("inf"), 1))
+        self.assertEqual(sum(count for _, count in summary["buckets"]), 100)
+
+
+class TestOrderTimings(unittest.TestCase):
+    """TestOrderTimings Unit Test"""
+
+    def test_timed(self):
+        """test_timed() -> None
+        description: calls are recorded per phase, failures included"""
+        on_record = MagicMock()
+        timings = timing.OrderTimings(maxlen=2, on_record=on_record)
+        api = Api(timings)
+
+        self.assertEqual(api.place(), "placed")
+        with self.assertRaises(ValueError):
+            api.place(fail=True)
+        self.assertEqual(asyncio.run(api.cancel()), "cancelled")
+
+        place, failed = (
+            on_record.call_args_list[0][0][0],
+            on_record.call_args_list[1][0][0],
+        )
+        self.assertEqual(set(place["phases"]), {"check", "network"})
+        self.assertGreaterEqual(place["total"], sum(place["phases"].values()))
+        self.assertIsInstance(failed["error"], ValueError)
+        self.assertEqual([r["operation"] for r in timings.records], ["place", "cancel"])
+        self.assertEqual(set(timings.records[1]["phases"]), {"build", "network"})
+
+        summary = timings.summary()
+        self.assertEqual(summary["place"]["total"]["count"], 2)
+        self.assertEqual(summary["place"]["network"]["count"], 1)
+        self.assertEqual(summary["cancel"]["total"]["count"], 1)
+
+        timings.clear()
+        self.assertEqual(timings.summary(), {})
+
+    def test_disabled(self):
+        """test_disabled() -> None
+        description: without timings nothing is recorded and marks are no-ops"""
+        api = Api()
+        self.assertEqual(api.place(), "placed")
+        timing.mark("check")
+        self.assertIsNone(timing._current.get())
+
+    def test_timed_auth(self):
+        """test_timed_auth() -> None
+        description: signing a request marks the sign phase"""
+        timings = timing.OrderTimings()
+        auth = timing.TimedAuth(lambda request: request)
+
+        class Signer(Api):
+            @timing.timed("preview")
+            def preview(self):
+                return auth("request")
+
+        self.assertEqual(Signer(timings).preview(), "request")
+        self.assertEqual(set(timings.records[0]["phases"]), {"sign"})
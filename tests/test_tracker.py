@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""pyetrade tracker unit tests
+"""
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from pyetrade import tracker
+
+
+def make_order(order_id, status="OPEN", filled=0):
+    return {
+        "orderId": order_id,
+        "OrderDetail": [
+            {
+                "status": status,
+                "Instrument": [{"orderedQuantity": 100, "filledQuantity": filled}],
+            }
+        ],
+    }
+
+
+def details(order):
+    return {"OrdersResponse": {"Order": [order]}}
+
+
+class TestOrderTracker(unittest.TestCase):
+    """TestOrderTracker Unit Test"""
+
+    def test_poll(self):
+        """test_poll() -> None
+        description: sweeps are diffed into new, partial fill, fill, cancel
+        and status events"""
+        api = MagicMock()
+        api.iter_orders.side_effect = [
+            iter([make_order(1), make_order(2), make_order(3)]),
+            iter(
+                [
+                    make_order(1, "PARTIAL", 40),
+                    make_order(3, "CANCEL_REQUESTED"),
+                    make_order(4),
+                ]
+            ),
+            iter([make_order(1, "PARTIAL", 40), make_order(4)]),
+        ]
+        api.list_order_details.side_effect = [
+            details(make_order(2, "EXECUTED", 100)),
+            details(make_order(3, "CANCELLED")),
+        ]
+
+        orders = tracker.OrderTracker(api, ["12345"])
+        seen = []
+        fills = []
+        orders.subscribe(seen.append)
+        orders.subscribe(fills.append, types=(tracker.PARTIAL_FILL, tracker.FILLED))
+
+        self.assertEqual(orders.poll(), [])
+        self.assertEqual(len(orders.open_orders("12345")), 3)
+        api.iter_orders.assert_called_with("12345", status="OPEN", resp_format="json")
+
+        events = orders.poll()
+        self.assertEqual(
+            [(e["type"], e["order_id"]) for e in events],
+            [
+                (tracker.PARTIAL_FILL, 1),
+                (tracker.STATUS, 3),
+                (tracker.NEW, 4),
+                (tracker.FILLED, 2),
+            ],
+        )
+        self.assertEqual(events[0]["previous_filled"], 0.0)
+        self.assertEqual(events[0]["filled"], 40.0)
+        self.assertEqual(events[1]["previous_status"], "OPEN")
+        api.list_order_details.assert_called_once_with("12345", 2, resp_format="json")
+
+        events = orders.poll()
+        self.assertEqual(
+            [(e["type"], e["order_id"]) for e in events], [(tracker.CANCELLED, 3)]
+        )
+        self.assertEqual(len(seen), 5)
+        self.assertEqual([e["order_id"] for e in fills], [1, 2])
+        self.assertEqual(sorted(o["orderId"] for o in orders.open_orders()), [1, 4])
+
+    def test_pending_cancel(self):
+        """test_pending_cancel() -> None
+        description: orders that left the sweep but are still live stay in the
+        book until they close, and come back to the sweep without a new event"""
+        api = MagicMock()
+        api.iter_orders.side_effect = [
+            iter([make_order(1), make_order(2, "PARTIAL", 40)]),
+            iter([]),
+            iter([make_order(2, "PARTIAL", 60)]),
+            iter([make_order(2, "PARTIAL", 60)]),
+        ]
+        api.list_order_details.side_effect = [
+            details(make_order(1, "CANCEL_REQUESTED")),
+            details(make_order(2, "PARTIAL", 50)),
+            details(make_order(1, "CANCEL_REQUESTED")),
+            details(make_order(1, "CANCELLED")),
+        ]
+
+        orders = tracker.OrderTracker(api, ["12345"])
+        orders.poll()
+
+        events = orders.poll()
+        self.assertEqual(
+            [(e["type"], e["order_id"], e["status"]) for e in events],
+            [
+                (tracker.STATUS, 1, "CANCEL_REQUESTED"),
+                (tracker.PARTIAL_FILL, 2, "PARTIAL"),
+            ],
+        )
+        self.assertEqual(len(orders.open_orders()), 2)
+
+        events = orders.poll()
+        self.assertEqual(
+            [(e["type"], e["order_id"]) for e in events], [(tracker.PARTIAL_FILL, 2)]
+        )
+        self.assertEqual(events[0]["previous_filled"], 50.0)
+
+        self.assertEqual(
+            [(e["type"], e["order_id"]) for e in orders.poll()],
+            [(tracker.CANCELLED, 1)],
+        )
+        self.assertEqual([o["orderId"] for o in orders.open_orders()], [2])
+        self.assertEqual(api.list_order_details.call_count, 4)
+
+    def test_lookup_failure(self):
+        """test_lookup_failure() -> None
+        description: orders whose lookup fails are looked up again and
+        failing callbacks do not stop the others"""
+        api = MagicMock()
+        api.iter_orders.side_effect = lambda *args, **kwargs: iter(
+            [make_order(1)] if api.iter_orders.call_count == 1 else []
+        )
+        api.list_order_details.side_effect = [
+            ConnectionError("boom"),
+            details(make_order(1, "EXPIRED")),
+        ]
+
+        orders = tracker.OrderTracker(api, ["12345"])
+        seen = []
+        orders.subscribe(MagicMock(side_effect=RuntimeError("callback")))
+        orders.subscribe(seen.append)
+
+        orders.poll()
+        self.assertEqual(orders.poll(), [])
+        self.assertEqual(len(orders.open_orders()), 1)
+
+        self.assertEqual(orders.poll()[0]["status"], "EXPIRED")
+        self.assertEqual([e["type"] for e in seen], [tracker.STATUS])
+        self.assertEqual(orders.open_orders(), [])
+
+    def test_start_stop(self):
+        """test_start_stop() -> None
+        description: the polling thread sweeps until stopped"""
+        polled = threading.Event()
+
+        def sweep(*args, **kwargs):
+            polled.set()
+            return iter([])
+
+        api = MagicMock()
+        api.iter_orders.side_effect = sweep
+
+        orders = tracker.OrderTracker(api, ["12345"], interval=0.01)
+        thread = orders.start()
+        self.assertTrue(polled.wait(5))
+        orders.stop(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(orders.thread)